@@ -158,3 +158,70 @@ DEFAULT_FROM_EMAIL = 'AgriWise aniketsuryavanshi2304@gmail.com'
 
 # Password Reset Token Expiry (in seconds) - 1 hour
 PASSWORD_RESET_TIMEOUT = 3600
+
+# Crop model serving backend: 'sklearn', 'compiled' (flattened NumPy forest,
+# same probabilities without sklearn's per-call overhead) or 'quantized'
+# (compact npz from `manage.py export_crop_model --quantized`)
+CROP_MODEL_BACKEND = 'compiled'
+
+# Per-worker LRU/TTL cache in front of single crop recommendations. Keys are
+# the inputs rounded to PRECISION decimal places (misses score the raw
+# inputs); the cache is flushed whenever the crop model is hot-swapped.
+CROP_PREDICTION_CACHE = {
+    'MAX_SIZE': 4096,
+    'TTL_SECONDS': 600,
+    'PRECISION': {'N': 0, 'P': 0, 'K': 0, 'temperature': 1, 'humidity': 1, 'ph': 2, 'rainfall': 1},
+}
+
+# Load and test-score the crop model in a background thread when the server
+# starts; GET /api/ready/ answers 503 until it has finished
+CROP_MODEL_WARMUP = True
+
+# Land recommendation scoring: 'cached' (NumPy columns of all available lands
+# kept in memory per worker), 'vectorized' (same scoring, columns re-read from
+# the database per request), 'sql' (scored, ordered and limited by the
+# database; only the top rows are fetched) or 'python' (one
+# calculate_suitability_score call per Land)
+LAND_SCORING_MODE = 'cached'
+
+# Per-worker land cache: how often (seconds) to look for changes made by other
+# workers in LandChangeLog, and when to rebuild it from scratch regardless
+LAND_FEATURE_CACHE = {
+    'CHECK_INTERVAL': 1.0,
+    'MAX_AGE': 600.0,
+}
+
+# Per-worker location autocomplete index: how often (seconds) to look for
+# new Location rows, and when to rebuild anyway (refreshes land counts)
+LOCATION_INDEX = {
+    'CHECK_INTERVAL': 5.0,
+    'MAX_AGE': 600.0,
+}
+
+# Default per-feature weights for /api/lands/<id>/similar/ (features are
+# standardized first; names are listed in api/services/land_similarity.py).
+# Unlisted features weigh 1.0; requests can override with ?weights=name:w,...
+LAND_SIMILARITY_WEIGHTS = {}
+
+# Approximate similar-land search (LSH, api/services/land_ann.py) for very
+# large listings. Built by `python manage.py build_land_index` and loaded by
+# each worker; PROBES trades latency for recall (0 = fastest)
+LAND_SIMILARITY_INDEX = {
+    'ENABLED': False,
+    'PATH': BASE_DIR / 'ml_models' / 'land_lsh_index.npz',
+    'TABLES': 8,
+    'BITS': 12,
+    'PROBES': 2,
+    'CHECK_INTERVAL': 1.0,
+}
+
+# Stored top-K similar-land lists (SimilarLand table) served by
+# /api/lands/<id>/similar/ for limit <= TOP_K. Fill them with
+# `python manage.py build_similar_lands`; land saves keep them up to date
+# through a background thread that batches the changes of REFRESH_DELAY
+# seconds (None: refresh inside the saving request)
+SIMILAR_LANDS = {
+    'ENABLED': True,
+    'TOP_K': 20,
+    'REFRESH_DELAY': 0.5,
+}
@@ -19,12 +19,13 @@ from django.urls import path
 from api.views import (
     RegisterAPI, LoginAPI, UserProfileAPI,
     LandRecommendationAPI, SimilarLandsAPI, 
-    LandDetailWithScoreAPI, QuickMatchAPI,
+    LandDetailWithScoreAPI, LandBatchScoreAPI, LandProfileMatrixAPI, QuickMatchAPI, NearbyLandsAPI, LandsInBBoxAPI, LocationAutocompleteAPI,
     # RecommendationStatsAPI  # COMMENTED OUT
 )
 from api.crop_views import (
     CropRecommendationAPI, CropRequirementsAPI, AvailableCropsAPI,
-    UserCropHistoryAPI, SoilDataAPI, CropRecommendationStatsAPI
+    UserCropHistoryAPI, SoilDataAPI, CropRecommendationStatsAPI,
+    CropModelInfoAPI, CropBatchRecommendationAPI, SoilDataUploadAPI, ReadinessAPI
 )
 from api.password_reset_views import PasswordResetRequestAPI, PasswordResetConfirmAPI
 
@@ -37,17 +38,26 @@ urlpatterns = [
     
     # Land Recommendations
     path('api/lands/recommend/', LandRecommendationAPI.as_view(), name='land-recommend'),
+    path('api/lands/recommend/profiles/', LandProfileMatrixAPI.as_view(), name='land-recommend-profiles'),
     path('api/lands/<int:land_id>/similar/', SimilarLandsAPI.as_view(), name='similar-lands'),
     path('api/lands/<int:land_id>/score/', LandDetailWithScoreAPI.as_view(), name='land-score'),
+    path('api/lands/score/', LandBatchScoreAPI.as_view(), name='land-score-batch'),
     path('api/lands/quick-match/', QuickMatchAPI.as_view(), name='quick-match'),
+    path('api/lands/nearby/', NearbyLandsAPI.as_view(), name='nearby-lands'),
+    path('api/lands/in-bbox/', LandsInBBoxAPI.as_view(), name='lands-in-bbox'),
+    path('api/locations/autocomplete/', LocationAutocompleteAPI.as_view(), name='location-autocomplete'),
     
     # Crop Recommendations (NEW!)
     path('api/crops/recommend/', CropRecommendationAPI.as_view(), name='crop-recommend'),
+    path('api/crops/recommend/batch/', CropBatchRecommendationAPI.as_view(), name='crop-recommend-batch'),
     path('api/crops/<str:crop_name>/requirements/', CropRequirementsAPI.as_view(), name='crop-requirements'),
     path('api/crops/available/', AvailableCropsAPI.as_view(), name='available-crops'),
     path('api/crops/stats/', CropRecommendationStatsAPI.as_view(), name='crop-stats'),
+    path('api/crops/model-info/', CropModelInfoAPI.as_view(), name='crop-model-info'),
+    path('api/ready/', ReadinessAPI.as_view(), name='ready'),
     path('api/user/crop-recommendations/', UserCropHistoryAPI.as_view(), name='user-crop-history'),
     path('api/soil-data/', SoilDataAPI.as_view(), name='soil-data'),
+    path('api/soil-data/upload/', SoilDataUploadAPI.as_view(), name='soil-data-upload'),
     
     # Password Reset endpoints
     path('api/password-reset/', PasswordResetRequestAPI.as_view(), name='password-reset-request'),
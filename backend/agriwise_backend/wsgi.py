@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'agriwise_backend.settings')
+# Serving entry point: start the crop model warmup (see api/apps.py)
+os.environ.setdefault('AGRIWISE_SERVING', '1')
 
 application = get_wsgi_application()
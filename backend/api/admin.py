@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import (
     CustomUser,
-    Land, 
+    Land, Location,
     # LandImage, Infrastructure, GovernmentProject,  # COMMENTED OUT
     # DevelopmentUseCase, LandRecommendation, ROICalculation,  # COMMENTED OUT
     UserQuery, SavedLand,
@@ -65,6 +65,15 @@ class LandAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ['city', 'district', 'state', 'pincode']
+    list_filter = ['state']
+    search_fields = ['city', 'district', 'state', 'pincode']
+    readonly_fields = ['key']
+    ordering = ['state', 'city', 'pincode']
+
+
 # COMMENTED OUT - LandImage not currently used
 # @admin.register(LandImage)
 # class LandImageAdmin(admin.ModelAdmin):
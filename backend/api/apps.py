@@ -1,6 +1,30 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (connects the receivers)
+        from .services import warmup
+
+        if warmup.enabled() and _is_serving():
+            warmup.start()
+
+
+def _is_serving() -> bool:
+    """
+    True when wsgi.py/asgi.py set AGRIWISE_SERVING (gunicorn, uvicorn, ...)
+    and for runserver's worker; tests, scripts, celery and other manage.py
+    commands don't warm up
+    """
+    if os.environ.get('AGRIWISE_SERVING', '') not in ('', '0'):
+        return True
+    if len(sys.argv) < 2 or os.path.basename(sys.argv[0]) != 'manage.py' or sys.argv[1] != 'runserver':
+        return False
+    # The autoreloader's parent process only watches files
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
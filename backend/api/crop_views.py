@@ -6,19 +6,87 @@ Uses ML model to recommend crops based on soil and climate data
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework import status
+from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from .models import SoilData, CropRecommendation, Land
 from .serializers import (
     SoilDataSerializer, 
     CropRecommendationSerializer,
     CropRecommendationRequestSerializer,
+    CropBatchRecommendationRequestSerializer,
     CropRequirementsSerializer
 )
+from collections import Counter
 import time
 
 
+def _soil_suitability(confidence: float) -> str:
+    """Convert confidence to soil suitability rating"""
+    if confidence >= 0.8:
+        return 'excellent'
+    elif confidence >= 0.6:
+        return 'good'
+    elif confidence >= 0.4:
+        return 'moderate'
+    else:
+        return 'poor'
+
+
+def _save_batch(user, samples, results, recommender):
+    """
+    Persist one SoilData + CropRecommendation row per scored sample
+    
+    Returns:
+        The created CropRecommendation rows, in sample order
+    """
+    # Lands referenced by the batch, fetched in one query. SoilData is
+    # one-to-one with Land, so only lands without soil data are linked.
+    land_ids = {sample['land_id'] for sample in samples if sample.get('land_id')}
+    lands = Land.objects.in_bulk(land_ids)
+    taken = set(
+        SoilData.objects.filter(land_id__in=land_ids).values_list('land_id', flat=True)
+    )
+    
+    soil_rows = []
+    for sample in samples:
+        land = lands.get(sample.get('land_id'))
+        if land is not None and land.id in taken:
+            land = None
+        if land is not None:
+            taken.add(land.id)
+        
+        soil_rows.append(SoilData(
+            land=land,
+            user=user,
+            nitrogen=sample['N'],
+            phosphorous=sample['P'],
+            potassium=sample['K'],
+            ph=sample['ph'],
+            temperature=sample['temperature'],
+            humidity=sample['humidity'],
+            rainfall=sample['rainfall'],
+            location=sample.get('location') or (land.city if land else '')
+        ))
+    
+    with transaction.atomic():
+        soil_rows = SoilData.objects.bulk_create(soil_rows)
+        return CropRecommendation.objects.bulk_create([
+            CropRecommendation(
+                user=user,
+                soil_data=soil_data,
+                recommended_crop=result['recommended_crop'],
+                confidence_score=result['confidence'],
+                top_recommendations=result['top_5_recommendations'],
+                soil_suitability=_soil_suitability(result['confidence']),
+                model_version=recommender.version
+            )
+            for soil_data, result in zip(soil_rows, results)
+        ])
+
+
 class CropRecommendationAPI(APIView):
     """
     POST /api/crops/recommend/
@@ -42,15 +110,17 @@ class CropRecommendationAPI(APIView):
             
             # Import ML model
             try:
-                from .services.crop_recommender import CropRecommendationModel
+                from .services.model_registry import get_crop_model
+                from .services.prediction_cache import get_prediction_cache
             except Exception as e:
                 return Response({
                     'error': f'Crop recommender not available: {str(e)}'
                 }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
             
-            # Get recommendation from ML model
-            recommender = CropRecommendationModel()
-            result = recommender.recommend_crop(
+            # Get recommendation from the shared ML model (via the prediction cache)
+            recommender = get_crop_model()
+            result = get_prediction_cache().recommend(
+                recommender,
                 N=data['N'],
                 P=data['P'],
                 K=data['K'],
@@ -100,7 +170,8 @@ class CropRecommendationAPI(APIView):
                 recommended_crop=result['recommended_crop'],
                 confidence_score=result['confidence'],
                 top_recommendations=result['top_5_recommendations'],
-                soil_suitability=self._get_soil_suitability(result['confidence'])
+                soil_suitability=_soil_suitability(result['confidence']),
+                model_version=recommender.version
             )
             
             # Calculate response time
@@ -116,6 +187,7 @@ class CropRecommendationAPI(APIView):
                     'confidence_percentage': f"{result['confidence'] * 100:.2f}%",
                     'top_5_recommendations': result['top_5_recommendations'],
                     'soil_suitability': crop_recommendation.soil_suitability,
+                    'model_version': crop_recommendation.model_version,
                 },
                 'input_data': {
                     'nitrogen': data['N'],
@@ -136,17 +208,71 @@ class CropRecommendationAPI(APIView):
                 'error': f'Internal server error: {str(e)}',
                 'success': False
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CropBatchRecommendationAPI(APIView):
+    """
+    POST /api/crops/recommend/batch/
+    Score many soil samples in one call
+    
+    Body: {"samples": [{"N": 90, "P": 42, ..., "land_id": 3}, ...]}
+    """
+    permission_classes = [IsAuthenticated]
     
-    def _get_soil_suitability(self, confidence: float) -> str:
-        """Convert confidence to soil suitability rating"""
-        if confidence >= 0.8:
-            return 'excellent'
-        elif confidence >= 0.6:
-            return 'good'
-        elif confidence >= 0.4:
-            return 'moderate'
-        else:
-            return 'poor'
+    def post(self, request):
+        start_time = time.time()
+        
+        try:
+            serializer = CropBatchRecommendationRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    {'error': serializer.errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            samples = serializer.validated_data['samples']
+            
+            try:
+                from .services.model_registry import get_crop_model
+            except Exception as e:
+                return Response({
+                    'error': f'Crop recommender not available: {str(e)}'
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            
+            # One vectorized pass over the whole batch
+            recommender = get_crop_model()
+            results = recommender.recommend_crops_batch(samples)
+            
+            recommendation_rows = _save_batch(request.user, samples, results, recommender)
+            
+            response_time = int((time.time() - start_time) * 1000)
+            
+            return Response({
+                'success': True,
+                'count': len(recommendation_rows),
+                'response_time_ms': response_time,
+                'model_version': recommender.version,
+                'recommendations': [
+                    {
+                        'id': row.id,
+                        'soil_data_id': row.soil_data_id,
+                        'recommended_crop': row.recommended_crop,
+                        'confidence': row.confidence_score,
+                        'top_5_recommendations': row.top_recommendations,
+                        'soil_suitability': row.soil_suitability,
+                    }
+                    for row in recommendation_rows
+                ]
+            })
+        
+        except Exception as e:
+            import traceback
+            error_trace = traceback.format_exc()
+            print(f"Error in CropBatchRecommendationAPI: {error_trace}")
+            return Response({
+                'error': f'Internal server error: {str(e)}',
+                'success': False
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 class CropRequirementsAPI(APIView):
@@ -158,14 +284,14 @@ class CropRequirementsAPI(APIView):
     
     def get(self, request, crop_name):
         try:
-            from .services.crop_recommender import CropRecommendationModel
+            from .services.model_registry import get_crop_catalog
         except Exception as e:
             return Response({
                 'error': f'Crop recommender not available: {str(e)}'
             }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         
-        recommender = CropRecommendationModel()
-        requirements = recommender.get_crop_requirements(crop_name)
+        # In-memory lookup in the precomputed catalog
+        requirements = get_crop_catalog().get_requirements(crop_name)
         
         if 'error' in requirements:
             return Response(requirements, status=status.HTTP_404_NOT_FOUND)
@@ -186,14 +312,13 @@ class AvailableCropsAPI(APIView):
     
     def get(self, request):
         try:
-            from .services.crop_recommender import CropRecommendationModel
+            from .services.model_registry import get_crop_catalog
         except Exception as e:
             return Response({
                 'error': f'Crop recommender not available: {str(e)}'
             }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         
-        recommender = CropRecommendationModel()
-        crops = recommender.get_all_crops()
+        crops = get_crop_catalog().get_all_crops()
         
         return Response({
             'success': True,
@@ -202,6 +327,48 @@ class AvailableCropsAPI(APIView):
         })
 
 
+class CropModelInfoAPI(APIView):
+    """
+    GET /api/crops/model-info/
+    Load time, memory footprint and version of the models loaded in this worker,
+    plus prediction cache counters
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        from .services.model_registry import registry
+        from .services.prediction_cache import get_prediction_cache
+        
+        return Response({
+            'success': True,
+            'models': registry.stats(),
+            'prediction_cache': get_prediction_cache().stats()
+        })
+
+
+class ReadinessAPI(APIView):
+    """
+    GET /api/ready/
+    200 once the crop model has been loaded and test-scored in this worker
+    (or when CROP_MODEL_WARMUP is off), 503 while the warmup is still
+    running (or if it failed)
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        from .services import warmup
+        
+        # Servers that never started it (no wsgi.py flag) warm up on the
+        # first probe instead of answering 503 forever
+        if warmup.enabled():
+            warmup.start()
+        ready = warmup.is_ready()
+        return Response(
+            {'ready': ready, **warmup.status()},
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+
 class UserCropHistoryAPI(APIView):
     """
     GET /api/user/crop-recommendations/
@@ -259,6 +426,97 @@ class SoilDataAPI(APIView):
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
+class SoilDataUploadAPI(APIView):
+    """
+    POST /api/soil-data/upload/
+    Bulk intake of a lab results CSV (multipart field "file")
+    
+    The file is streamed in chunks; each chunk is range-checked against the
+    SoilData limits, scored by the crop model in one call and saved with
+    bulk_create. Invalid rows are reported by line number and skipped.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+    
+    MAX_REPORTED_ERRORS = 1000
+    
+    def post(self, request):
+        start_time = time.time()
+        
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'error': 'Upload a CSV file in the "file" field'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            from .services.model_registry import get_crop_model
+            from .services.soil_upload import SoilCSVReader
+        except Exception as e:
+            return Response({
+                'error': f'Crop recommender not available: {str(e)}'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        try:
+            reader = SoilCSVReader(upload)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        recommender = get_crop_model()
+        rows_read = created = failed = 0
+        errors = []
+        crop_counts = Counter()
+        
+        try:
+            for chunk in reader:
+                rows_read += chunk.rows_read
+                failed += len(chunk.errors)
+                errors.extend(chunk.errors[:self.MAX_REPORTED_ERRORS - len(errors)])
+                
+                if not chunk.samples:
+                    continue
+                
+                results = recommender.recommend_from_features(chunk.features)
+                rows = _save_batch(request.user, chunk.samples, results, recommender)
+                created += len(rows)
+                crop_counts.update(row.recommended_crop for row in rows)
+        
+        except ValueError as e:
+            # Unreadable file: earlier chunks are already saved
+            return Response({
+                'success': False,
+                'error': str(e),
+                'rows_read': rows_read,
+                'created': created,
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        except Exception as e:
+            import traceback
+            error_trace = traceback.format_exc()
+            print(f"Error in SoilDataUploadAPI: {error_trace}")
+            return Response({
+                'error': f'Internal server error: {str(e)}',
+                'success': False,
+                'rows_read': rows_read,
+                'created': created,
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        response_time = int((time.time() - start_time) * 1000)
+        
+        return Response({
+            'success': True,
+            'response_time_ms': response_time,
+            'model_version': recommender.version,
+            'rows_read': rows_read,
+            'created': created,
+            'failed': failed,
+            'recommended_crops': dict(crop_counts.most_common()),
+            'errors': errors,
+            'errors_truncated': failed > len(errors),
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
 class CropRecommendationStatsAPI(APIView):
     """
     GET /api/crops/stats/
@@ -0,0 +1,71 @@
+# backend/api/management/commands/benchmark_bbox.py
+
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from api.models import Land
+from api.services.land_spatial import lands_in_bbox, rtree_available
+
+
+class Command(BaseCommand):
+    help = 'Compare map viewport queries through the R*Tree index and the (latitude, longitude) B-tree'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200, help='Random viewports to run')
+        parser.add_argument('--span', type=float, default=0.5, help='Viewport height/width in degrees')
+        parser.add_argument('--limit', type=int, default=0, help='Rows per viewport (0 = all)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if not rtree_available():
+            self.stdout.write(self.style.WARNING(
+                'R*Tree table not available on this database; only the B-tree query can run'
+            ))
+
+        points = np.array(
+            Land.objects.filter(status='available').values_list('latitude', 'longitude'), dtype=np.float64
+        )
+        if not len(points):
+            self.stdout.write(self.style.WARNING('No available lands to query'))
+            return
+
+        # Viewports centred on random lands, so they are never empty deserts
+        rng = np.random.default_rng(options['seed'])
+        centres = points[rng.integers(len(points), size=options['queries'])]
+        half = options['span'] / 2
+        boxes = [(lat - half, lat + half, lon - half, lon + half) for lat, lon in centres.tolist()]
+
+        methods = [('btree', False)] + ([('rtree', True)] if rtree_available() else [])
+        results = {}
+        for name, use_rtree in methods:
+            timings, found = [], []
+            for box in boxes:
+                start = time.perf_counter()
+                ids = lands_in_bbox(*box, use_rtree=use_rtree).order_by('id').values_list('id', flat=True)
+                ids = list(ids[:options['limit']] if options['limit'] else ids)
+                timings.append((time.perf_counter() - start) * 1000)
+                found.append(ids)
+            results[name] = (np.array(timings), found)
+
+        self.stdout.write(
+            f"\n📊 {len(boxes)} viewports of {options['span']}° x {options['span']}° over {len(points):,} lands"
+        )
+        self.stdout.write('-' * 60)
+        for name, (timings, found) in results.items():
+            self.stdout.write(
+                f'{name}: mean {timings.mean():.2f} ms  p50 {np.percentile(timings, 50):.2f} ms  '
+                f'p95 {np.percentile(timings, 95):.2f} ms  {np.mean([len(ids) for ids in found]):,.0f} rows'
+            )
+
+        if 'rtree' in results:
+            btree_timings, btree_found = results['btree']
+            rtree_timings, rtree_found = results['rtree']
+            mismatches = sum(a != b for a, b in zip(btree_found, rtree_found))
+            if mismatches:
+                self.stdout.write(self.style.ERROR(f'❌ {mismatches} viewports returned different lands'))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'✅ Same lands for every viewport; mean speedup '
+                    f'{btree_timings.mean() / rtree_timings.mean():.2f}x (B-tree / R*Tree)'
+                ))
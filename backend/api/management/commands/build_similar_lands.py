@@ -0,0 +1,23 @@
+# backend/api/management/commands/build_similar_lands.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from api.services import similar_lands
+
+
+class Command(BaseCommand):
+    help = 'Recompute the similarity standardization and the stored top-K similar-land list of every available land'
+    
+    def handle(self, *args, **options):
+        config = similar_lands.config()
+        if not config['ENABLED']:
+            self.stdout.write(self.style.WARNING('SIMILAR_LANDS is disabled; nothing to build'))
+            return
+        
+        start = time.perf_counter()
+        written = similar_lands.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Stored {written:,} similar-land entries (top {config['TOP_K']}) "
+            f"in {time.perf_counter() - start:.1f}s"
+        ))
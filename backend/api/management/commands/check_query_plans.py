@@ -0,0 +1,35 @@
+# backend/api/management/commands/check_query_plans.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from api.services.query_plans import explain, plan_checks, plan_problems
+
+
+class Command(BaseCommand):
+    help = ('EXPLAIN the land and crop request queries (land candidates, SQL scoring, radius and viewport '
+            'searches, caches, histories) and fail if one scans a whole table or misses its index')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--show-plans', action='store_true', help='Print every query plan')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Query plan checks read SQLite EXPLAIN QUERY PLAN output')
+
+        checks = plan_checks()
+        failures = 0
+        for check in checks:
+            plan = explain(check.queryset)
+            problems = plan_problems(check, plan)
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"❌ {check.name}: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(f'✅ {check.name}')
+            if problems or options['show_plans']:
+                for line in plan:
+                    self.stdout.write(f'     {line}')
+
+        if failures:
+            raise CommandError(f'{failures} of {len(checks)} query plans regressed')
+        self.stdout.write(self.style.SUCCESS(f'\n✅ All {len(checks)} query plans use their indexes'))
@@ -0,0 +1,59 @@
+# backend/api/management/commands/export_crop_model.py
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from api.services.crop_recommender import CropRecommendationModel
+from api.services.crop_training import quantization_report
+from api.services.forest_engine import CompiledForest, save_quantized, load_quantized
+
+
+class Command(BaseCommand):
+    help = 'Export the crop model as memory-mappable arrays or a compact quantized bundle'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--quantized',
+            action='store_true',
+            help='Write the uint8/float32 npz bundle and report its accuracy delta'
+        )
+    
+    def handle(self, *args, **options):
+        # Full-precision sklearn model is the reference for both formats
+        model = CropRecommendationModel(backend='sklearn')
+        engine = CompiledForest.from_sklearn(model.model, model.scaler)
+        
+        if not options['quantized']:
+            engine.save(model.compiled_dir)
+            np.save(model.classes_path, np.asarray(model.label_encoder.classes_, dtype=str))
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Compiled forest written to {model.compiled_dir} ({engine.nbytes():,} bytes)'
+            ))
+            return
+        
+        save_quantized(engine, model.label_encoder.classes_, model.quantized_path)
+        quantized, _ = load_quantized(model.quantized_path)
+        self.stdout.write(self.style.SUCCESS(f'✅ Quantized bundle written to {model.quantized_path}'))
+        
+        report = quantization_report(model, quantized, model.quantized_path)
+        
+        self.stdout.write('\n📊 Quantization report (hold-out split from training)')
+        self.stdout.write('-' * 60)
+        self.stdout.write(f"Test samples:          {report['test_samples']}")
+        self.stdout.write(f"Accuracy (reference):  {report['reference_accuracy'] * 100:.2f}%")
+        self.stdout.write(f"Accuracy (quantized):  {report['quantized_accuracy'] * 100:.2f}%")
+        self.stdout.write(f"Accuracy delta:        {report['accuracy_delta'] * 100:+.2f} pts")
+        self.stdout.write(f"Prediction agreement:  {report['prediction_agreement'] * 100:.2f}%")
+        self.stdout.write(f"Max probability error: {report['max_probability_error']:.4f}")
+        self.stdout.write(f"Mean probability err.: {report['mean_probability_error']:.6f}")
+        self.stdout.write(
+            f"Size:                  {report['reference_size_bytes']:,} B (pickles) -> "
+            f"{report['quantized_size_bytes']:,} B (npz)"
+        )
+        self.stdout.write(
+            f"Single-row latency:    {report['reference_single_row_ms']:.3f} ms -> "
+            f"{report['quantized_single_row_ms']:.3f} ms"
+        )
+        self.stdout.write(
+            f"Batch latency:         {report['reference_batch_ms']:.2f} ms -> "
+            f"{report['quantized_batch_ms']:.2f} ms"
+        )
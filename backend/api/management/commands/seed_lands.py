@@ -139,6 +139,10 @@ class Command(BaseCommand):
         
         self.stdout.write(self.style.SUCCESS(f'Created {lands_created} lands'))
         
+        # Stored similar-land lists are patched by a background thread
+        from api.services import similar_lands
+        similar_lands.wait_for_refresh()
+        
         # COMMENTED OUT - Infrastructure and Government Projects not currently needed
         # # Create infrastructure
         # infra_types = [
@@ -0,0 +1,57 @@
+# backend/api/management/commands/train_crop_model.py
+
+from django.core.management.base import BaseCommand, CommandError
+from api.services.model_bundles import (
+    BundleError, activate, current_version, list_bundles, train_bundle_in_subprocess
+)
+
+
+class Command(BaseCommand):
+    help = 'Train the crop model into a new versioned bundle and activate it'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-activate',
+            action='store_true',
+            help='Write the bundle but leave the CURRENT pointer unchanged'
+        )
+        parser.add_argument(
+            '--activate',
+            metavar='VERSION',
+            help='Do not train; point CURRENT at an existing bundle (e.g. to roll back)'
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List available bundles'
+        )
+    
+    def handle(self, *args, **options):
+        if options['list']:
+            current = current_version()
+            for manifest in list_bundles():
+                marker = '*' if manifest['version'] == current else ' '
+                accuracy = manifest.get('accuracy')
+                accuracy_text = f"{accuracy * 100:.2f}%" if accuracy is not None else 'n/a'
+                self.stdout.write(
+                    f"{marker} {manifest['version']}  accuracy={accuracy_text}  created={manifest['created_at']}"
+                )
+            return
+        
+        if options['activate']:
+            try:
+                activate(options['activate'])
+            except (BundleError, FileNotFoundError) as e:
+                raise CommandError(f'Cannot activate {options["activate"]}: {e}')
+            self.stdout.write(self.style.SUCCESS(f"✅ Activated {options['activate']}"))
+            return
+        
+        self.stdout.write('🔄 Training crop model in a separate process...')
+        version = train_bundle_in_subprocess(activate_bundle=not options['no_activate'])
+        
+        if options['no_activate']:
+            self.stdout.write(self.style.SUCCESS(f'✅ Bundle {version} written (not activated)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Bundle {version} written and activated; workers will switch without a restart'
+            ))
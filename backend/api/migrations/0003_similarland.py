@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 07:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_landchangelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarLand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('land', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_entries', to='api.land')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.land')),
+            ],
+            options={
+                'ordering': ['land', 'rank'],
+                'indexes': [models.Index(fields=['rank', 'score'], name='api_similar_rank_065c69_idx')],
+                'unique_together': {('land', 'rank')},
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.6 on 2026-10-17 09:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def make_key(city, state, pincode='', district=''):
+    # Frozen copy of Location.make_key
+    return '|'.join(' '.join(part.split()).casefold() for part in (city, district, state, pincode))
+
+
+def backfill_locations(apps, schema_editor):
+    Land = apps.get_model('api', 'Land')
+    Location = apps.get_model('api', 'Location')
+
+    places = {}
+    for city, state, pincode in Land.objects.values_list('city', 'state', 'pincode').order_by().distinct().iterator():
+        places.setdefault(make_key(city, state, pincode), (city, state, pincode))
+    Location.objects.bulk_create([
+        Location(key=key, city=' '.join(city.split()), state=' '.join(state.split()), pincode=pincode.strip())
+        for key, (city, state, pincode) in places.items()
+    ], batch_size=500)
+
+    location_ids = dict(Location.objects.values_list('key', 'id'))
+    lands = list(Land.objects.only('id', 'city', 'state', 'pincode'))
+    for land in lands:
+        land.location_id = location_ids[make_key(land.city, land.state, land.pincode)]
+    Land.objects.bulk_update(lands, ['location'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_similarland'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(max_length=100)),
+                ('district', models.CharField(blank=True, max_length=100)),
+                ('state', models.CharField(max_length=100)),
+                ('pincode', models.CharField(blank=True, max_length=10)),
+                ('key', models.CharField(max_length=320, unique=True)),
+            ],
+            options={
+                'ordering': ['state', 'city', 'pincode'],
+            },
+        ),
+        migrations.AddField(
+            model_name='land',
+            name='location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='lands', to='api.location'),
+        ),
+        migrations.RunPython(backfill_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Spatial index for map viewport queries (api/services/land_spatial.py)
+
+from django.db import migrations
+
+RTREE_TABLE = 'api_land_rtree'
+
+CREATE_SQL = [
+    f'CREATE VIRTUAL TABLE {RTREE_TABLE} USING rtree(id, min_lat, max_lat, min_lon, max_lon)',
+    f'INSERT INTO {RTREE_TABLE} SELECT id, latitude, latitude, longitude, longitude FROM api_land',
+    f'''CREATE TRIGGER {RTREE_TABLE}_insert AFTER INSERT ON api_land BEGIN
+        INSERT INTO {RTREE_TABLE} VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+    END''',
+    f'''CREATE TRIGGER {RTREE_TABLE}_update AFTER UPDATE OF id, latitude, longitude ON api_land BEGIN
+        DELETE FROM {RTREE_TABLE} WHERE id = OLD.id;
+        INSERT INTO {RTREE_TABLE} VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+    END''',
+    f'''CREATE TRIGGER {RTREE_TABLE}_delete AFTER DELETE ON api_land BEGIN
+        DELETE FROM {RTREE_TABLE} WHERE id = OLD.id;
+    END''',
+]
+
+DROP_SQL = [
+    f'DROP TRIGGER IF EXISTS {RTREE_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {RTREE_TABLE}_update',
+    f'DROP TRIGGER IF EXISTS {RTREE_TABLE}_delete',
+    f'DROP TABLE IF EXISTS {RTREE_TABLE}',
+]
+
+
+def has_rtree(connection) -> bool:
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_RTREE')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_rtree(apps, schema_editor):
+    # Other backends (or SQLite builds without R*Tree) keep using the
+    # (latitude, longitude) B-tree index
+    if not has_rtree(schema_editor.connection):
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_rtree(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_location'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_rtree, drop_rtree),
+    ]
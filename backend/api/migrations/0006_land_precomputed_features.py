@@ -0,0 +1,80 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:12
+
+from django.db import migrations, models
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.db.models.functions import Cast
+
+
+def backfill_features(apps, schema_editor):
+    # One UPDATE; same arithmetic as services/land_features.py
+    Land = apps.get_model('api', 'Land')
+
+    def bucket(field, edges):
+        return Case(
+            *[When(**{f'{field}__lt': edge}, then=Value(code)) for code, edge in enumerate(edges)],
+            default=Value(len(edges)),
+            output_field=IntegerField(),
+        )
+
+    Land.objects.update(
+        avg_connectivity=(
+            F('highway_proximity_score') + F('metro_proximity_score') + F('airport_proximity_score')
+        ) / Value(3.0, output_field=FloatField()),
+        infrastructure_count=(
+            Cast('has_water_supply', IntegerField()) + Cast('has_electricity', IntegerField())
+            + Cast('has_road_access', IntegerField())
+        ),
+        size_category=bucket('size_in_acres', (5, 20, 50)),
+        price_category=bucket('total_price', (500000, 2000000, 5000000)),
+        land_type_code=Case(
+            *[When(land_type=land_type, then=Value(code)) for code, land_type in enumerate(
+                ('agricultural', 'residential', 'commercial', 'industrial', 'mixed')
+            )],
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_land_rtree'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='land',
+            name='avg_connectivity',
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='land',
+            name='infrastructure_count',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='land',
+            name='land_type_code',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='land',
+            name='price_category',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='land',
+            name='size_category',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_features, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='land',
+            index=models.Index(fields=['status', 'land_type', 'size_category', 'price_category'], name='api_land_status_6333c9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='land',
+            index=models.Index(fields=['status', 'land_type', 'avg_connectivity', 'infrastructure_count'], name='api_land_status_8a8b58_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_land_precomputed_features'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='land',
+            name='api_land_status_6333c9_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='land',
+            name='api_land_status_8a8b58_idx',
+        ),
+        migrations.AddIndex(
+            model_name='land',
+            index=models.Index(condition=models.Q(('status', 'available')), fields=['land_type', '-created_at'], name='land_available_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='land',
+            index=models.Index(condition=models.Q(('status', 'available')), fields=['land_type', 'size_category', 'price_category'], name='land_available_size_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='land',
+            index=models.Index(condition=models.Q(('status', 'available')), fields=['land_type', 'avg_connectivity', 'infrastructure_count'], name='land_available_infra_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='land',
+            index=models.Index(condition=models.Q(('status', 'available')), fields=['location', 'land_type'], name='land_available_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='land',
+            index=models.Index(condition=models.Q(('status', 'available')), fields=['latitude', 'longitude'], name='land_available_geo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='soildata',
+            index=models.Index(fields=['user', '-created_at'], name='api_soildat_user_id_600714_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='croprecommendation',
+            index=models.Index(fields=['user', '-created_at'], name='api_croprec_user_id_e69a87_idx'),
+        ),
+    ]
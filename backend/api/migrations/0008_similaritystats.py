@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 16:05
+
+from django.db import migrations, models
+
+
+def clear_similar_lands(apps, schema_editor):
+    # Existing lists were scored with per-worker stats; build_similar_lands
+    # recomputes them against the stored ones
+    apps.get_model('api', 'SimilarLand').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_land_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarityStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean', models.JSONField()),
+                ('scale', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(clear_similar_lands, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-17 16:40
+
+from django.db import migrations
+
+
+def make_key(city, state, pincode='', district=''):
+    # Frozen copy of Location.make_key
+    return '|'.join(' '.join(part.split()).casefold() for part in (city, district, state, pincode))
+
+
+def backfill_locations(apps, schema_editor):
+    """Link lands loaded raw since 0004 (fixtures, bulk_create) to their Location"""
+    Land = apps.get_model('api', 'Land')
+    Location = apps.get_model('api', 'Location')
+
+    lands = list(Land.objects.filter(location__isnull=True).only('id', 'city', 'state', 'pincode'))
+    if not lands:
+        return
+
+    location_ids = dict(Location.objects.values_list('key', 'id'))
+    missing = {}
+    for land in lands:
+        key = make_key(land.city, land.state, land.pincode)
+        if key not in location_ids:
+            missing.setdefault(key, (land.city, land.state, land.pincode))
+    Location.objects.bulk_create([
+        Location(key=key, city=' '.join(city.split()), state=' '.join(state.split()), pincode=pincode.strip())
+        for key, (city, state, pincode) in missing.items()
+    ], batch_size=500)
+
+    location_ids = dict(Location.objects.values_list('key', 'id'))
+    for land in lands:
+        land.location_id = location_ids[make_key(land.city, land.state, land.pincode)]
+    Land.objects.bulk_update(lands, ['location'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_similaritystats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_locations, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,7 @@
 # Create your models here.
 # backend/api/models.py
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -35,6 +35,68 @@ class CustomUser(AbstractUser):
         return f"{self.username} ({self.get_user_type_display()})"
 
 
+class Location(models.Model):
+    """
+    Canonical place a land is in
+    
+    One row per distinct (city, district, state, pincode). `key` is the
+    case-folded combination, so "Pune" and "pune " resolve to the same row.
+    Lands point here (Land.location) and location filters become indexed
+    equality lookups on land.location_id. Land saves keep the link current;
+    bulk_create() skips that signal, so set location with resolve() there.
+    """
+    city = models.CharField(max_length=100)
+    district = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100)
+    pincode = models.CharField(max_length=10, blank=True)
+    key = models.CharField(max_length=320, unique=True)
+    
+    class Meta:
+        ordering = ['state', 'city', 'pincode']
+    
+    def __str__(self):
+        return f"{self.city}, {self.state} {self.pincode}".strip()
+    
+    def save(self, *args, **kwargs):
+        self.key = self.make_key(self.city, self.state, self.pincode, self.district)
+        super().save(*args, **kwargs)
+    
+    @staticmethod
+    def make_key(city: str, state: str, pincode: str = '', district: str = '') -> str:
+        return '|'.join(' '.join(part.split()).casefold() for part in (city, district, state, pincode))
+    
+    @classmethod
+    def resolve(cls, city: str, state: str, pincode: str = '', district: str = '') -> 'Location':
+        """The Location for these values, created on first use"""
+        location, _ = cls.objects.get_or_create(
+            key=cls.make_key(city, state, pincode, district),
+            defaults={
+                'city': ' '.join(city.split()),
+                'district': ' '.join(district.split()),
+                'state': ' '.join(state.split()),
+                'pincode': pincode.strip(),
+            },
+        )
+        return location
+
+
+class LandQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        queryset.update() skips the save signals; when it changes a field the
+        stored features derive from, they are re-derived for the same rows
+        """
+        from .services.land_features import PRECOMPUTED_INPUTS, refresh_precomputed
+        
+        if not PRECOMPUTED_INPUTS.intersection(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            ids = list(self.values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+            refresh_precomputed(Land.objects.filter(pk__in=ids))
+        return rows
+
+
 class Land(models.Model):
     """Core land/property data"""
     LAND_TYPE_CHOICES = [
@@ -65,6 +127,8 @@ class Land(models.Model):
     city = models.CharField(max_length=100)
     state = models.CharField(max_length=100)
     pincode = models.CharField(max_length=10)
+    # Kept in sync with city/state/pincode on save (api/signals.py)
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, null=True, blank=True, related_name='lands')
     
     # Size & Price
     size_in_acres = models.DecimalField(max_digits=10, decimal_places=2)
@@ -90,6 +154,17 @@ class Land(models.Model):
     has_electricity = models.BooleanField(default=False)
     has_road_access = models.BooleanField(default=True)
     
+    # Query-independent features, recomputed from the fields above on every
+    # save (api/signals.py, services/land_features.py) and by
+    # LandQuerySet.update(). bulk_create() leaves them NULL unless set with
+    # precomputed_values(); scoring then computes them on the fly. Nullable
+    # so adding them is a plain ALTER TABLE ADD COLUMN.
+    avg_connectivity = models.FloatField(null=True, editable=False)
+    infrastructure_count = models.PositiveSmallIntegerField(null=True, editable=False)
+    size_category = models.PositiveSmallIntegerField(null=True, editable=False)
+    price_category = models.PositiveSmallIntegerField(null=True, editable=False)
+    land_type_code = models.PositiveSmallIntegerField(null=True, editable=False)
+    
     # Metadata
     owner = models.ForeignKey('CustomUser', on_delete=models.CASCADE, related_name='lands')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -100,17 +175,107 @@ class Land(models.Model):
     is_featured = models.BooleanField(default=False)
     views_count = models.IntegerField(default=0)
     
+    objects = LandQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['city', 'land_type']),
             models.Index(fields=['latitude', 'longitude']),
+            # Searches only read available lands, so these cover just those
+            # rows. status is never a leading column: without ANALYZE stats
+            # SQLite takes status=? for a selective lookup and picks such an
+            # index over the lat/lon range or the R*Tree id list.
+            models.Index(
+                fields=['land_type', '-created_at'], condition=models.Q(status='available'),
+                name='land_available_type_idx',
+            ),
+            models.Index(
+                fields=['land_type', 'size_category', 'price_category'], condition=models.Q(status='available'),
+                name='land_available_size_idx',
+            ),
+            models.Index(
+                fields=['land_type', 'avg_connectivity', 'infrastructure_count'],
+                condition=models.Q(status='available'), name='land_available_infra_idx',
+            ),
+            models.Index(
+                fields=['location', 'land_type'], condition=models.Q(status='available'),
+                name='land_available_location_idx',
+            ),
+            models.Index(
+                fields=['latitude', 'longitude'], condition=models.Q(status='available'),
+                name='land_available_geo_idx',
+            ),
         ]
     
+    def save(self, *args, **kwargs):
+        # The pre_save hook (api/signals.py) re-derives the stored features
+        # and location; a partial save has to write them as well
+        if kwargs.get('update_fields') is not None:
+            from .services.land_features import with_derived_fields
+            kwargs['update_fields'] = with_derived_fields(kwargs['update_fields'])
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.name} - {self.city}"
 
 
+class LandChangeLog(models.Model):
+    """
+    Append-only record of Land saves and deletes
+    
+    The highest id is the current version of the land data; each worker's
+    in-memory land cache compares it with its own to find changed rows.
+    """
+    # land_id value meaning "reload everything" (bulk updates, imports)
+    ALL_LANDS = 0
+    
+    land_id = models.BigIntegerField()  # no FK: deleted lands stay in the log
+    changed_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Land {self.land_id} changed (#{self.id})"
+
+
+class SimilarLand(models.Model):
+    """
+    Stored top-K neighbours of an available land
+    
+    Filled by `manage.py build_similar_lands` and patched when lands change
+    (see services/similar_lands.py), so the similar-lands page is one read.
+    """
+    land = models.ForeignKey(Land, on_delete=models.CASCADE, related_name='similar_entries')
+    similar = models.ForeignKey(Land, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()  # 1 = most similar
+    score = models.FloatField()  # similarity_score as served (0-100)
+    
+    class Meta:
+        ordering = ['land', 'rank']
+        unique_together = ['land', 'rank']
+        indexes = [
+            # Lowest K-th score, and the K-th score of given lands
+            models.Index(fields=['rank', 'score']),
+        ]
+    
+    def __str__(self):
+        return f"{self.land_id} ~ {self.similar_id} (#{self.rank}, {self.score})"
+
+
+class SimilarityStats(models.Model):
+    """
+    Feature standardization (per-feature mean and scale) behind SimilarLand
+    
+    One row, written by `manage.py build_similar_lands`; every worker's
+    similarity index uses it, so stored lists and live scores agree.
+    """
+    mean = models.JSONField()
+    scale = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Similarity stats ({len(self.mean)} features, {self.updated_at})"
+
+
 class UserQuery(models.Model):
     """Track semantic search queries for analytics"""
     user = models.ForeignKey('CustomUser', on_delete=models.CASCADE, null=True, blank=True)
@@ -197,6 +362,10 @@ class SoilData(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Soil Data'
         verbose_name_plural = 'Soil Data'
+        indexes = [
+            # A user's soil tests, newest first
+            models.Index(fields=['user', '-created_at']),
+        ]
     
     def __str__(self):
         if self.land:
@@ -240,6 +409,10 @@ class CropRecommendation(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # A user's recommendation history, newest first
+            models.Index(fields=['user', '-created_at']),
+        ]
     
     def __str__(self):
         return f"{self.recommended_crop} for {self.user.username} ({self.confidence_score * 100:.1f}%)"
@@ -144,6 +144,23 @@ class LandRecommendationSerializer(serializers.Serializer):
     longitude = serializers.FloatField()
 
 
+class LandBatchScoreRequestSerializer(serializers.Serializer):
+    """Land ids scored against one set of requirements"""
+    land_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500
+    )
+
+
+class LandProfileMatrixRequestSerializer(serializers.Serializer):
+    """Requirement profiles scored against the same lands"""
+    profiles = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=10)
+    land_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=10000, required=False
+    )
+    stream = serializers.BooleanField(default=False)
+
+
 # COMMENTED OUT - Advanced features not currently needed
 # class InfrastructureSerializer(serializers.ModelSerializer):
 #     """Serializer for Infrastructure"""
@@ -246,6 +263,11 @@ class CropRecommendationRequestSerializer(serializers.Serializer):
     land_id = serializers.IntegerField(required=False, allow_null=True)
 
 
+class CropBatchRecommendationRequestSerializer(serializers.Serializer):
+    """Serializer for batch crop recommendation requests"""
+    samples = CropRecommendationRequestSerializer(many=True, allow_empty=False, max_length=10000)
+
+
 class CropRequirementsSerializer(serializers.Serializer):
     """Serializer for crop growing requirements"""
     crop_name = serializers.CharField()
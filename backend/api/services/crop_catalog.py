@@ -0,0 +1,174 @@
+# backend/api/services/crop_catalog.py
+"""
+Crop Requirements Catalog
+Per-crop statistics of the training dataset, computed once and persisted next
+to the model artifacts so requirement lookups never touch the CSV
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DATASET_PATH = os.path.join('datasets', 'Crop_recommendation_real.csv')
+CATALOG_PATH = os.path.join('ml_models', 'crop_catalog.json')
+
+# Response name -> dataset column
+PARAMETERS = {
+    'nitrogen': 'N',
+    'phosphorous': 'P',
+    'potassium': 'K',
+    'temperature': 'temperature',
+    'humidity': 'humidity',
+    'ph': 'ph',
+    'rainfall': 'rainfall',
+}
+
+QUANTILES = {'p10': 0.10, 'p25': 0.25, 'median': 0.50, 'p75': 0.75, 'p90': 0.90}
+HISTOGRAM_BINS = 10
+
+
+class CropCatalog:
+    """
+    In-memory table of optimal growing conditions per crop
+
+    The table is rebuilt (in one groupby pass) only when the SHA-256 of the
+    dataset differs from the checksum stored in the persisted catalog. A
+    running worker picks up a changed dataset through the registry's
+    version probe (dataset_version).
+    """
+
+    def __init__(self, dataset_path: str = DATASET_PATH, catalog_path: str = CATALOG_PATH):
+        self.dataset_path = dataset_path
+        self.catalog_path = catalog_path
+        self.checksum = None
+        self.crops: Dict[str, Dict] = {}
+        self._load_or_build()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.checksum[:12] if self.checksum else None
+
+    def _load_or_build(self):
+        """Use the persisted catalog unless the dataset has changed"""
+        checksum = file_checksum(self.dataset_path)
+
+        if os.path.exists(self.catalog_path):
+            with open(self.catalog_path) as f:
+                stored = json.load(f)
+            if stored.get('dataset_checksum') == checksum:
+                self.checksum = checksum
+                self.crops = stored['crops']
+                return
+
+        print("🔄 Building crop requirements catalog...")
+        self.crops = self._build()
+        self.checksum = checksum
+        self._save()
+        print(f"✅ Crop catalog saved to {self.catalog_path}")
+
+    def _build(self) -> Dict[str, Dict]:
+        """Compute every per-crop statistic from a single read of the dataset"""
+        import pandas as pd
+
+        df = pd.read_csv(self.dataset_path)
+        columns = list(PARAMETERS.values())
+        grouped = df.groupby('label', sort=True)[columns]
+
+        # One aggregation for min/max/mean and one for all quantiles
+        summary = grouped.agg(['min', 'max', 'mean'])
+        counts = grouped.size()
+        quantiles = grouped.quantile(list(QUANTILES.values()))
+
+        # Histograms share dataset-wide bin edges so crops are comparable;
+        # one bincount per parameter covers every crop at once
+        labels = summary.index.tolist()
+        crop_codes = pd.Categorical(df['label'], categories=labels).codes.astype(np.int64)
+        histograms = {}
+        for column in columns:
+            values = df[column].to_numpy(dtype=float)
+            edges = np.histogram_bin_edges(values, bins=HISTOGRAM_BINS)
+            bins = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, HISTOGRAM_BINS - 1)
+            counts_by_crop = np.bincount(
+                crop_codes * HISTOGRAM_BINS + bins,
+                minlength=len(labels) * HISTOGRAM_BINS
+            ).reshape(len(labels), HISTOGRAM_BINS)
+            histograms[column] = (edges, counts_by_crop)
+
+        crops = {}
+        for code, label in enumerate(labels):
+            conditions = {}
+            for name, column in PARAMETERS.items():
+                edges, counts_by_crop = histograms[column]
+                conditions[name] = {
+                    'min': float(summary.loc[label, (column, 'min')]),
+                    'max': float(summary.loc[label, (column, 'max')]),
+                    'avg': float(summary.loc[label, (column, 'mean')]),
+                    'quantiles': {
+                        key: float(quantiles.loc[(label, q), column])
+                        for key, q in QUANTILES.items()
+                    },
+                    'histogram': {
+                        'bin_edges': [float(edge) for edge in edges],
+                        'counts': [int(count) for count in counts_by_crop[code]],
+                    },
+                }
+            crops[label.lower()] = {
+                'label': label,
+                'optimal_conditions': conditions,
+                'samples_count': int(counts[label]),
+            }
+        return crops
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.catalog_path), exist_ok=True)
+        tmp_path = f'{self.catalog_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'dataset_checksum': self.checksum, 'crops': self.crops}, f)
+        os.replace(tmp_path, self.catalog_path)
+
+    def get_requirements(self, crop_name: str) -> Dict:
+        """Optimal parameter ranges for a crop (same shape as before, plus quantiles/histograms)"""
+        entry = self.crops.get(crop_name.lower())
+        if entry is None:
+            return {'error': f'Crop "{crop_name}" not found in database'}
+
+        return {
+            'crop_name': crop_name,
+            'optimal_conditions': entry['optimal_conditions'],
+            'samples_count': entry['samples_count'],
+        }
+
+    def get_all_crops(self) -> List[str]:
+        return sorted(entry['label'] for entry in self.crops.values())
+
+
+# (path, mtime, size) -> checksum of the last dataset_version() call
+_checked = {}
+
+
+def dataset_version(dataset_path: str = DATASET_PATH) -> str:
+    """
+    Version a CropCatalog built from the dataset now would have
+
+    Re-hashed only when the file's modification time or size changes, so
+    the registry can call it every few seconds.
+    """
+    stat = os.stat(dataset_path)
+    key = (dataset_path, stat.st_mtime_ns, stat.st_size)
+    checksum = _checked.get(key)
+    if checksum is None:
+        checksum = file_checksum(dataset_path)
+        _checked.clear()
+        _checked[key] = checksum
+    return checksum[:12]
+
+
+def file_checksum(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
@@ -2,20 +2,28 @@
 """
 Crop Recommendation ML Model
 Uses Random Forest Classifier to recommend crops based on soil and climate data
+
+Only inference lives here: serving with the compiled or quantized backend
+imports NumPy and nothing else. Training and evaluation (pandas, sklearn)
+are in crop_training.py and imported on demand.
 """
 
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.metrics import accuracy_score, classification_report
-import joblib
 import os
-from typing import Dict, List, Tuple
+from typing import Dict, List
+from .forest_engine import CompiledForest, load_quantized
+from .model_bundles import bundle_path, current_version, verify_bundle
 import warnings
 warnings.filterwarnings('ignore')
 
+MODEL_VERSION = 'v1.0'
+
+# Model input order (matches the training dataset columns)
+FEATURE_COLUMNS = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+
+DATASET_PATH = os.path.join('datasets', 'Crop_recommendation_real.csv')
+
+
 class CropRecommendationModel:
     """
     Machine Learning model for crop recommendation
@@ -23,22 +31,66 @@ class CropRecommendationModel:
     Output: Recommended crop with confidence score
     """
     
-    def __init__(self):
-        self.model_dir = 'ml_models'
+    BACKENDS = ('sklearn', 'compiled', 'quantized')
+    
+    def __init__(self, backend: str = 'sklearn', model_dir: str = None):
+        """
+        Args:
+            backend: 'sklearn' serves predictions through RandomForestClassifier,
+                     'compiled' through the flattened NumPy forest (same output),
+                     'quantized' through the compact npz bundle (float32
+                     thresholds, uint8 leaves; see crop_training.quantization_report)
+            model_dir: load/train artifacts in this directory; by default the
+                       bundle named by ml_models/crop_bundles/CURRENT, falling
+                       back to the legacy files in ml_models/
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f'Unknown crop model backend "{backend}"')
+        
+        self.backend = backend
+        self.version = MODEL_VERSION
+        self.accuracy = None
+        
+        if model_dir is None:
+            bundle_version = current_version()
+            if bundle_version:
+                model_dir = bundle_path(bundle_version)
+                # Refuse to serve a bundle whose files don't match the manifest
+                manifest = verify_bundle(model_dir)
+                self.version = manifest['version']
+                self.accuracy = manifest.get('accuracy')
+        
+        self.model_dir = model_dir or 'ml_models'
         self.model_path = os.path.join(self.model_dir, 'crop_model.pkl')
         self.scaler_path = os.path.join(self.model_dir, 'crop_scaler.pkl')
         self.label_encoder_path = os.path.join(self.model_dir, 'crop_label_encoder.pkl')
+        # Flattened forest (.npy arrays, scaler folded in) shared via mmap
+        self.compiled_dir = os.path.join(self.model_dir, 'crop_forest')
+        # Compact quantized bundle written by `manage.py export_crop_model --quantized`
+        # (and by every train_crop_model bundle)
+        self.quantized_path = os.path.join(self.model_dir, 'crop_model_q8.npz')
+        # Class names as a plain array, so the compiled backend needs no unpickling
+        self.classes_path = os.path.join(self.model_dir, 'crop_classes.npy')
         
         self.model = None
         self.scaler = None
         self.label_encoder = None
+        self.engine = None
+        self._bundle_classes = None
         
         # Load or train model
         self._load_or_train()
+        self._compile()
     
     def _load_or_train(self):
         """Load existing model or train new one"""
-        if self._model_exists():
+        if self.backend == 'quantized':
+            self._load_quantized()
+            print("✅ Loaded quantized crop recommendation model")
+        elif self.backend == 'compiled' and self._compiled_exists():
+            self._load_compiled()
+            print("✅ Loaded memory-mapped crop recommendation model")
+        elif self._model_exists():
             self._load_model()
             print("✅ Loaded existing crop recommendation model")
         else:
@@ -46,6 +98,56 @@ class CropRecommendationModel:
             self._train_model()
             print("✅ Model trained and saved")
     
+    def _compile(self):
+        """
+        Build the NumPy inference engine when the compiled backend is selected
+        
+        The engine is written next to the pickles and re-opened memory-mapped,
+        so every worker on the machine shares the same physical pages.
+        """
+        if self.backend != 'compiled' or self.engine is not None:
+            return
+        
+        CompiledForest.from_sklearn(self.model, self.scaler).save(self.compiled_dir)
+        np.save(self.classes_path, np.asarray(self.label_encoder.classes_, dtype=str))
+        self.engine = CompiledForest.load(self.compiled_dir, mmap_mode='r')
+        # The pickled forest is no longer needed for serving
+        self.model = None
+    
+    def _compiled_exists(self) -> bool:
+        """Compiled arrays exist and are not older than the pickled model"""
+        if not CompiledForest.exists(self.compiled_dir):
+            return False
+        if not os.path.exists(self.model_path):
+            return True
+        return os.path.getmtime(self.compiled_dir) >= os.path.getmtime(self.model_path)
+    
+    def _load_compiled(self):
+        """Load the memory-mapped engine and class names without touching sklearn"""
+        self.engine = CompiledForest.load(self.compiled_dir, mmap_mode='r')
+        if os.path.exists(self.classes_path):
+            self._bundle_classes = np.load(self.classes_path, allow_pickle=False)
+        else:
+            # Arrays compiled before crop_classes.npy existed
+            import joblib
+            self.label_encoder = joblib.load(self.label_encoder_path)
+    
+    def _load_quantized(self):
+        """Load the pickle-free npz bundle (engine and class labels)"""
+        if not os.path.exists(self.quantized_path):
+            raise FileNotFoundError(
+                f"Quantized model not found at {self.quantized_path}. "
+                "Run: python manage.py export_crop_model --quantized"
+            )
+        self.engine, self._bundle_classes = load_quantized(self.quantized_path)
+    
+    @property
+    def classes(self) -> np.ndarray:
+        """Crop names indexed by model class id"""
+        if self._bundle_classes is not None:
+            return self._bundle_classes
+        return self.label_encoder.classes_
+    
     def _model_exists(self) -> bool:
         """Check if model files exist"""
         return (os.path.exists(self.model_path) and 
@@ -54,72 +156,37 @@ class CropRecommendationModel:
     
     def _load_model(self):
         """Load saved model"""
+        import joblib
         self.model = joblib.load(self.model_path)
         self.scaler = joblib.load(self.scaler_path)
         self.label_encoder = joblib.load(self.label_encoder_path)
     
     def _train_model(self):
         """Train the ML model on crop dataset"""
+        from .crop_training import train_crop_model
         
-        # Load dataset
-        # dataset_path = os.path.join('datasets', 'crop_recommendation.csv')
-        dataset_path = os.path.join('datasets', 'Crop_recommendation_real.csv')
-        
-        if not os.path.exists(dataset_path):
-            raise FileNotFoundError(
-                f"Dataset not found at {dataset_path}. "
-                "Please ensure crop_recommendation.csv is in the datasets folder."
-            )
-        
-        # Read data
-        df = pd.read_csv(dataset_path)
-        
-        print(f"📊 Dataset loaded: {len(df)} samples, {len(df['label'].unique())} crops")
-        
-        # Prepare features and labels
-        X = df[['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']]
-        y = df['label']
-        
-        # Encode labels
-        self.label_encoder = LabelEncoder()
-        y_encoded = self.label_encoder.fit_transform(y)
-        
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y_encoded, test_size=0.2, random_state=42, stratify=y_encoded
-        )
-        
-        # Scale features
-        self.scaler = StandardScaler()
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
-        # Train Random Forest model
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=20,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-            n_jobs=-1
-        )
-        
-        print("🔄 Training model...")
-        self.model.fit(X_train_scaled, y_train)
-        
-        # Evaluate
-        y_pred = self.model.predict(X_test_scaled)
-        accuracy = accuracy_score(y_test, y_pred)
-        
-        print(f"✅ Model Accuracy: {accuracy * 100:.2f}%")
-        
-        # Save model
-        os.makedirs(self.model_dir, exist_ok=True)
-        joblib.dump(self.model, self.model_path)
-        joblib.dump(self.scaler, self.scaler_path)
-        joblib.dump(self.label_encoder, self.label_encoder_path)
-        
-        print(f"💾 Model saved to {self.model_path}")
+        trained = train_crop_model(self.model_dir)
+        self.model = trained['model']
+        self.scaler = trained['scaler']
+        self.label_encoder = trained['label_encoder']
+        self.accuracy = trained['accuracy']
+    
+    def memory_footprint(self) -> int:
+        """Approximate bytes held by the loaded forest, scaler and encoder"""
+        total = 0
+        for estimator in getattr(self.model, 'estimators_', None) or []:
+            tree_state = estimator.tree_.__getstate__()
+            total += tree_state['nodes'].nbytes + tree_state['values'].nbytes
+        for attr in ('mean_', 'scale_', 'var_'):
+            array = getattr(self.scaler, attr, None)
+            if array is not None:
+                total += array.nbytes
+        classes = getattr(self.label_encoder, 'classes_', None)
+        if classes is not None:
+            total += classes.nbytes
+        if self.engine is not None:
+            total += self.engine.nbytes()
+        return total
     
     def recommend_crop(self, N: float, P: float, K: float, 
                       temperature: float, humidity: float, 
@@ -144,60 +211,86 @@ class CropRecommendationModel:
             }
         """
         
-        # Prepare input
-        features = np.array([[N, P, K, temperature, humidity, ph, rainfall]])
-        features_scaled = self.scaler.transform(features)
-        
-        # Get prediction
-        prediction = self.model.predict(features_scaled)[0]
-        predicted_crop = self.label_encoder.inverse_transform([prediction])[0]
-        
-        # Get confidence scores for all crops
-        probabilities = self.model.predict_proba(features_scaled)[0]
-        
-        # Get top 5 crops with probabilities
-        top_indices = np.argsort(probabilities)[::-1][:5]
-        top_crops = [
-            {
-                'crop': self.label_encoder.inverse_transform([idx])[0],
-                'confidence': float(probabilities[idx])
-            }
-            for idx in top_indices
-        ]
-        
-        return {
-            'recommended_crop': predicted_crop,
-            'confidence': float(probabilities[prediction]),
-            'top_5_recommendations': top_crops
-        }
+        features = np.array([[N, P, K, temperature, humidity, ph, rainfall]], dtype=float)
+        return self.recommend_from_features(features)[0]
     
     def recommend_crops_batch(self, soil_climate_data: List[Dict]) -> List[Dict]:
         """
         Recommend crops for multiple locations/conditions
         
+        All rows are scored together: one feature matrix, one scaler
+        transform and one predict_proba call for the whole batch.
+        
         Args:
             soil_climate_data: List of dicts with N, P, K, temp, humidity, ph, rainfall
         
         Returns:
             List of recommendation results
         """
-        results = []
+        if not soil_climate_data:
+            return []
         
-        for data in soil_climate_data:
-            recommendation = self.recommend_crop(
-                N=data['N'],
-                P=data['P'],
-                K=data['K'],
-                temperature=data['temperature'],
-                humidity=data['humidity'],
-                ph=data['ph'],
-                rainfall=data['rainfall']
-            )
+        features = np.array(
+            [[data[column] for column in FEATURE_COLUMNS] for data in soil_climate_data],
+            dtype=float
+        )
+        results = self.recommend_from_features(features)
+        
+        for recommendation, data in zip(results, soil_climate_data):
             recommendation['input_data'] = data
-            results.append(recommendation)
         
         return results
     
+    def recommend_from_features(self, features: np.ndarray, top_k: int = 5) -> List[Dict]:
+        """
+        Score a (n_samples, 7) matrix of raw inputs in FEATURE_COLUMNS order
+        
+        Returns:
+            One recommendation dict per row (same shape as recommend_crop)
+        """
+        probabilities = self.predict_proba(features)
+        crop_names = self.classes
+        n_samples, n_classes = probabilities.shape
+        top_k = min(top_k, n_classes)
+        
+        predictions = probabilities.argmax(axis=1)
+        rows = np.arange(n_samples)[:, None]
+        
+        # Top-k over the whole matrix: partition first, then order only k columns
+        if top_k < n_classes:
+            top_indices = np.argpartition(-probabilities, top_k - 1, axis=1)[:, :top_k]
+        else:
+            top_indices = np.tile(np.arange(n_classes), (n_samples, 1))
+        order = np.argsort(-probabilities[rows, top_indices], axis=1, kind='stable')
+        top_indices = top_indices[rows, order]
+        top_probabilities = probabilities[rows, top_indices]
+        
+        results = []
+        for i in range(n_samples):
+            prediction = predictions[i]
+            results.append({
+                'recommended_crop': str(crop_names[prediction]),
+                'confidence': float(probabilities[i, prediction]),
+                'top_5_recommendations': [
+                    {
+                        'crop': str(crop_names[idx]),
+                        'confidence': float(probability)
+                    }
+                    for idx, probability in zip(top_indices[i], top_probabilities[i])
+                ]
+            })
+        
+        return results
+    
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Class probabilities for a matrix of raw (unscaled) inputs"""
+        if self.engine is not None:
+            # Scaler is already folded into the compiled split thresholds
+            return self.engine.predict_proba(features)
+        
+        features_scaled = self.scaler.transform(features)
+        return self.model.predict_proba(features_scaled)
+    
     def get_crop_requirements(self, crop_name: str) -> Dict:
         """
         Get optimal conditions for a specific crop
@@ -208,72 +301,28 @@ class CropRecommendationModel:
         Returns:
             Dictionary with optimal parameter ranges
         """
-        
-        dataset_path = os.path.join('datasets', 'Crop_recommendation_real.csv')
-        df = pd.read_csv(dataset_path)
-        
-        # Filter data for the specific crop
-        crop_data = df[df['label'].str.lower() == crop_name.lower()]
-        
-        if len(crop_data) == 0:
-            return {'error': f'Crop "{crop_name}" not found in database'}
-        
-        # Calculate statistics
-        requirements = {
-            'crop_name': crop_name,
-            'optimal_conditions': {
-                'nitrogen': {
-                    'min': float(crop_data['N'].min()),
-                    'max': float(crop_data['N'].max()),
-                    'avg': float(crop_data['N'].mean()),
-                },
-                'phosphorous': {
-                    'min': float(crop_data['P'].min()),
-                    'max': float(crop_data['P'].max()),
-                    'avg': float(crop_data['P'].mean()),
-                },
-                'potassium': {
-                    'min': float(crop_data['K'].min()),
-                    'max': float(crop_data['K'].max()),
-                    'avg': float(crop_data['K'].mean()),
-                },
-                'temperature': {
-                    'min': float(crop_data['temperature'].min()),
-                    'max': float(crop_data['temperature'].max()),
-                    'avg': float(crop_data['temperature'].mean()),
-                },
-                'humidity': {
-                    'min': float(crop_data['humidity'].min()),
-                    'max': float(crop_data['humidity'].max()),
-                    'avg': float(crop_data['humidity'].mean()),
-                },
-                'ph': {
-                    'min': float(crop_data['ph'].min()),
-                    'max': float(crop_data['ph'].max()),
-                    'avg': float(crop_data['ph'].mean()),
-                },
-                'rainfall': {
-                    'min': float(crop_data['rainfall'].min()),
-                    'max': float(crop_data['rainfall'].max()),
-                    'avg': float(crop_data['rainfall'].mean()),
-                }
-            },
-            'samples_count': len(crop_data)
-        }
-        
-        return requirements
+        from .model_registry import get_crop_catalog
+        return get_crop_catalog().get_requirements(crop_name)
     
     def get_all_crops(self) -> List[str]:
         """Get list of all crops in the dataset"""
-        dataset_path = os.path.join('datasets', 'Crop_recommendation_real.csv')
-        df = pd.read_csv(dataset_path)
-        return sorted(df['label'].unique().tolist())
+        from .model_registry import get_crop_catalog
+        return get_crop_catalog().get_all_crops()
     
-    def retrain_model(self):
-        """Retrain the model (useful after adding more data)"""
+    def retrain_model(self) -> str:
+        """
+        Retrain the model (useful after adding more data)
+        
+        Training runs in a separate process and writes a new versioned bundle,
+        which is then activated. This instance keeps serving its own version;
+        workers hot-swap to the new one through the model registry.
+        """
+        from .model_bundles import train_bundle_in_subprocess
+        
         print("🔄 Retraining model...")
-        self._train_model()
-        print("✅ Model retrained successfully")
+        version = train_bundle_in_subprocess()
+        print(f"✅ Model retrained successfully ({version})")
+        return version
 
 
 def test_crop_recommender():
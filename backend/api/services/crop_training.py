@@ -0,0 +1,152 @@
+# backend/api/services/crop_training.py
+"""
+Crop Model Training
+Everything that needs pandas or scikit-learn's training/evaluation modules.
+Serving never imports this module; it is loaded only when a model has to be
+trained or evaluated.
+"""
+
+import os
+import time
+from typing import Dict
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from .crop_recommender import DATASET_PATH, FEATURE_COLUMNS
+from .forest_engine import CompiledForest
+
+
+def load_train_test_split(dataset_path: str = DATASET_PATH):
+    """
+    Read the dataset and split it exactly as training does
+
+    Returns:
+        X_train, X_test, y_train, y_test (raw features, encoded labels), label_encoder
+    """
+    if not os.path.exists(dataset_path):
+        raise FileNotFoundError(
+            f"Dataset not found at {dataset_path}. "
+            "Please ensure crop_recommendation.csv is in the datasets folder."
+        )
+
+    # Read data
+    df = pd.read_csv(dataset_path)
+
+    print(f"📊 Dataset loaded: {len(df)} samples, {len(df['label'].unique())} crops")
+
+    # Prepare features and labels
+    X = df[FEATURE_COLUMNS]
+    y = df['label']
+
+    # Encode labels
+    label_encoder = LabelEncoder()
+    y_encoded = label_encoder.fit_transform(y)
+
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y_encoded, test_size=0.2, random_state=42, stratify=y_encoded
+    )
+    return X_train, X_test, y_train, y_test, label_encoder
+
+
+def train_crop_model(model_dir: str) -> Dict:
+    """
+    Train the Random Forest on the crop dataset and save it to model_dir
+
+    Returns:
+        {'model', 'scaler', 'label_encoder', 'accuracy'}
+    """
+    # Load and split dataset
+    X_train, X_test, y_train, y_test, label_encoder = load_train_test_split()
+
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    # Train Random Forest model
+    model = RandomForestClassifier(
+        n_estimators=100,
+        max_depth=20,
+        min_samples_split=5,
+        min_samples_leaf=2,
+        random_state=42,
+        n_jobs=-1
+    )
+
+    print("🔄 Training model...")
+    model.fit(X_train_scaled, y_train)
+
+    # Evaluate
+    y_pred = model.predict(X_test_scaled)
+    accuracy = float(accuracy_score(y_test, y_pred))
+
+    print(f"✅ Model Accuracy: {accuracy * 100:.2f}%")
+
+    # Save model
+    model_path = os.path.join(model_dir, 'crop_model.pkl')
+    os.makedirs(model_dir, exist_ok=True)
+    joblib.dump(model, model_path)
+    joblib.dump(scaler, os.path.join(model_dir, 'crop_scaler.pkl'))
+    joblib.dump(label_encoder, os.path.join(model_dir, 'crop_label_encoder.pkl'))
+
+    print(f"💾 Model saved to {model_path}")
+
+    return {
+        'model': model,
+        'scaler': scaler,
+        'label_encoder': label_encoder,
+        'accuracy': accuracy,
+    }
+
+
+def quantization_report(reference, quantized: CompiledForest, bundle_path: str) -> Dict:
+    """
+    Compare a quantized engine against the full-precision model on the
+    hold-out split used by training
+
+    Returns:
+        Accuracy of both, their delta, prediction agreement, probability
+        error, artifact sizes and single-row/batch latency
+    """
+    _, X_test, _, y_test, _ = load_train_test_split()
+    X_test = X_test.to_numpy(dtype=float)
+
+    reference_proba = reference.predict_proba(X_test)
+    quantized_proba = quantized.predict_proba(X_test)
+    reference_pred = reference_proba.argmax(axis=1)
+    quantized_pred = quantized_proba.argmax(axis=1)
+
+    def latency_ms(predict, X, repeats):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            predict(X)
+        return (time.perf_counter() - start) / repeats * 1000
+
+    reference_accuracy = float((reference_pred == y_test).mean())
+    quantized_accuracy = float((quantized_pred == y_test).mean())
+
+    return {
+        'test_samples': int(len(y_test)),
+        'reference_accuracy': reference_accuracy,
+        'quantized_accuracy': quantized_accuracy,
+        'accuracy_delta': quantized_accuracy - reference_accuracy,
+        'prediction_agreement': float((reference_pred == quantized_pred).mean()),
+        'max_probability_error': float(np.abs(reference_proba - quantized_proba).max()),
+        'mean_probability_error': float(np.abs(reference_proba - quantized_proba).mean()),
+        'reference_size_bytes': sum(
+            os.path.getsize(path)
+            for path in (reference.model_path, reference.scaler_path, reference.label_encoder_path)
+        ),
+        'quantized_size_bytes': os.path.getsize(bundle_path),
+        'reference_single_row_ms': latency_ms(reference.predict_proba, X_test[:1], 50),
+        'quantized_single_row_ms': latency_ms(quantized.predict_proba, X_test[:1], 50),
+        'reference_batch_ms': latency_ms(reference.predict_proba, X_test, 5),
+        'quantized_batch_ms': latency_ms(quantized.predict_proba, X_test, 5),
+    }
@@ -0,0 +1,338 @@
+# backend/api/services/forest_engine.py
+"""
+Compiled Random Forest Inference Engine
+Flattens a trained RandomForestClassifier into contiguous NumPy arrays and
+evaluates every tree in one vectorized traversal
+"""
+
+import os
+import shutil
+import numpy as np
+from typing import Dict
+
+# sklearn marks leaves with this child index
+TREE_LEAF = -1
+
+# Arrays persisted by CompiledForest.save(), one uncompressed .npy file each
+ARRAY_NAMES = ('feature', 'threshold', 'children', 'value_index', 'leaf_values', 'roots', 'meta')
+
+# Upper bound on ulp steps when snapping a folded threshold to its exact value
+_FOLD_MAX_STEPS = 64
+
+
+def _fold_scaler(threshold: np.ndarray, mean: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """
+    Move split thresholds from scaled space into raw input space
+
+    sklearn evaluates `float32((x - mean) / scale) <= t`. Because that is
+    monotonic in x, it is equivalent to `x <= x_star` for a single float64
+    x_star per split. The float32 cast moves the decision boundary to the
+    midpoint between the largest float32 <= t and its successor; start from
+    that midpoint mapped back to raw space and step by ulps until the decision
+    flips, so the folded forest reproduces sklearn's branch choices exactly.
+    """
+    def goes_left(x):
+        return ((x - mean) / scale).astype(np.float32) <= threshold
+
+    below = threshold.astype(np.float32)
+    below = np.where(below > threshold, np.nextafter(below, np.float32(-np.inf)), below)
+    above = np.nextafter(below, np.float32(np.inf))
+    boundary = (below.astype(np.float64) + above.astype(np.float64)) / 2
+
+    folded = boundary * scale + mean
+
+    # Step down until every split sends its threshold value left...
+    for _ in range(_FOLD_MAX_STEPS):
+        wrong = ~goes_left(folded)
+        if not wrong.any():
+            break
+        folded[wrong] = np.nextafter(folded[wrong], -np.inf)
+
+    # ...then up while the next float64 still goes left
+    for _ in range(_FOLD_MAX_STEPS):
+        candidate = np.nextafter(folded, np.inf)
+        step = goes_left(candidate)
+        if not step.any():
+            break
+        folded[step] = candidate[step]
+
+    return folded
+
+
+class CompiledForest:
+    """
+    Pure-NumPy forest evaluator
+
+    All trees share one set of node arrays; `children[node]` holds the
+    (left, right) pair, flattened. Leaves point to themselves with an
+    infinite threshold, so a fixed number of steps (the deepest tree's depth)
+    walks every sample through every tree without per-tree Python dispatch.
+    When a StandardScaler is supplied its transform is folded into the split
+    thresholds, so raw (unscaled) inputs are evaluated directly.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray,
+                 children: np.ndarray, value_index: np.ndarray, leaf_values: np.ndarray,
+                 roots: np.ndarray, max_depth: int, n_features: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value_index = value_index
+        self.leaf_values = leaf_values
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_classes(self) -> int:
+        return self.leaf_values.shape[1]
+
+    @classmethod
+    def from_sklearn(cls, forest, scaler=None) -> 'CompiledForest':
+        """
+        Build the engine from a fitted RandomForestClassifier
+
+        Args:
+            forest: fitted sklearn RandomForestClassifier
+            scaler: optional fitted StandardScaler applied before the forest
+        """
+        features, thresholds, children = [], [], []
+        value_indices, leaf_values, roots = [], [], []
+        offset = 0
+        leaf_offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == TREE_LEAF
+            node_ids = np.arange(n_nodes)
+
+            feature = np.where(is_leaf, 0, tree.feature).astype(np.int32)
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            # Per-leaf class distribution, normalized like DecisionTree.predict_proba
+            values = tree.value[is_leaf][:, 0, :]
+            values = values / values.sum(axis=1, keepdims=True)
+            value_index = np.full(n_nodes, -1, dtype=np.int32)
+            value_index[is_leaf] = np.arange(len(values)) + leaf_offset
+
+            features.append(feature)
+            thresholds.append(threshold)
+            children.append(np.stack([left, right], axis=1))
+            value_indices.append(value_index)
+            leaf_values.append(values)
+            roots.append(offset)
+
+            offset += n_nodes
+            leaf_offset += len(values)
+            max_depth = max(max_depth, tree.max_depth)
+
+        feature = np.concatenate(features)
+        threshold = np.concatenate(thresholds).astype(np.float64)
+
+        if scaler is not None:
+            split = np.isfinite(threshold)
+            threshold[split] = _fold_scaler(
+                threshold[split],
+                scaler.mean_[feature[split]],
+                scaler.scale_[feature[split]],
+            )
+
+        return cls(
+            feature=feature,
+            threshold=threshold,
+            children=np.concatenate(children).astype(np.int32),
+            value_index=np.concatenate(value_indices),
+            leaf_values=np.concatenate(leaf_values).astype(np.float64),
+            roots=np.array(roots, dtype=np.int32),
+            max_depth=max_depth,
+            n_features=forest.n_features_in_,
+        )
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node reached by every sample in every tree, shape (n_samples, n_trees)"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f'Expected input of shape (n_samples, {self.n_features}), got {X.shape}'
+            )
+
+        # Flat indexing with take() avoids 2-D fancy-indexing overhead
+        X_flat = np.ascontiguousarray(X).ravel()
+        row_offsets = (np.arange(X.shape[0]) * self.n_features)[:, None]
+        children = self.children.ravel()
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+
+        for _ in range(self.max_depth):
+            go_right = X_flat.take(row_offsets + self.feature.take(nodes)) > self.threshold.take(nodes)
+            nodes = children.take(nodes * 2 + go_right)
+
+        return nodes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Mean class distribution over all trees, shape (n_samples, n_classes)"""
+        leaves = self.apply(X)
+        values = self.leaf_values[self.value_index.take(leaves)]
+        return values.sum(axis=1) / self.n_trees
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Engine state as plain arrays (for saving or memory accounting)"""
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'children': self.children,
+            'value_index': self.value_index,
+            'leaf_values': self.leaf_values,
+            'roots': self.roots,
+            'meta': np.array([self.max_depth, self.n_features], dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'CompiledForest':
+        meta = arrays['meta']
+        return cls(
+            feature=arrays['feature'],
+            threshold=arrays['threshold'],
+            children=arrays['children'],
+            value_index=arrays['value_index'],
+            leaf_values=arrays['leaf_values'],
+            roots=arrays['roots'],
+            max_depth=int(meta[0]),
+            n_features=int(meta[1]),
+        )
+
+    def save(self, directory: str):
+        """
+        Write every array as an uncompressed .npy file
+
+        The files are written to a temporary sibling directory that is renamed
+        into place, so a concurrent reader never sees a partial set.
+        """
+        tmp_dir = f'{directory}.{os.getpid()}.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for name, array in self.arrays().items():
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), np.ascontiguousarray(array), allow_pickle=False)
+
+        # Workers that already mapped the old files keep their pages until they exit
+        shutil.rmtree(directory, ignore_errors=True)
+        try:
+            os.rename(tmp_dir, directory)
+        except OSError:
+            # Another process renamed its copy first; both copies are identical
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: str = 'r') -> 'CompiledForest':
+        """
+        Load a saved engine, memory-mapping the arrays by default
+
+        With mmap_mode='r' the arrays are read-only views of the page cache, so
+        every process that loads the same files shares one physical copy.
+        """
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in ARRAY_NAMES
+        }
+        return cls.from_arrays(arrays)
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return all(os.path.exists(os.path.join(directory, f'{name}.npy')) for name in ARRAY_NAMES)
+
+    @property
+    def memory_mapped(self) -> bool:
+        return isinstance(self.leaf_values, np.memmap)
+
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays().values())
+
+
+# ============================================
+# COMPACT QUANTIZED FORMAT
+# ============================================
+
+QUANTIZED_FORMAT_VERSION = 1
+LEAF_LEVELS = 255  # uint8 leaf distributions
+
+
+def save_quantized(engine: CompiledForest, classes: np.ndarray, path: str):
+    """
+    Write a compact, pickle-free npz bundle of a compiled forest
+
+    - thresholds as float32 (raw input space, scaler already folded in)
+    - feature ids as uint8, child indices tree-local int16 (int32 if a tree
+      has more than 32767 nodes)
+    - leaf class distributions quantized to uint8 (0-255 per class)
+    - class labels as a fixed-width unicode array
+    """
+    tree_sizes = np.diff(np.append(engine.roots, len(engine.feature))).astype(np.int32)
+    node_tree_root = np.repeat(engine.roots, tree_sizes)
+    local_children = engine.children - node_tree_root[:, None]
+    index_dtype = np.int16 if tree_sizes.max() <= np.iinfo(np.int16).max else np.int32
+
+    leaf_levels = np.rint(engine.leaf_values * LEAF_LEVELS).astype(np.uint8)
+
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez_compressed(
+        tmp_path,
+        format_version=np.array([QUANTIZED_FORMAT_VERSION], dtype=np.int32),
+        feature=engine.feature.astype(np.uint8),
+        threshold=engine.threshold.astype(np.float32),
+        children=local_children.astype(index_dtype),
+        tree_sizes=tree_sizes,
+        leaf_levels=leaf_levels,
+        classes=np.asarray(classes).astype(str),
+        meta=np.array([engine.max_depth, engine.n_features], dtype=np.int64),
+    )
+    os.replace(tmp_path, path)
+
+
+def load_quantized(path: str):
+    """
+    Load a bundle written by save_quantized (no pickle involved)
+
+    Returns:
+        (CompiledForest, classes)
+    """
+    with np.load(path, allow_pickle=False) as bundle:
+        if int(bundle['format_version'][0]) != QUANTIZED_FORMAT_VERSION:
+            raise ValueError(f'Unsupported quantized model format in {path}')
+
+        tree_sizes = bundle['tree_sizes']
+        roots = (np.cumsum(tree_sizes) - tree_sizes).astype(np.int32)
+        node_tree_root = np.repeat(roots, tree_sizes)
+        children = (bundle['children'].astype(np.int32) + node_tree_root[:, None]).astype(np.int32)
+
+        # Leaves are the self-loops; their order matches the leaf table rows
+        is_leaf = children[:, 0] == np.arange(len(children))
+        value_index = np.full(len(children), -1, dtype=np.int32)
+        value_index[is_leaf] = np.arange(is_leaf.sum())
+
+        # Dequantize; renormalize so every leaf still sums to 1
+        levels = bundle['leaf_levels'].astype(np.float64)
+        leaf_values = levels / np.maximum(levels.sum(axis=1, keepdims=True), 1)
+
+        threshold = bundle['threshold'].astype(np.float64)
+        threshold[is_leaf] = np.inf
+
+        engine = CompiledForest(
+            feature=bundle['feature'].astype(np.int32),
+            threshold=threshold,
+            children=children,
+            value_index=value_index,
+            leaf_values=leaf_values,
+            roots=roots,
+            max_depth=int(bundle['meta'][0]),
+            n_features=int(bundle['meta'][1]),
+        )
+        classes = bundle['classes']
+
+    return engine, classes
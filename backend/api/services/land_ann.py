@@ -0,0 +1,422 @@
+# backend/api/services/land_ann.py
+"""
+Approximate Nearest-Neighbour Land Index
+Random-projection LSH over the standardized land features, for similar-land
+search when exact scans over every listing get too slow. Pure NumPy, saved
+to disk so workers load it instead of rebuilding it.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .land_scoring import LandColumns
+from .land_similarity import FEATURE_NAMES, cosine_scores, standardization, unit_rows, weight_vector
+
+DEFAULT_TABLES = 8
+DEFAULT_BITS = 12
+DEFAULT_PROBES = 2
+
+# Inserted rows are scanned exactly until there are this many (or 2% of the
+# index); then the hash tables are re-sorted to include them
+REINDEX_PENDING = 5000
+
+# Compact the arrays once this share of rows are deleted
+COMPACT_DEAD_RATIO = 0.2
+
+# Indexes this small are always scanned exactly (it's faster and exact)
+EXACT_BELOW = 20000
+
+# Rows hashed per block while building (bounds the projection buffer)
+BUILD_BLOCK = 100000
+
+
+class LSHIndex:
+    """
+    Cosine-similarity LSH (SimHash) with multi-probe queries
+
+    Each of `tables` hash tables maps a land to the signs of `bits` random
+    projections of its standardized, weighted, L2-normalized features. A
+    table is kept as an array of codes sorted once, so a bucket lookup is a
+    searchsorted. Candidates from all tables are re-ranked exactly.
+
+    Recall/latency knob: `probes`. Besides its own bucket, a query also
+    looks in the buckets reached by flipping each of its `probes` least
+    certain bits (projections closest to zero), per table. More probes mean
+    more candidates, higher recall and slower queries.
+
+    Deletes are tombstones; inserts land in a pending range that is scanned
+    exactly until the tables are re-sorted.
+    """
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray, weights: np.ndarray,
+                 tables: int = DEFAULT_TABLES, bits: int = DEFAULT_BITS, seed: int = 42,
+                 planes: Optional[np.ndarray] = None):
+        if not 1 <= bits <= 32:
+            raise ValueError('bits must be between 1 and 32')
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.tables = tables
+        self.bits = bits
+        if planes is None:
+            rng = np.random.default_rng(seed)
+            planes = rng.standard_normal((tables * bits, len(FEATURE_NAMES))).astype(np.float32)
+        self.planes = planes
+        self._powers = (np.uint32(1) << np.arange(bits, dtype=np.uint32)).astype(np.uint32)
+
+        self.version = 0
+        self._lock = threading.RLock()
+        self._reset(np.empty(0, dtype=np.int64), np.empty((0, len(FEATURE_NAMES)), dtype=np.float32))
+
+    # ----- construction -----
+
+    @classmethod
+    def build(cls, columns: LandColumns, weights: Optional[Dict[str, float]] = None,
+              tables: int = DEFAULT_TABLES, bits: int = DEFAULT_BITS, seed: int = 42) -> 'LSHIndex':
+        """
+        Index every row of a LandColumns snapshot, standardized with its
+        similarity_stats (the stored SimilarityStats) when set
+        """
+        features = columns.features
+        mean, scale = columns.similarity_stats if columns.similarity_stats is not None else standardization(features)
+        index = cls(mean, scale, weight_vector(weights), tables, bits, seed)
+        index._reset(columns.ids.copy(), index.encode(features))
+        return index
+
+    def _reset(self, ids: np.ndarray, vectors: np.ndarray):
+        """Replace the contents with the given rows, all of them hashed and sorted"""
+        n = len(ids)
+        self._ids = ids
+        self._vectors = vectors
+        self._alive = np.ones(n, dtype=bool)
+        self._codes = self._hash(vectors)
+        self._size = n
+        self._dead = 0
+        self._positions = {land_id: pos for pos, land_id in enumerate(ids.tolist())}
+        self._sort_tables()
+
+    def _sort_tables(self):
+        """
+        Sort all tables' keys (table << 32 | code) into one array, so every
+        probed bucket is found with a single searchsorted call; rows from
+        here on are pending until the next sort
+        """
+        n = self._size
+        keys = (np.arange(self.tables, dtype=np.uint64)[:, None] << np.uint64(32)) \
+            | self._codes[:, :n].astype(np.uint64)
+        keys = keys.ravel()
+        order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[order]
+        self._order = (order % max(n, 1)).astype(np.int32)
+        self._indexed = n
+
+    # ----- vectors and hashing -----
+
+    def encode(self, features: np.ndarray) -> np.ndarray:
+        """
+        prepare_features() vectors -> standardized, weighted, unit-length
+        float32 rows (the rows SimilarityIndex computes for the same stats)
+        """
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        z = ((features - self.mean) / self.scale).astype(np.float32)
+        return unit_rows(z, self.weights)
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """(tables, n) uint32 bucket codes"""
+        codes = np.empty((self.tables, len(vectors)), dtype=np.uint32)
+        for start in range(0, len(vectors), BUILD_BLOCK):
+            block = vectors[start:start + BUILD_BLOCK] @ self.planes.T
+            signs = (block > 0).reshape(len(block), self.tables, self.bits).astype(np.uint32)
+            codes[:, start:start + len(block)] = (signs @ self._powers).T
+        return codes
+
+    def _probe_codes(self, vector: np.ndarray, probes: int) -> np.ndarray:
+        """(tables, 1 + probes) codes: the query's bucket, then its nearest neighbours"""
+        projection = (self.planes @ vector).reshape(self.tables, self.bits)
+        code = ((projection > 0).astype(np.uint32) @ self._powers)
+        probes = min(probes, self.bits)
+        if probes == 0:
+            return code[:, None]
+        uncertain = np.argsort(np.abs(projection), axis=1)[:, :probes]
+        flipped = code[:, None] ^ self._powers[uncertain]
+        return np.concatenate([code[:, None], flipped], axis=1)
+
+    # ----- queries -----
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    def __contains__(self, land_id: int) -> bool:
+        return land_id in self._positions
+
+    def vector_of(self, land_id: int) -> Optional[np.ndarray]:
+        pos = self._positions.get(land_id)
+        return None if pos is None else self._vectors[pos]
+
+    def candidates(self, vector: np.ndarray, probes: int = DEFAULT_PROBES) -> np.ndarray:
+        """Live row positions sharing a probed bucket with the vector (plus pending rows)"""
+        with self._lock:
+            keys = (np.arange(self.tables, dtype=np.uint64)[:, None] << np.uint64(32)) \
+                | self._probe_codes(vector, probes).astype(np.uint64)
+            keys = keys.ravel()
+            lo = np.searchsorted(self._sorted_keys, keys, side='left')
+            hi = np.searchsorted(self._sorted_keys, keys, side='right')
+            found = [self._order[a:b] for a, b in zip(lo.tolist(), hi.tolist()) if b > a]
+            found.append(np.arange(self._indexed, self._size, dtype=np.int32))
+            positions = np.unique(np.concatenate(found))
+            return positions[self._alive[positions]]
+
+    def query(self, vector: np.ndarray, limit: int, probes: int = DEFAULT_PROBES,
+              exclude_id: Optional[int] = None, exact: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Land ids of (approximately) the `limit` most similar rows, best first,
+        and their cosine similarities (the exact search's float64 scores)
+
+        Scans exactly instead when the index is small (unless exact=False)
+        or the probed buckets hold fewer than `limit` lands.
+        """
+        with self._lock:
+            if exact is None:
+                exact = len(self) < EXACT_BELOW
+            positions = None if exact else self.candidates(vector, probes)
+            exclude = self._positions.get(exclude_id)
+            if positions is not None and exclude is not None:
+                positions = positions[positions != exclude]
+            if exact or len(positions) < limit:
+                positions = np.flatnonzero(self._alive[:self._size])
+                if exclude is not None:
+                    positions = positions[positions != exclude]
+
+            similarity = cosine_scores(self._vectors[positions].T, vector)
+            limit = min(limit, len(positions))
+            if limit <= 0:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+            if limit < len(positions):
+                top = np.argpartition(similarity, len(similarity) - limit)[-limit:]
+            else:
+                top = np.arange(len(positions))
+            # Best first; ties go to the newest land like the exact search
+            top = top[np.lexsort((-self._ids[positions[top]], -similarity[top]))]
+            return self._ids[positions[top]], similarity[top]
+
+    # ----- incremental updates -----
+
+    def insert(self, ids: np.ndarray, features: np.ndarray):
+        """Add (or replace) lands given their prepare_features() vectors"""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return
+        with self._lock:
+            self.delete(ids)
+            vectors = self.encode(features)
+            self._reserve(self._size + len(ids))
+            end = self._size + len(ids)
+            self._ids[self._size:end] = ids
+            self._vectors[self._size:end] = vectors
+            self._alive[self._size:end] = True
+            self._codes[:, self._size:end] = self._hash(vectors)
+            for pos, land_id in enumerate(ids.tolist(), start=self._size):
+                self._positions[land_id] = pos
+            self._size = end
+
+            if self._size - self._indexed > max(REINDEX_PENDING, self._size // 50):
+                self._sort_tables()
+
+    def delete(self, ids: Iterable[int]):
+        with self._lock:
+            for land_id in np.asarray(list(ids), dtype=np.int64).tolist():
+                pos = self._positions.pop(land_id, None)
+                if pos is not None:
+                    self._alive[pos] = False
+                    self._dead += 1
+            if self._dead > COMPACT_DEAD_RATIO * max(self._size, 1):
+                self._compact()
+
+    def _reserve(self, capacity: int):
+        """Grow the row arrays geometrically"""
+        if capacity <= len(self._ids):
+            return
+        capacity = max(capacity, 2 * len(self._ids), 1024)
+        self._ids = _grow(self._ids, capacity)
+        self._vectors = _grow(self._vectors, capacity)
+        self._alive = _grow(self._alive, capacity)
+        self._codes = _grow(self._codes, capacity, axis=1)
+
+    def _compact(self):
+        live = np.flatnonzero(self._alive[:self._size])
+        codes = self._codes[:, live]
+        self._ids = self._ids[live]
+        self._vectors = self._vectors[live]
+        self._alive = np.ones(len(live), dtype=bool)
+        self._codes = np.ascontiguousarray(codes)
+        self._size = len(live)
+        self._dead = 0
+        self._positions = {land_id: pos for pos, land_id in enumerate(self._ids.tolist())}
+        self._sort_tables()
+
+    # ----- persistence -----
+
+    def save(self, path: str):
+        """Write the index atomically (uncompressed .npz)"""
+        with self._lock:
+            n = self._size
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    mean=self.mean, scale=self.scale, weights=self.weights, planes=self.planes,
+                    params=np.array([self.tables, self.bits, self.version, self._indexed], dtype=np.int64),
+                    ids=self._ids[:n], vectors=self._vectors[:n], alive=self._alive[:n],
+                    codes=self._codes[:, :n], sorted_keys=self._sorted_keys, order=self._order,
+                )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'LSHIndex':
+        with np.load(path) as data:
+            tables, bits, version, indexed = data['params'].tolist()
+            index = cls(data['mean'], data['scale'], data['weights'], tables, bits, planes=data['planes'])
+            index.version = version
+            index._ids = data['ids']
+            index._vectors = data['vectors']
+            index._alive = data['alive']
+            index._codes = data['codes']
+            # Saved sorted tables spare workers the sort at startup
+            index._sorted_keys = data['sorted_keys']
+            index._order = data['order']
+        index._indexed = indexed
+        index._size = len(index._ids)
+        index._dead = int((~index._alive).sum())
+        live = np.flatnonzero(index._alive)
+        index._positions = dict(zip(index._ids[live].tolist(), live.tolist()))
+        return index
+
+    def stats(self) -> Dict:
+        return {
+            'lands': len(self),
+            'tables': self.tables,
+            'bits': self.bits,
+            'pending': self._size - self._indexed,
+            'deleted': self._dead,
+            'version': self.version,
+        }
+
+
+def _grow(array: np.ndarray, capacity: int, axis: int = 0) -> np.ndarray:
+    shape = list(array.shape)
+    shape[axis] = capacity
+    grown = np.zeros(shape, dtype=array.dtype)
+    grown[tuple(slice(0, n) for n in array.shape)] = array
+    return grown
+
+
+# ----- shared per-process index -----
+
+_index = None
+_last_checked = 0.0
+_index_lock = threading.Lock()
+
+
+def index_config() -> Dict:
+    from django.conf import settings
+    config = {
+        'ENABLED': False,
+        'PATH': os.path.join('ml_models', 'land_lsh_index.npz'),
+        'TABLES': DEFAULT_TABLES,
+        'BITS': DEFAULT_BITS,
+        'PROBES': DEFAULT_PROBES,
+        'CHECK_INTERVAL': 1.0,
+    }
+    config.update(getattr(settings, 'LAND_SIMILARITY_INDEX', {}))
+    return config
+
+
+def build_land_index(save: bool = True) -> LSHIndex:
+    """Index all available lands (as of now) and optionally save it"""
+    from django.conf import settings
+    from ..models import Land
+    from .land_cache import _latest_change_id
+    from .similar_lands import stored_stats
+
+    config = index_config()
+    version = _latest_change_id()
+    columns = LandColumns.from_queryset(Land.objects.filter(status='available').order_by('-id'))
+    columns.similarity_stats = stored_stats()
+    index = LSHIndex.build(
+        columns, getattr(settings, 'LAND_SIMILARITY_WEIGHTS', None),
+        tables=config['TABLES'], bits=config['BITS'],
+    )
+    index.version = version
+    if save:
+        index.save(config['PATH'])
+    return index
+
+
+def get_land_index() -> LSHIndex:
+    """
+    This process's index: loaded from disk (built and saved if missing or
+    built with other settings or SimilarityStats), then kept in sync with
+    LandChangeLog
+    """
+    global _index, _last_checked
+    config = index_config()
+    with _index_lock:
+        if _index is None:
+            _index = _load_or_build(config)
+        if time.monotonic() - _last_checked >= config['CHECK_INTERVAL']:
+            _sync(_index)
+            _last_checked = time.monotonic()
+    return _index
+
+
+def mark_dirty():
+    """Look at the change log on the next read (called after local commits)"""
+    global _last_checked
+    _last_checked = 0.0
+
+
+def _load_or_build(config: Dict) -> LSHIndex:
+    from django.conf import settings
+    from .similar_lands import stored_stats
+    path = config['PATH']
+    weights = weight_vector(getattr(settings, 'LAND_SIMILARITY_WEIGHTS', None))
+    if os.path.exists(path):
+        try:
+            index = LSHIndex.load(path)
+            stats = stored_stats()
+            if (index.tables, index.bits) == (config['TABLES'], config['BITS']) \
+                    and np.array_equal(index.weights, weights) \
+                    and (stats is None or (np.array_equal(index.mean, stats[0]) and np.array_equal(index.scale, stats[1]))):
+                print(f"✅ Loaded land similarity index ({len(index)} lands)")
+                return index
+            print("⚠️  Land similarity index was built with other settings or statistics, rebuilding...")
+        except Exception as e:
+            print(f"⚠️  Could not load land similarity index: {e}")
+
+    start = time.perf_counter()
+    index = build_land_index(save=True)
+    print(f"✅ Built land similarity index ({len(index)} lands, {time.perf_counter() - start:.1f}s)")
+    return index
+
+
+def _sync(index: LSHIndex):
+    from .land_cache import changes_since, read_available
+
+    changed, version = changes_since(index.version, max_rows=50000)
+    if changed is None:
+        # Too far behind (or a bulk change): rebuild in place of patching
+        global _index
+        _index = build_land_index(save=True)
+        return
+    if changed:
+        fresh = read_available(changed)
+        with index._lock:
+            index.delete(changed)
+            for columns in fresh:
+                index.insert(columns.ids, columns.features)
+            index.version = version
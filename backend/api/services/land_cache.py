@@ -0,0 +1,218 @@
+# backend/api/services/land_cache.py
+"""
+Per-process Land Feature Cache
+Keeps every available land as LandColumns (plus its feature matrix) in
+memory, so recommendation requests don't re-read the Land table
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models import Land, LandChangeLog
+from .land_scoring import LandColumns
+
+# Above this many changed lands a full reload is cheaper than patching
+MAX_PATCH_ROWS = 5000
+
+# Change log retention
+KEEP_CHANGES = 10000
+PRUNE_EVERY = 1000
+
+# id__in lists are split to stay under SQLite's bound-parameter limit
+ID_BATCH_SIZE = 500
+
+
+class LandFeatureCache:
+    """
+    Columns of all lands with status='available', newest first
+
+    Every save or delete of a Land appends a LandChangeLog row (see
+    api/signals.py). The cache remembers the last log id it has applied; at
+    most once per check interval it reads newer log rows and patches just
+    those lands, so changes made by other workers are picked up too. Saves
+    in this process mark the cache dirty so they are visible immediately.
+
+    Readers get an immutable snapshot: patches build new LandColumns and
+    swap the reference.
+    """
+
+    def __init__(self, check_interval: float = 1.0, max_age: float = 600.0):
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._columns = None
+        self.similarity_stats_stored = False
+        self.version = 0
+        self._loaded_at = 0.0
+        self._last_checked = 0.0
+        self.full_loads = 0
+        self.patches = 0
+        self.patched_rows = 0
+
+    def columns(self) -> LandColumns:
+        """Current snapshot, synced with the change log if it is due"""
+        now = time.monotonic()
+        if self._columns is None or now - self._last_checked >= self.check_interval:
+            with self._lock:
+                if self._columns is None or now - self._loaded_at >= self.max_age:
+                    self._full_load()
+                elif time.monotonic() - self._last_checked >= self.check_interval:
+                    self._sync()
+        return self._columns
+
+    def reload(self) -> LandColumns:
+        """Full load now (after the similarity stats were rewritten)"""
+        with self._lock:
+            self._full_load()
+        return self._columns
+
+    def mark_dirty(self):
+        """Force a change-log check on the next read (called after local commits)"""
+        self._last_checked = 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'rows': len(self._columns) if self._columns is not None else 0,
+            'version': self.version,
+            'full_loads': self.full_loads,
+            'patches': self.patches,
+            'patched_rows': self.patched_rows,
+        }
+
+    def _full_load(self):
+        # Read the version first: changes committed during the load are
+        # re-applied by the next sync (patching is idempotent)
+        version = _latest_change_id()
+        columns = LandColumns.from_queryset(
+            Land.objects.filter(status='available').order_by('-id')
+        )
+        columns.similarity_stats = _similarity_stats()
+        self.similarity_stats_stored = columns.similarity_stats is not None
+        self._swap(columns, version)
+        self._loaded_at = time.monotonic()
+        self.full_loads += 1
+
+    def _sync(self):
+        self._last_checked = time.monotonic()
+        changed, version = changes_since(self.version)
+        if changed is None:
+            self._full_load()
+        elif changed:
+            self._patch(changed, version)
+
+    def _patch(self, changed: set, version: int):
+        """Drop the changed lands and re-read the ones that are still available"""
+        current = self._columns
+        keep = np.flatnonzero(~np.isin(current.ids, list(changed)))
+
+        # Stored stats only change through build_similar_lands, which logs a
+        # full reload; without them this worker keeps its own until the next
+        # full load. Either way they are fixed here, so only the changed
+        # lands' feature and similarity rows are computed.
+        stats = current.similarity_stats
+        if stats is None and current._similarity is not None:
+            stats = (current.similarity.mean, current.similarity.scale)
+        current.similarity_stats = stats
+        fresh = read_available(changed)
+        for part in fresh:
+            part.similarity_stats = stats
+
+        columns = LandColumns.concat([current.take(keep)] + fresh)
+        columns = columns.take(np.argsort(-columns.ids, kind='stable'))
+
+        self._swap(columns, version)
+        self.patches += 1
+        self.patched_rows += len(changed)
+
+    def _swap(self, columns: LandColumns, version: int):
+        columns.row_of(-1)  # build the id -> row map before readers see it
+        self._columns = columns
+        self.version = version
+        self._last_checked = time.monotonic()
+
+
+def _similarity_stats() -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    # Shared by every worker; None until build_similar_lands stores them
+    from .similar_lands import stored_stats
+    return stored_stats()
+
+
+def _latest_change_id() -> int:
+    return LandChangeLog.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def changes_since(version: int, max_rows: int = MAX_PATCH_ROWS) -> Tuple[Optional[set], int]:
+    """
+    Land ids changed after change-log id `version`, and the newest log id
+
+    Returns (None, version) when the caller has to reload everything: log
+    rows it never saw were pruned, a bulk change was recorded, or more than
+    max_rows lands changed.
+    """
+    changes = list(
+        LandChangeLog.objects.filter(id__gt=version)
+        .order_by('id').values_list('id', 'land_id')
+    )
+    if not changes:
+        return set(), version
+
+    oldest = LandChangeLog.objects.order_by('id').values_list('id', flat=True).first()
+    changed = {land_id for _, land_id in changes}
+    if (oldest is not None and oldest > version + 1) \
+            or LandChangeLog.ALL_LANDS in changed or len(changed) > max_rows:
+        return None, changes[-1][0]
+    return changed, changes[-1][0]
+
+
+def read_available(land_ids) -> List[LandColumns]:
+    """Columns of the given lands that are still available, in id batches"""
+    ids = sorted(land_ids)
+    return [
+        LandColumns.from_queryset(
+            Land.objects.filter(status='available', id__in=ids[i:i + ID_BATCH_SIZE])
+        )
+        for i in range(0, len(ids), ID_BATCH_SIZE)
+    ]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_land_cache() -> LandFeatureCache:
+    """Shared cache for this process, configured from settings.LAND_FEATURE_CACHE"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from django.conf import settings
+                config = getattr(settings, 'LAND_FEATURE_CACHE', {})
+                _cache = LandFeatureCache(
+                    check_interval=config.get('CHECK_INTERVAL', 1.0),
+                    max_age=config.get('MAX_AGE', 600.0),
+                )
+    return _cache
+
+
+def record_changes(land_ids: List[int]):
+    """
+    Log changed lands for every worker's cache
+
+    Pass [LandChangeLog.ALL_LANDS] after bulk operations that bypass model
+    signals (queryset.update(), bulk_create()) to force a full reload.
+    """
+    entries = LandChangeLog.objects.bulk_create([LandChangeLog(land_id=land_id) for land_id in land_ids])
+
+    # Trim the log now and then; caches that fall behind the trimmed part reload fully
+    last_id = entries[-1].id if entries else None
+    if last_id and last_id // PRUNE_EVERY != (last_id - len(entries)) // PRUNE_EVERY:
+        LandChangeLog.objects.filter(id__lte=last_id - KEEP_CHANGES).delete()
+
+
+def mark_dirty():
+    """Make this process's cache look at the change log on its next read"""
+    if _cache is not None:
+        _cache.mark_dirty()
@@ -0,0 +1,99 @@
+# backend/api/services/land_features.py
+"""
+Query-independent Land Features
+Values that depend only on the land itself. They are stored on Land
+(avg_connectivity, infrastructure_count, size_category, price_category,
+land_type_code) when it is saved, so scoring reads them instead of
+recomputing them per request
+"""
+
+from typing import Dict, Iterable
+
+LAND_TYPE_CODES = {
+    'agricultural': 0,
+    'residential': 1,
+    'commercial': 2,
+    'industrial': 3,
+    'mixed': 4,
+}
+
+# Lower bounds of size categories 1-3 (acres) and price categories 1-3 (₹)
+SIZE_CATEGORY_EDGES = (5, 20, 50)
+PRICE_CATEGORY_EDGES = (500000, 2000000, 5000000)
+
+# Land fields derived here, and the fields they are derived from
+PRECOMPUTED_FIELDS = ('avg_connectivity', 'infrastructure_count', 'size_category', 'price_category', 'land_type_code')
+PRECOMPUTED_INPUTS = frozenset({
+    'highway_proximity_score', 'metro_proximity_score', 'airport_proximity_score',
+    'has_water_supply', 'has_electricity', 'has_road_access',
+    'size_in_acres', 'total_price', 'land_type',
+})
+# Inputs of the Location the pre_save hook points a land at
+LOCATION_INPUTS = frozenset({'city', 'state', 'pincode'})
+
+# Rows re-derived per bulk_update() in refresh_precomputed()
+REFRESH_BATCH_SIZE = 1000
+
+
+def categorize_size(size: float) -> int:
+    """0 Small (< 5 acres), 1 Medium (< 20), 2 Large (< 50), 3 Very Large"""
+    return sum(size >= edge for edge in SIZE_CATEGORY_EDGES)
+
+
+def categorize_price(price: float) -> int:
+    """0 Budget (< ₹5L), 1 Mid-range (< ₹20L), 2 Premium (< ₹50L), 3 Luxury"""
+    return sum(price >= edge for edge in PRICE_CATEGORY_EDGES)
+
+
+def encode_land_type(land_type: str) -> int:
+    return LAND_TYPE_CODES.get(land_type, 0)
+
+
+def precomputed_values(land) -> Dict:
+    """PRECOMPUTED_FIELDS values for a Land's current field values"""
+    return {
+        'avg_connectivity': (
+            land.highway_proximity_score + land.metro_proximity_score + land.airport_proximity_score
+        ) / 3,
+        'infrastructure_count': sum([land.has_water_supply, land.has_electricity, land.has_road_access]),
+        'size_category': categorize_size(float(land.size_in_acres)),
+        'price_category': categorize_price(float(land.total_price)),
+        'land_type_code': encode_land_type(land.land_type),
+    }
+
+
+def feature_values(land) -> Dict:
+    """
+    The stored PRECOMPUTED_FIELDS of a Land, or freshly computed ones when
+    they are not stored yet (unsaved instances, bulk_create() rows)
+    """
+    stored = {name: getattr(land, name) for name in PRECOMPUTED_FIELDS}
+    if None in stored.values():
+        return precomputed_values(land)
+    return stored
+
+
+def with_derived_fields(update_fields: Iterable[str]) -> set:
+    """update_fields of a Land save, plus the fields the pre_save hook re-derives from them"""
+    update_fields = set(update_fields)
+    if update_fields & PRECOMPUTED_INPUTS:
+        update_fields.update(PRECOMPUTED_FIELDS)
+    if update_fields & LOCATION_INPUTS:
+        update_fields.add('location')
+    return update_fields
+
+
+def refresh_precomputed(queryset) -> int:
+    """Re-derive and store PRECOMPUTED_FIELDS for every land in the queryset"""
+    updated = 0
+    batch = []
+    for land in queryset.iterator(chunk_size=REFRESH_BATCH_SIZE):
+        for name, value in precomputed_values(land).items():
+            setattr(land, name, value)
+        batch.append(land)
+        if len(batch) >= REFRESH_BATCH_SIZE:
+            updated += queryset.model.objects.bulk_update(batch, PRECOMPUTED_FIELDS)
+            batch = []
+    if batch:
+        updated += queryset.model.objects.bulk_update(batch, PRECOMPUTED_FIELDS)
+    return updated
@@ -0,0 +1,129 @@
+# backend/api/services/land_geo.py
+"""
+Land Distance Search
+Bounding-box prefilter on the (latitude, longitude) index followed by exact
+great-circle distances computed in one NumPy pass
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models import Land
+
+# Mean Earth radius (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+# Distance at which the proximity subscore reaches 0 when the request sets
+# no max_distance_km
+DEFAULT_REACH_KM = 100.0
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing every point within
+    radius_km; falls back to all longitudes near the poles and across the
+    antimeridian
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat = latitude - math.degrees(angle)
+    max_lat = latitude + math.degrees(angle)
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    ratio = math.sin(angle) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return min_lat, max_lat, -180.0, 180.0
+    spread = math.degrees(math.asin(ratio))
+    if longitude - spread < -180 or longitude + spread > 180:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, longitude - spread, longitude + spread
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to every (latitudes, longitudes) point"""
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(longitudes, dtype=np.float64)) - math.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def distances_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray,
+                 max_distance_km: Optional[float] = None) -> np.ndarray:
+    """
+    haversine_km(), with points outside max_distance_km's bounding box set
+    to inf without computing their distance
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    if max_distance_km is None:
+        return haversine_km(latitude, longitude, latitudes, longitudes)
+
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, max_distance_km)
+    inside = np.flatnonzero(
+        (latitudes >= min_lat) & (latitudes <= max_lat) & (longitudes >= min_lon) & (longitudes <= max_lon)
+    )
+    distance = np.full(len(latitudes), np.inf)
+    distance[inside] = haversine_km(latitude, longitude, latitudes[inside], longitudes[inside])
+    return distance
+
+
+def origin(user_requirements: Dict) -> Optional[Tuple[float, float]]:
+    """(latitude, longitude) the request measures distances from, if any"""
+    if user_requirements.get('latitude') is None or user_requirements.get('longitude') is None:
+        return None
+    return float(user_requirements['latitude']), float(user_requirements['longitude'])
+
+
+def within_box(queryset, latitude: float, longitude: float, radius_km: float):
+    """Queryset narrowed to radius_km's bounding box (a range scan on the lat/lon index)"""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    queryset = queryset.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+    if min_lon > -180 or max_lon < 180:
+        queryset = queryset.filter(longitude__gte=min_lon, longitude__lte=max_lon)
+    return queryset
+
+
+def nearby_lands(latitude: float, longitude: float, radius_km: float, limit: int = 20,
+                 queryset=None) -> List[Dict]:
+    """Available lands within radius_km, nearest first"""
+    if queryset is None:
+        queryset = Land.objects.filter(status='available')
+
+    rows = list(within_box(queryset, latitude, longitude, radius_km).order_by().values_list(
+        'id', 'name', 'city', 'land_type', 'size_in_acres', 'total_price', 'latitude', 'longitude',
+    ))
+    if not rows:
+        return []
+
+    ids = np.array([row[0] for row in rows])
+    latitudes = np.array([float(row[6]) for row in rows])
+    longitudes = np.array([float(row[7]) for row in rows])
+    distance = haversine_km(latitude, longitude, latitudes, longitudes)
+
+    inside = np.flatnonzero(distance <= radius_km)
+    # Equal distances: lower id first
+    nearest = inside[np.lexsort((ids[inside], distance[inside]))][:limit]
+    return [
+        {
+            'land_id': rows[i][0],
+            'name': rows[i][1],
+            'city': rows[i][2],
+            'land_type': rows[i][3],
+            'size_in_acres': float(rows[i][4]),
+            'total_price': float(rows[i][5]),
+            'latitude': float(rows[i][6]),
+            'longitude': float(rows[i][7]),
+            'distance_km': round(float(distance[i]), 2),
+        }
+        for i in nearest.tolist()
+    ]
+
+
+def proximity_score(distance: np.ndarray, user_requirements: Dict) -> np.ndarray:
+    """0-100, falling linearly to 0 at max_distance_km (or DEFAULT_REACH_KM)"""
+    reach = float(user_requirements.get('max_distance_km') or DEFAULT_REACH_KM)
+    return np.maximum(0.0, 100 * (1 - distance / reach))
@@ -1,15 +1,58 @@
 # backend/api/services/land_recommender.py
 
 import numpy as np
-import pandas as pd
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics.pairwise import cosine_similarity
-import joblib
-import os
-from typing import List, Dict, Tuple
+import heapq
+from typing import Iterator, List, Dict, Optional, Tuple
+from django.conf import settings
+from django.db.models import Q
 from api.models import Land
+from .land_ann import get_land_index, index_config
+from .land_cache import get_land_cache
+from .land_features import categorize_price, categorize_size, encode_land_type, feature_values
+from .land_geo import distances_km, haversine_km, origin, proximity_score, within_box
+from .land_scoring import LandColumns, candidate_mask, score_lands, score_profiles, top_indices, describe
+from .land_scoring_sql import top_scored
+from .location_index import resolve_preference, unlinked
+
+# Keys of one recommendation, in response order (distance_km only when the
+# request gives an origin)
+RECOMMENDATION_FIELDS = (
+    'land_id', 'name', 'city', 'size_in_acres', 'total_price', 'price_per_acre', 'score',
+    'subscores', 'matching_features', 'concerns', 'recommendation_level', 'latitude', 'longitude',
+    'distance_km',
+)
+# Fields that need the per-land explanation pass
+DETAIL_FIELDS = ('subscores', 'matching_features', 'concerns')
+
+# Profiles are scored in blocks of at most this many (profile, land) pairs,
+# so one block's overall scores take about 8 MB
+PROFILE_BLOCK_CELLS = 1 << 20
+
+
+def parse_fields(value) -> Optional[Tuple[str, ...]]:
+    """
+    'land_id,score' or ['land_id', 'score'] -> ('land_id', 'score')
+    None or empty means every field
+    """
+    if not value:
+        return None
+    names = value.split(',') if isinstance(value, str) else value
+    fields = tuple(dict.fromkeys(name.strip() for name in names if name.strip()))
+    for name in fields:
+        if name not in RECOMMENDATION_FIELDS:
+            raise ValueError(f'Unknown recommendation field "{name}"')
+    return fields or None
+
+
+def _wants_details(fields: Optional[Tuple[str, ...]]) -> bool:
+    return fields is None or any(name in DETAIL_FIELDS for name in fields)
+
+
+def _select_fields(recommendation: Dict, fields: Optional[Tuple[str, ...]]) -> Dict:
+    if fields is None:
+        return recommendation
+    return {name: recommendation[name] for name in RECOMMENDATION_FIELDS if name in fields and name in recommendation}
+
 
 class LandRecommendationModel:
     """
@@ -35,36 +78,31 @@ class LandRecommendationModel:
         Extract and normalize features from Land object
         Returns: normalized feature vector
         """
+        derived = feature_values(land)
         features = {
             # Size features
             'size_in_acres': float(land.size_in_acres),
-            'size_category': self._categorize_size(float(land.size_in_acres)),
+            'size_category': derived['size_category'],
             
             # Price features
             'price_per_acre': float(land.price_per_acre),
             'total_price': float(land.total_price),
-            'price_category': self._categorize_price(float(land.total_price)),
+            'price_category': derived['price_category'],
             
             # Connectivity scores (0-100)
             'highway_proximity': land.highway_proximity_score,
             'metro_proximity': land.metro_proximity_score,
             'airport_proximity': land.airport_proximity_score,
-            'avg_connectivity': (land.highway_proximity_score + 
-                               land.metro_proximity_score + 
-                               land.airport_proximity_score) / 3,
+            'avg_connectivity': derived['avg_connectivity'],
             
             # Infrastructure boolean to numeric
             'has_water': 1 if land.has_water_supply else 0,
             'has_electricity': 1 if land.has_electricity else 0,
             'has_road': 1 if land.has_road_access else 0,
-            'infrastructure_score': sum([
-                land.has_water_supply,
-                land.has_electricity,
-                land.has_road_access
-            ]) / 3 * 100,
+            'infrastructure_score': derived['infrastructure_count'] / 3 * 100,
             
             # Land type encoded
-            'land_type': self._encode_land_type(land.land_type),
+            'land_type': derived['land_type_code'],
             
             # Location features
             'latitude': float(land.latitude),
@@ -78,36 +116,15 @@ class LandRecommendationModel:
     
     def _categorize_size(self, size: float) -> int:
         """Categorize land size into buckets"""
-        if size < 5:
-            return 0  # Small
-        elif size < 20:
-            return 1  # Medium
-        elif size < 50:
-            return 2  # Large
-        else:
-            return 3  # Very Large
+        return categorize_size(size)
     
     def _categorize_price(self, price: float) -> int:
         """Categorize price into buckets"""
-        if price < 500000:
-            return 0  # Budget
-        elif price < 2000000:
-            return 1  # Mid-range
-        elif price < 5000000:
-            return 2  # Premium
-        else:
-            return 3  # Luxury
+        return categorize_price(price)
     
     def _encode_land_type(self, land_type: str) -> int:
         """Encode land type"""
-        encoding = {
-            'agricultural': 0,
-            'residential': 1,
-            'commercial': 2,
-            'industrial': 3,
-            'mixed': 4
-        }
-        return encoding.get(land_type, 0)
+        return encode_land_type(land_type)
     
     def calculate_suitability_score(self, land: Land, user_requirements: Dict) -> Dict:
         """
@@ -135,9 +152,31 @@ class LandRecommendationModel:
             }
         """
         
+        point = origin(user_requirements)
+        distance = None
+        if point is not None:
+            distance = float(haversine_km(*point, [float(land.latitude)], [float(land.longitude)])[0])
+        
+        scores, overall_score = self._score_land(land, user_requirements, distance=distance)
+        matching_features, concerns = self._explain_land(land, user_requirements)
+        
+        return {
+            'overall_score': round(overall_score, 2),
+            'subscores': {k: round(v, 2) for k, v in scores.items()},
+            'matching_features': matching_features,
+            'concerns': concerns,
+            'recommendation_level': self._get_recommendation_level(overall_score)
+        }
+    
+    def _score_land(self, land: Land, user_requirements: Dict,
+                    location_ids: Optional[Tuple[set, set]] = None,
+                    distance: Optional[float] = None) -> Tuple[Dict, float]:
+        """
+        Numeric half of calculate_suitability_score: (subscores, overall score)
+        distance (km from the request's origin) adds the proximity subscore
+        """
+        
         scores = {}
-        matching_features = []
-        concerns = []
         
         # 1. Size Match (0-100)
         size = float(land.size_in_acres)
@@ -146,14 +185,11 @@ class LandRecommendationModel:
         
         if min_size <= size <= max_size:
             scores['size_match'] = 100
-            matching_features.append(f"Perfect size match: {size} acres")
         elif size < min_size:
             deficit = (size / min_size) * 100
             scores['size_match'] = max(0, deficit)
-            concerns.append(f"Land is smaller than required ({size} < {min_size} acres)")
         else:
             scores['size_match'] = 80  # Larger is usually acceptable
-            matching_features.append(f"Spacious land: {size} acres")
         
         # 2. Price Match (0-100)
         price = float(land.total_price)
@@ -164,48 +200,29 @@ class LandRecommendationModel:
             # Give higher score if price is in lower range (better value)
             price_ratio = (price - min_price) / (max_price - min_price) if max_price > min_price else 0.5
             scores['price_match'] = 100 - (price_ratio * 20)  # 80-100 range
-            matching_features.append(f"Within budget: ₹{price:,.0f}")
         else:
             overshoot = (price / max_price) * 100 if price > max_price else 100
             scores['price_match'] = max(0, 100 - overshoot)
-            if price > max_price:
-                concerns.append(f"Price exceeds budget (₹{price:,.0f} > ₹{max_price:,.0f})")
         
         # 3. Connectivity Score (0-100)
         connectivity_importance = user_requirements.get('connectivity_importance', 0.5)
-        avg_connectivity = (land.highway_proximity_score + 
-                          land.metro_proximity_score + 
-                          land.airport_proximity_score) / 3
+        derived = feature_values(land)
+        avg_connectivity = derived['avg_connectivity']
         
         scores['connectivity'] = avg_connectivity * connectivity_importance + (100 * (1 - connectivity_importance))
         
-        if avg_connectivity > 70:
-            matching_features.append("Excellent connectivity")
-        elif avg_connectivity < 30:
-            concerns.append("Limited connectivity to major transport")
-        
         # 4. Infrastructure Score (0-100)
         infrastructure_importance = user_requirements.get('infrastructure_importance', 0.5)
-        infra_available = sum([
-            land.has_water_supply,
-            land.has_electricity,
-            land.has_road_access
-        ])
+        infra_available = derived['infrastructure_count']
         infra_score = (infra_available / 3) * 100
         
         scores['infrastructure'] = infra_score * infrastructure_importance + (100 * (1 - infrastructure_importance))
         
-        if infra_available == 3:
-            matching_features.append("All basic infrastructure available")
-        elif infra_available == 0:
-            concerns.append("No basic infrastructure available")
-        
         # 5. Location Match (0-100)
-        location_pref = user_requirements.get('location_preference', '')
-        if location_pref and location_pref.lower() in land.city.lower():
+        in_city, in_state = self._location_match(land, user_requirements, location_ids)
+        if in_city:
             scores['location_match'] = 100
-            matching_features.append(f"Located in preferred area: {land.city}")
-        elif location_pref and location_pref.lower() in land.state.lower():
+        elif in_state:
             scores['location_match'] = 70
         else:
             scores['location_match'] = 50  # Neutral if no preference
@@ -214,7 +231,6 @@ class LandRecommendationModel:
         purpose = user_requirements.get('purpose', '')
         if purpose and purpose.lower() == land.land_type.lower():
             scores['land_type_match'] = 100
-            matching_features.append(f"Perfect match: {land.land_type} land")
         else:
             scores['land_type_match'] = 60  # Partial match
         
@@ -228,13 +244,81 @@ class LandRecommendationModel:
             scores.get('land_type_match', 50) * self.feature_weights['soil_quality']
         )
         
-        return {
-            'overall_score': round(overall_score, 2),
-            'subscores': {k: round(v, 2) for k, v in scores.items()},
-            'matching_features': matching_features,
-            'concerns': concerns,
-            'recommendation_level': self._get_recommendation_level(overall_score)
-        }
+        # 7. Proximity (0-100), blended in by distance_importance
+        if distance is not None:
+            importance = user_requirements.get('distance_importance', 0)
+            scores['proximity'] = float(proximity_score(distance, user_requirements))
+            overall_score = overall_score * (1 - importance) + scores['proximity'] * importance
+        
+        return scores, overall_score
+    
+    def _explain_land(self, land: Land, user_requirements: Dict,
+                      location_ids: Optional[Tuple[set, set]] = None) -> Tuple[List[str], List[str]]:
+        """
+        Text half of calculate_suitability_score: (matching_features, concerns)
+        Only run for lands that are actually returned
+        """
+        
+        matching_features = []
+        concerns = []
+        
+        size = float(land.size_in_acres)
+        min_size = user_requirements.get('min_size', 0)
+        max_size = user_requirements.get('max_size', float('inf'))
+        
+        if min_size <= size <= max_size:
+            matching_features.append(f"Perfect size match: {size} acres")
+        elif size < min_size:
+            concerns.append(f"Land is smaller than required ({size} < {min_size} acres)")
+        else:
+            matching_features.append(f"Spacious land: {size} acres")
+        
+        price = float(land.total_price)
+        min_price = user_requirements.get('min_price', 0)
+        max_price = user_requirements.get('max_price', float('inf'))
+        
+        if min_price <= price <= max_price:
+            matching_features.append(f"Within budget: ₹{price:,.0f}")
+        elif price > max_price:
+            concerns.append(f"Price exceeds budget (₹{price:,.0f} > ₹{max_price:,.0f})")
+        
+        derived = feature_values(land)
+        avg_connectivity = derived['avg_connectivity']
+        
+        if avg_connectivity > 70:
+            matching_features.append("Excellent connectivity")
+        elif avg_connectivity < 30:
+            concerns.append("Limited connectivity to major transport")
+        
+        infra_available = derived['infrastructure_count']
+        
+        if infra_available == 3:
+            matching_features.append("All basic infrastructure available")
+        elif infra_available == 0:
+            concerns.append("No basic infrastructure available")
+        
+        in_city, _ = self._location_match(land, user_requirements, location_ids)
+        if in_city:
+            matching_features.append(f"Located in preferred area: {land.city}")
+        
+        purpose = user_requirements.get('purpose', '')
+        if purpose and purpose.lower() == land.land_type.lower():
+            matching_features.append(f"Perfect match: {land.land_type} land")
+        
+        return matching_features, concerns
+    
+    def _location_match(self, land: Land, user_requirements: Dict,
+                        location_ids: Optional[Tuple[set, set]] = None) -> Tuple[bool, bool]:
+        """(land is in the preferred city, land is in the preferred state)"""
+        location_pref = user_requirements.get('location_preference', '')
+        if not location_pref:
+            return False, False
+        if location_ids is not None:
+            # Resolved once per request by resolve_preference()
+            city_ids, state_ids = location_ids
+            if land.location_id is not None:
+                return land.location_id in city_ids, land.location_id in state_ids
+        return location_pref.lower() in land.city.lower(), location_pref.lower() in land.state.lower()
     
     def _get_recommendation_level(self, score: float) -> str:
         """Get recommendation level based on score"""
@@ -247,17 +331,210 @@ class LandRecommendationModel:
         else:
             return "Not Recommended"
     
-    def recommend_lands(self, user_requirements: Dict, limit: int = 10) -> List[Dict]:
+    def recommend_lands(self, user_requirements: Dict, limit: int = 10,
+                        fields: Optional[Tuple[str, ...]] = None) -> List[Dict]:
         """
         Main recommendation function
         
         Args:
             user_requirements: User's search criteria
             limit: Number of recommendations to return
+            fields: Keys to include in each recommendation (see parse_fields);
+                subscores and explanations are not computed when left out
         
         Returns:
             List of recommended lands with scores
         """
+        return list(self.iter_recommend_lands(user_requirements, limit, fields))
+    
+    def iter_recommend_lands(self, user_requirements: Dict, limit: int = 10,
+                             fields: Optional[Tuple[str, ...]] = None) -> Iterator[Dict]:
+        """
+        recommend_lands() one recommendation at a time, best first
+        
+        The candidates are read, scored and ranked before this returns; each
+        land's recommendation (and its explanation) is only built when the
+        iterator reaches it.
+        """
+        mode = getattr(settings, 'LAND_SCORING_MODE', 'cached')
+        
+        if mode in ('python', 'sql', 'vectorized'):
+            # Location preference -> Location ids, once per request
+            location_ids = self._resolve_location(user_requirements)
+            lands = self._candidate_lands(user_requirements, location_ids)
+        
+        if mode == 'python':
+            return self._recommend_lands_python(lands, user_requirements, limit, fields, location_ids)
+        
+        if mode == 'sql':
+            # The database scores, orders and limits; only the top rows are
+            # fetched and explained by calculate_suitability_score
+            lands = top_scored(lands, user_requirements, self.feature_weights, int(limit), location_ids)
+            return self._recommend_lands_python(lands, user_requirements, limit, fields, location_ids)
+        
+        if mode == 'vectorized':
+            # One values_list read of the filtered lands per request
+            columns = LandColumns.from_queryset(lands)
+            mask = None
+        else:
+            # All available lands are already in memory; filter with a mask
+            columns = get_land_cache().columns()
+            mask = candidate_mask(columns, user_requirements)
+        
+        # Distances from the request's origin, bounding-box prefiltered
+        point = origin(user_requirements)
+        max_distance = user_requirements.get('max_distance_km')
+        distance = None
+        if point is not None:
+            distance = distances_km(*point, columns.latitude, columns.longitude, max_distance)
+            if max_distance:
+                within = distance <= max_distance
+                mask = within if mask is None else mask & within
+        
+        # Every score as an array expression
+        scores = score_lands(columns, user_requirements, self.feature_weights, distance)
+        
+        return (
+            self._column_recommendation(columns, scores, i, user_requirements, fields)
+            for i in top_indices(scores['overall_score'], int(limit), mask)
+        )
+    
+    def score_land_batch(self, land_ids: List[int], user_requirements: Dict,
+                         fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Dict], List[int]]:
+        """
+        Score the given lands (any status) against one set of requirements
+        
+        The lands are read in one query and scored in one vectorized pass;
+        each score equals calculate_suitability_score for that land.
+        
+        Returns:
+            (one recommendation per land, in land_ids order; ids not found)
+        """
+        land_ids = list(dict.fromkeys(land_ids))
+        columns = LandColumns.from_queryset(Land.objects.filter(id__in=land_ids).order_by())
+        
+        point = origin(user_requirements)
+        distance = haversine_km(*point, columns.latitude, columns.longitude) if point is not None else None
+        scores = score_lands(columns, user_requirements, self.feature_weights, distance)
+        
+        results, missing = [], []
+        for land_id in land_ids:
+            i = columns.row_of(land_id)
+            if i is None:
+                missing.append(land_id)
+            else:
+                results.append(self._column_recommendation(columns, scores, i, user_requirements, fields))
+        return results, missing
+    
+    def recommend_lands_for_profiles(self, profiles: List[Dict], limit: int = 10,
+                                     fields: Optional[Tuple[str, ...]] = None,
+                                     land_ids: Optional[List[int]] = None) -> List[List[Dict]]:
+        """
+        recommend_lands() for many requirement profiles over the same lands
+        
+        Returns:
+            One recommendation list per profile, in profiles order
+        """
+        return list(self.iter_profile_recommendations(profiles, limit, fields, land_ids))
+    
+    def iter_profile_recommendations(self, profiles: List[Dict], limit: int = 10,
+                                     fields: Optional[Tuple[str, ...]] = None,
+                                     land_ids: Optional[List[int]] = None) -> Iterator[List[Dict]]:
+        """
+        Top `limit` lands of each profile, yielded profile by profile
+        
+        The lands are read once (all available lands from the cache, or the
+        given land_ids in one query) and the overall scores of each block of
+        profiles are one (profiles x lands) score_profiles array. Each
+        profile's list equals recommend_lands() for it over the same lands.
+        """
+        if land_ids is None:
+            columns = get_land_cache().columns()
+        else:
+            columns = LandColumns.from_queryset(Land.objects.filter(id__in=land_ids).order_by())
+        return self._profile_blocks(columns, profiles, int(limit), fields)
+    
+    def _profile_blocks(self, columns: LandColumns, profiles: List[Dict], limit: int,
+                        fields: Optional[Tuple[str, ...]]) -> Iterator[List[Dict]]:
+        block_size = max(1, PROFILE_BLOCK_CELLS // max(1, len(columns)))
+        for start in range(0, len(profiles), block_size):
+            block = profiles[start:start + block_size]
+            
+            # Hard filters and distances are per profile, as in recommend_lands
+            masks, distances = [], []
+            for profile in block:
+                mask = candidate_mask(columns, profile)
+                point = origin(profile)
+                max_distance = profile.get('max_distance_km')
+                distance = None
+                if point is not None:
+                    distance = distances_km(*point, columns.latitude, columns.longitude, max_distance)
+                    if max_distance:
+                        mask &= distance <= max_distance
+                masks.append(mask)
+                distances.append(distance)
+            
+            # Profiles with the same purpose share most candidates: each
+            # group scores only the union of its members' candidate rows
+            groups = {}
+            for k, profile in enumerate(block):
+                groups.setdefault(profile.get('purpose') or '', []).append(k)
+            
+            recommendations = [None] * len(block)
+            for members in groups.values():
+                rows = np.flatnonzero(np.logical_or.reduce([masks[k] for k in members]))
+                overall_scores = score_profiles(
+                    columns, [block[k] for k in members], self.feature_weights,
+                    [distances[k] for k in members], rows
+                )
+                for k, overall_score in zip(members, overall_scores):
+                    top = rows[top_indices(overall_score, limit, masks[k][rows])]
+                    # Subscores and explanations only for the lands returned
+                    returned = columns.take(top)
+                    distance = distances[k]
+                    scores = score_lands(returned, block[k], self.feature_weights,
+                                         distance[top] if distance is not None else None)
+                    recommendations[k] = [
+                        self._column_recommendation(returned, scores, i, block[k], fields)
+                        for i in range(len(top))
+                    ]
+            yield from recommendations
+    
+    def _column_recommendation(self, columns: LandColumns, scores: Dict, i: int, user_requirements: Dict,
+                               fields: Optional[Tuple[str, ...]] = None) -> Dict:
+        """Recommendation dict for row i of score_lands() output"""
+        overall_score = float(scores['overall_score'][i])
+        if _wants_details(fields):
+            subscores, matching_features, concerns = describe(columns, scores, i, user_requirements)
+        else:
+            subscores = matching_features = concerns = None
+        
+        recommendation = {
+            'land_id': int(columns.ids[i]),
+            'name': columns.names[i],
+            'city': columns.cities[i],
+            'size_in_acres': float(columns.size[i]),
+            'total_price': float(columns.total_price[i]),
+            'price_per_acre': float(columns.price_per_acre[i]),
+            'score': round(overall_score, 2),
+            'subscores': subscores,
+            'matching_features': matching_features,
+            'concerns': concerns,
+            'recommendation_level': self._get_recommendation_level(overall_score),
+            'latitude': float(columns.latitude[i]),
+            'longitude': float(columns.longitude[i]),
+        }
+        if 'distance' in scores:
+            recommendation['distance_km'] = round(float(scores['distance'][i]), 2)
+        return _select_fields(recommendation, fields)
+    
+    def _resolve_location(self, user_requirements: Dict) -> Optional[Tuple[set, set]]:
+        """(city-matching, state-matching) Location ids, or None without a preference"""
+        location = user_requirements.get('location_preference')
+        return resolve_preference(location) if location else None
+    
+    def _candidate_lands(self, user_requirements: Dict, location_ids: Optional[Tuple[set, set]] = None):
+        """Available lands passing the hard filters (purpose, location)"""
         
         # Get all available lands
         lands = Land.objects.filter(status='available')
@@ -266,75 +543,170 @@ class LandRecommendationModel:
         if 'purpose' in user_requirements and user_requirements['purpose']:
             lands = lands.filter(land_type=user_requirements['purpose'])
         
-        if 'location_preference' in user_requirements:
+        if user_requirements.get('location_preference'):
+            # Indexed equality on location_id instead of an OR of two
+            # LIKE '%x%' scans over city and state; lands loaded raw
+            # (fixtures, bulk_create) may have no location yet and are
+            # matched on their text fields
+            city_ids, state_ids = location_ids or self._resolve_location(user_requirements)
             location = user_requirements['location_preference']
             lands = lands.filter(
-                city__icontains=location
-            ) | lands.filter(
-                state__icontains=location
+                Q(location_id__in=sorted(city_ids | state_ids))
+                | unlinked('city', location) | unlinked('state', location)
             )
         
-        # Calculate scores for each land
-        recommendations = []
-        for land in lands:
-            score_data = self.calculate_suitability_score(land, user_requirements)
-            
-            recommendations.append({
-                'land_id': land.id,
-                'name': land.name,
-                'city': land.city,
-                'size_in_acres': float(land.size_in_acres),
-                'total_price': float(land.total_price),
-                'price_per_acre': float(land.price_per_acre),
-                'score': score_data['overall_score'],
-                'subscores': score_data['subscores'],
-                'matching_features': score_data['matching_features'],
-                'concerns': score_data['concerns'],
-                'recommendation_level': score_data['recommendation_level'],
-                'latitude': float(land.latitude),
-                'longitude': float(land.longitude),
-            })
-        
-        # Sort by score
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
-        
-        return recommendations[:limit]
+        point = origin(user_requirements)
+        if point is not None and user_requirements.get('max_distance_km'):
+            # Range scan on the (latitude, longitude) index; exact distances
+            # are checked by the caller
+            lands = within_box(lands, *point, float(user_requirements['max_distance_km']))
+        
+        return lands
     
-    def get_similar_lands(self, land_id: int, limit: int = 5) -> List[Dict]:
+    def _recommend_lands_python(self, lands, user_requirements: Dict, limit: int,
+                                fields: Optional[Tuple[str, ...]] = None,
+                                location_ids: Optional[Tuple[set, set]] = None) -> Iterator[Dict]:
+        """
+        Reference implementation: one _score_land call per Land
+        
+        A bounded heap keeps the `limit` best lands while scoring; only those
+        get their explanation strings, as they are consumed. heapq.nlargest
+        keeps equal scores in queryset order, exactly like the stable sort it
+        replaces.
+        """
+        
+        point = origin(user_requirements)
+        if point is not None:
+            # Distances of all candidates in one NumPy pass
+            lands = list(lands)
+            max_distance = user_requirements.get('max_distance_km')
+            distance = distances_km(*point, [float(land.latitude) for land in lands],
+                                    [float(land.longitude) for land in lands], max_distance)
+            pairs = [
+                (land, land_distance) for land, land_distance in zip(lands, distance.tolist())
+                if not max_distance or land_distance <= max_distance
+            ]
+        else:
+            pairs = ((land, None) for land in lands)
+        
+        scored = (
+            (land, land_distance, *self._score_land(land, user_requirements, location_ids, land_distance))
+            for land, land_distance in pairs
+        )
+        best = heapq.nlargest(int(limit), scored, key=lambda item: round(item[3], 2))
+        
+        return (
+            self._land_recommendation(land, land_distance, scores, overall_score, user_requirements,
+                                      fields, location_ids)
+            for land, land_distance, scores, overall_score in best
+        )
+    
+    def _land_recommendation(self, land: Land, land_distance: Optional[float], scores: Dict,
+                             overall_score: float, user_requirements: Dict,
+                             fields: Optional[Tuple[str, ...]] = None,
+                             location_ids: Optional[Tuple[set, set]] = None) -> Dict:
+        """Recommendation dict for one land scored by _score_land"""
+        if _wants_details(fields):
+            subscores = {k: round(v, 2) for k, v in scores.items()}
+            matching_features, concerns = self._explain_land(land, user_requirements, location_ids)
+        else:
+            subscores = matching_features = concerns = None
+        
+        recommendation = {
+            'land_id': land.id,
+            'name': land.name,
+            'city': land.city,
+            'size_in_acres': float(land.size_in_acres),
+            'total_price': float(land.total_price),
+            'price_per_acre': float(land.price_per_acre),
+            'score': round(overall_score, 2),
+            'subscores': subscores,
+            'matching_features': matching_features,
+            'concerns': concerns,
+            'recommendation_level': self._get_recommendation_level(overall_score),
+            'latitude': float(land.latitude),
+            'longitude': float(land.longitude),
+        }
+        if land_distance is not None:
+            recommendation['distance_km'] = round(land_distance, 2)
+        return _select_fields(recommendation, fields)
+    
+    def get_similar_lands(self, land_id: int, limit: int = 5,
+                          weights: Optional[Dict[str, float]] = None) -> List[Dict]:
         """
         Find lands similar to a given land
-        Uses feature similarity
+        Cosine similarity over standardized features (see land_similarity);
+        weights maps feature names to their importance (default 1.0 each)
         """
-        try:
-            target_land = Land.objects.get(id=land_id)
-        except Land.DoesNotExist:
-            return []
+        if weights is None and index_config()['ENABLED']:
+            return self._get_similar_lands_ann(land_id, limit)
         
-        target_features = self.prepare_features(target_land)
+        columns = get_land_cache().columns()
+        index = columns.similarity
         
-        all_lands = Land.objects.exclude(id=land_id).filter(status='available')
-        similarities = []
+        row = columns.row_of(land_id)
+        if row is not None:
+            target = index.vector(row)
+        else:
+            # Target isn't available (sold, pending...) but can still be compared
+            try:
+                target_land = Land.objects.get(id=land_id)
+            except Land.DoesNotExist:
+                return []
+            target = index.standardize(self.prepare_features(target_land))
         
-        for land in all_lands:
-            land_features = self.prepare_features(land)
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(
-                target_features.reshape(1, -1),
-                land_features.reshape(1, -1)
-            )[0][0]
-            
-            similarities.append({
-                'land_id': land.id,
-                'name': land.name,
-                'city': land.city,
-                'similarity_score': round(similarity * 100, 2),
-                'size_in_acres': float(land.size_in_acres),
-                'total_price': float(land.total_price),
-            })
-        
-        similarities.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return similarities[:limit]
+        if row is not None and weights is None:
+            # Same computation as the stored lists (services/similar_lands.py)
+            rows, similarity = (values[0] for values in index.neighbours([row], limit))
+        else:
+            rows, similarity = index.top_k(target, limit, exclude_row=row, weights=weights)
+        
+        return [
+            {
+                'land_id': int(columns.ids[i]),
+                'name': columns.names[i],
+                'city': columns.cities[i],
+                'similarity_score': round(float(score) * 100, 2),
+                'size_in_acres': float(columns.size[i]),
+                'total_price': float(columns.total_price[i]),
+            }
+            for i, score in zip(rows.tolist(), similarity.tolist())
+        ]
+    
+    def _get_similar_lands_ann(self, land_id: int, limit: int) -> List[Dict]:
+        """
+        get_similar_lands through the approximate LSH index (land_ann),
+        for listings too large to scan exactly on every request
+        """
+        index = get_land_index()
+        
+        vector = index.vector_of(land_id)
+        if vector is None:
+            try:
+                target_land = Land.objects.get(id=land_id)
+            except Land.DoesNotExist:
+                return []
+            vector = index.encode(self.prepare_features(target_land))[0]
+        
+        ids, similarity = index.query(vector, limit, probes=index_config()['PROBES'], exclude_id=land_id)
+        details = {
+            row[0]: row for row in Land.objects.filter(id__in=ids.tolist()).values_list(
+                'id', 'name', 'city', 'size_in_acres', 'total_price'
+            )
+        }
+        
+        return [
+            {
+                'land_id': land,
+                'name': details[land][1],
+                'city': details[land][2],
+                'similarity_score': round(float(score) * 100, 2),
+                'size_in_acres': float(details[land][3]),
+                'total_price': float(details[land][4]),
+            }
+            for land, score in zip(ids.tolist(), similarity.tolist())
+            if land in details
+        ]
 
 
 # Example usage function
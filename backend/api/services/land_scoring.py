@@ -0,0 +1,613 @@
+# backend/api/services/land_scoring.py
+"""
+Columnar Land Scoring
+Scores every candidate land at once with NumPy array expressions instead of
+one calculate_suitability_score call per Land object
+"""
+
+from decimal import Context, Decimal
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.db.models import FloatField, IntegerField
+from django.db.models.functions import Cast
+
+from ..models import Land
+from .land_features import LAND_TYPE_CODES, PRICE_CATEGORY_EDGES, SIZE_CATEGORY_EDGES, encode_land_type
+from .land_geo import proximity_score
+from .land_similarity import SimilarityIndex
+
+# Fields pulled with values_list, in this order
+LAND_COLUMNS = (
+    'id', 'name', 'city', 'state', 'land_type',
+    'size_in_acres', 'total_price', 'price_per_acre',
+    'highway_proximity_score', 'metro_proximity_score', 'airport_proximity_score',
+    'has_water_supply', 'has_electricity', 'has_road_access',
+    'latitude', 'longitude',
+    'avg_connectivity', 'infrastructure_count', 'size_category', 'price_category', 'land_type_code',
+)
+
+FLOAT_COLUMNS = ('size_in_acres', 'total_price', 'price_per_acre', 'latitude', 'longitude')
+FLAG_COLUMNS = ('has_water_supply', 'has_electricity', 'has_road_access')
+
+# SQLite keeps 15 significant digits; Django rounds to that before quantizing
+_SQLITE_DECIMAL = Context(prec=15)
+
+# (profile, land) pairs per slice in score_profiles (about 512 KB per array)
+PROFILE_TILE_CELLS = 1 << 16
+
+class LandColumns:
+    """
+    Column-oriented snapshot of a Land queryset
+
+    Numeric fields are float64 arrays (Decimal values converted once per
+    column), so scores computed from them are bit-identical to the
+    per-object float() arithmetic in calculate_suitability_score.
+    """
+
+    def __init__(self, rows: List[tuple]):
+        columns = list(zip(*rows)) if rows else [()] * len(LAND_COLUMNS)
+        data = dict(zip(LAND_COLUMNS, columns))
+        n = len(rows)
+
+        self.ids = np.fromiter(data['id'], dtype=np.int64, count=n)
+        self.names = list(data['name'])
+        self.cities = list(data['city'])
+        self.states = list(data['state'])
+        self.land_types = list(data['land_type'])
+
+        self.size = _decimal_column(data['size_in_acres'], 'size_in_acres')
+        self.total_price = _decimal_column(data['total_price'], 'total_price')
+        self.price_per_acre = _decimal_column(data['price_per_acre'], 'price_per_acre')
+        self.latitude = _decimal_column(data['latitude'], 'latitude')
+        self.longitude = _decimal_column(data['longitude'], 'longitude')
+
+        # (n, 3) highway/metro/airport and water/electricity/road
+        self.proximity = np.array(
+            [data['highway_proximity_score'], data['metro_proximity_score'], data['airport_proximity_score']],
+            dtype=np.int64
+        ).T.reshape(n, 3)
+        self.infrastructure = np.array(
+            [data['has_water_supply'], data['has_electricity'], data['has_road_access']],
+            dtype=bool
+        ).T.reshape(n, 3)
+
+        # Stored on Land when it is saved (see land_features); rows that were
+        # never saved through the model have NULLs, computed here instead
+        self.avg_connectivity = _stored_column(
+            data['avg_connectivity'], np.float64, lambda: self.proximity.sum(axis=1) / 3
+        )
+        self.infrastructure_count = _stored_column(
+            data['infrastructure_count'], np.int64, lambda: self.infrastructure.sum(axis=1)
+        )
+        self.size_category = _stored_column(
+            data['size_category'], np.int64, lambda: _categories(self.size, SIZE_CATEGORY_EDGES)
+        )
+        self.price_category = _stored_column(
+            data['price_category'], np.int64, lambda: _categories(self.total_price, PRICE_CATEGORY_EDGES)
+        )
+        self.type_codes = _stored_column(
+            data['land_type_code'], np.int8, lambda: np.array([encode_land_type(t) for t in self.land_types])
+        )
+
+        # String columns are matched once per distinct value
+        self.city_index = _Factorized(self.cities)
+        self.state_index = _Factorized(self.states)
+        self.land_type_index = _Factorized(self.land_types)
+        self._reset_derived()
+
+    def _reset_derived(self):
+        self._features = None
+        self._similarity = None
+        self.similarity_stats = None
+        self._rows = None
+
+    @classmethod
+    def from_queryset(cls, queryset) -> 'LandColumns':
+        """
+        Read the columns in one query
+
+        Decimal and boolean fields are cast in SQL, so rows arrive as plain
+        floats/ints and Django's per-value Decimal converters are skipped
+        (see _decimal_column for how exactness is kept).
+        """
+        fields = [
+            Cast(name, FloatField()) if name in FLOAT_COLUMNS
+            else Cast(name, IntegerField()) if name in FLAG_COLUMNS
+            else name
+            for name in LAND_COLUMNS
+        ]
+        return cls(list(queryset.values_list(*fields)))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def take(self, indices) -> 'LandColumns':
+        """New LandColumns holding the given rows, in the given order"""
+        indices = np.asarray(indices, dtype=np.int64)
+        taken = object.__new__(LandColumns)
+        for name in _ARRAY_ATTRS:
+            setattr(taken, name, getattr(self, name)[indices])
+        for name in _LIST_ATTRS:
+            values = getattr(self, name)
+            setattr(taken, name, [values[i] for i in indices.tolist()])
+        for name in _INDEX_ATTRS:
+            setattr(taken, name, getattr(self, name).take(indices))
+        taken._reset_derived()
+
+        # Feature rows don't depend on each other, and neither do similarity
+        # rows under fixed stats: carry them instead of recomputing
+        taken.similarity_stats = self.similarity_stats
+        if self._features is not None:
+            taken._features = self._features[indices]
+        if self._similarity is not None and self.similarity_stats is not None:
+            taken._similarity = self._similarity.take(indices)
+        return taken
+
+    @classmethod
+    def concat(cls, parts: List['LandColumns']) -> 'LandColumns':
+        joined = object.__new__(cls)
+        for name in _ARRAY_ATTRS:
+            setattr(joined, name, np.concatenate([getattr(part, name) for part in parts]))
+        for name in _LIST_ATTRS:
+            setattr(joined, name, [value for part in parts for value in getattr(part, name)])
+        for name in _INDEX_ATTRS:
+            setattr(joined, name, _Factorized.concat([getattr(part, name) for part in parts]))
+        joined._reset_derived()
+
+        # With one shared (mean, scale), built rows of the first part are
+        # kept and only the other parts' rows are computed
+        stats = parts[0].similarity_stats
+        if stats is not None and all(part.similarity_stats is stats for part in parts):
+            joined.similarity_stats = stats
+            if parts[0]._features is not None:
+                joined._features = np.concatenate([part.features for part in parts])
+            if parts[0]._similarity is not None:
+                joined._similarity = parts[0]._similarity.concat([part.similarity for part in parts[1:]])
+        return joined
+
+    def row_of(self, land_id: int):
+        """Row holding the given land id, or None"""
+        if self._rows is None:
+            self._rows = {value: row for row, value in enumerate(self.ids.tolist())}
+        return self._rows.get(land_id)
+
+    @property
+    def features(self) -> np.ndarray:
+        """(n, 17) matrix of prepare_features() vectors, built on first use"""
+        if self._features is None:
+            self._features = feature_matrix(self)
+        return self._features
+
+    @property
+    def similarity(self) -> SimilarityIndex:
+        """Standardized SimilarityIndex over the features, built on first use"""
+        if self._similarity is None:
+            from django.conf import settings
+            self._similarity = SimilarityIndex(
+                self.features, getattr(settings, 'LAND_SIMILARITY_WEIGHTS', None), self.similarity_stats
+            )
+        return self._similarity
+
+
+_ARRAY_ATTRS = (
+    'ids', 'type_codes', 'size', 'total_price', 'price_per_acre',
+    'latitude', 'longitude', 'proximity', 'infrastructure',
+    'avg_connectivity', 'infrastructure_count', 'size_category', 'price_category',
+)
+_LIST_ATTRS = ('names', 'cities', 'states', 'land_types')
+_INDEX_ATTRS = ('city_index', 'state_index', 'land_type_index')
+
+
+def feature_matrix(columns: LandColumns) -> np.ndarray:
+    """Row i equals LandRecommendationModel.prepare_features() of land i"""
+    size = columns.size
+    total_price = columns.total_price
+    infrastructure = columns.infrastructure
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value_per_acre = np.where(size > 0, total_price / size, 0.0)
+
+    return np.column_stack([
+        size,
+        columns.size_category,
+        columns.price_per_acre,
+        total_price,
+        columns.price_category,
+        columns.proximity,
+        columns.avg_connectivity,
+        infrastructure,
+        columns.infrastructure_count / 3 * 100,
+        columns.type_codes,
+        columns.latitude,
+        columns.longitude,
+        value_per_acre,
+    ]).astype(np.float64)
+
+
+def candidate_mask(columns: LandColumns, user_requirements: Dict) -> np.ndarray:
+    """
+    In-memory equivalent of the hard filters in _candidate_lands
+    (exact land_type match, case-insensitive city/state substring)
+    """
+    mask = np.ones(len(columns), dtype=bool)
+
+    purpose = user_requirements.get('purpose')
+    if purpose:
+        mask &= columns.land_type_index.matches(lambda land_type: land_type == purpose)
+
+    if 'location_preference' in user_requirements:
+        needle = (user_requirements['location_preference'] or '').lower()
+        if needle:
+            in_city, in_state = _location_hits(columns, needle)
+            mask &= in_city | in_state
+    return mask
+
+
+def score_lands(columns: LandColumns, user_requirements: Dict, weights: Dict[str, float],
+                distance: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    All six subscores and the weighted overall score, one array each
+    (plus proximity when distances from the request's origin are given)
+
+    Mirrors LandRecommendationModel.calculate_suitability_score operation
+    for operation (same branches, same evaluation order).
+    """
+    scores = {}
+    size = columns.size
+    price = columns.total_price
+
+    # 1. Size match
+    min_size = user_requirements.get('min_size', 0)
+    max_size = user_requirements.get('max_size', float('inf'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deficit = np.maximum(0, (size / min_size) * 100)
+    scores['size_match'] = np.where(
+        (min_size <= size) & (size <= max_size), 100.0,
+        np.where(size < min_size, deficit, 80.0)
+    )
+
+    # 2. Price match
+    min_price = user_requirements.get('min_price', 0)
+    max_price = user_requirements.get('max_price', float('inf'))
+    within_budget = (min_price <= price) & (price <= max_price)
+    if max_price > min_price:
+        price_ratio = (price - min_price) / (max_price - min_price)
+    else:
+        price_ratio = np.full(len(columns), 0.5)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        overshoot = np.where(price > max_price, (price / max_price) * 100, 100.0)
+    scores['price_match'] = np.where(
+        within_budget, 100 - (price_ratio * 20), np.maximum(0, 100 - overshoot)
+    )
+
+    # 3. Connectivity
+    connectivity_importance = user_requirements.get('connectivity_importance', 0.5)
+    avg_connectivity = columns.avg_connectivity
+    scores['connectivity'] = avg_connectivity * connectivity_importance + (100 * (1 - connectivity_importance))
+
+    # 4. Infrastructure
+    infrastructure_importance = user_requirements.get('infrastructure_importance', 0.5)
+    infra_available = columns.infrastructure_count
+    infra_score = (infra_available / 3) * 100
+    scores['infrastructure'] = infra_score * infrastructure_importance + (100 * (1 - infrastructure_importance))
+
+    # 5. Location match
+    in_city, in_state = _location_hits(columns, user_requirements.get('location_preference', ''))
+    scores['location_match'] = np.where(in_city, 100.0, np.where(in_state, 70.0, 50.0))
+
+    # 6. Land type match
+    scores['land_type_match'] = np.where(_type_hits(columns, user_requirements.get('purpose', '')), 100.0, 60.0)
+
+    scores['overall_score'] = (
+        scores['size_match'] * weights['size_match'] +
+        scores['price_match'] * weights['price_match'] +
+        scores['connectivity'] * weights['connectivity'] +
+        scores['infrastructure'] * weights['infrastructure'] +
+        scores['location_match'] * weights['location_match'] +
+        scores['land_type_match'] * weights['soil_quality']
+    )
+
+    # 7. Proximity, blended in by distance_importance
+    if distance is not None:
+        importance = user_requirements.get('distance_importance', 0)
+        scores['proximity'] = proximity_score(distance, user_requirements)
+        scores['overall_score'] = scores['overall_score'] * (1 - importance) + scores['proximity'] * importance
+        scores['distance'] = distance
+
+    # Kept for building the explanations of the lands that are returned
+    scores['avg_connectivity'] = avg_connectivity
+    scores['infra_available'] = infra_available
+    scores['in_city'] = in_city
+    scores['type_match'] = scores['land_type_match'] == 100.0
+    return scores
+
+
+def score_profiles(columns: LandColumns, profiles: List[Dict], weights: Dict[str, float],
+                   distances: Optional[List[Optional[np.ndarray]]] = None,
+                   rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Overall score of every (profile, land) pair as an (M, n) array
+
+    Row j equals score_lands(columns, profiles[j], ...)['overall_score']:
+    the same expressions, with the profiles' parameters broadcast as (M, 1)
+    columns. Only the given land rows are scored when `rows` is set (the
+    result is then (M, len(rows))). The lands are processed in slices of
+    about PROFILE_TILE_CELLS pairs, so the temporaries of each slice stay
+    in the CPU cache. distances[j] is profile j's distance array over all
+    rows, or None when it has no origin.
+    """
+    m = len(profiles)
+    n = len(columns) if rows is None else len(rows)
+    overall_score = np.empty((m, n))
+
+    def parameter(name, default):
+        return np.array([float(profile.get(name, default)) for profile in profiles]).reshape(m, 1)
+
+    min_size = parameter('min_size', 0)
+    max_size = parameter('max_size', float('inf'))
+    min_price = parameter('min_price', 0)
+    max_price = parameter('max_price', float('inf'))
+    connectivity_importance = parameter('connectivity_importance', 0.5)
+    infrastructure_importance = parameter('infrastructure_importance', 0.5)
+
+    # String matches per profile and distinct value, gathered per slice
+    location_hits = [_location_unique_hits(columns, profile.get('location_preference', '')) for profile in profiles]
+    city_hits = np.array([hits[0] for hits in location_hits]).reshape(m, -1)
+    state_hits = np.array([hits[1] for hits in location_hits]).reshape(m, -1)
+    type_hits = np.array([
+        _type_unique_hits(columns, profile.get('purpose', '')) for profile in profiles
+    ]).reshape(m, -1)
+
+    step = max(1, PROFILE_TILE_CELLS // max(1, m))
+    for lo in range(0, n, step):
+        tile = slice(lo, lo + step)
+        index = tile if rows is None else rows[tile]
+        size = columns.size[index]
+        price = columns.total_price[index]
+
+        # 1. Size match
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deficit = np.maximum(0, (size / min_size) * 100)
+        size_match = np.where(
+            (min_size <= size) & (size <= max_size), 100.0,
+            np.where(size < min_size, deficit, 80.0)
+        )
+
+        # 2. Price match
+        within_budget = (min_price <= price) & (price <= max_price)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_ratio = np.where(max_price > min_price, (price - min_price) / (max_price - min_price), 0.5)
+            overshoot = np.where(price > max_price, (price / max_price) * 100, 100.0)
+        price_match = np.where(
+            within_budget, 100 - (price_ratio * 20), np.maximum(0, 100 - overshoot)
+        )
+
+        # 3. Connectivity
+        avg_connectivity = columns.avg_connectivity[index]
+        connectivity = avg_connectivity * connectivity_importance + (100 * (1 - connectivity_importance))
+
+        # 4. Infrastructure
+        infra_score = (columns.infrastructure_count[index] / 3) * 100
+        infrastructure = infra_score * infrastructure_importance + (100 * (1 - infrastructure_importance))
+
+        # 5. Location match
+        location_match = np.where(
+            city_hits[:, columns.city_index.codes[index]], 100.0,
+            np.where(state_hits[:, columns.state_index.codes[index]], 70.0, 50.0)
+        )
+
+        # 6. Land type match
+        land_type_match = np.where(type_hits[:, columns.land_type_index.codes[index]], 100.0, 60.0)
+
+        overall_score[:, tile] = (
+            size_match * weights['size_match'] +
+            price_match * weights['price_match'] +
+            connectivity * weights['connectivity'] +
+            infrastructure * weights['infrastructure'] +
+            location_match * weights['location_match'] +
+            land_type_match * weights['soil_quality']
+        )
+
+    # 7. Proximity, only for the profiles that have an origin
+    for j, profile in enumerate(profiles):
+        distance = distances[j] if distances is not None else None
+        if distance is not None:
+            if rows is not None:
+                distance = distance[rows]
+            importance = profile.get('distance_importance', 0)
+            overall_score[j] = overall_score[j] * (1 - importance) + proximity_score(distance, profile) * importance
+    return overall_score
+
+
+def top_indices(overall_score: np.ndarray, limit: int, mask: np.ndarray = None) -> List[int]:
+    """
+    Row indices of the best `limit` lands, best first
+
+    Same order as sorting the rounded scores with Python's stable sort: only
+    rows whose rounded score can reach the cut-off are rounded and sorted.
+    Rows where mask is False are never returned.
+    """
+    rows = np.arange(len(overall_score)) if mask is None else np.flatnonzero(mask)
+    scores = overall_score[rows]
+    n = len(rows)
+    if n == 0 or limit <= 0:
+        return []
+    if limit < n:
+        kth = np.partition(scores, n - limit)[n - limit]
+        # round() is monotonic, so anything below this can't round up to the cut-off
+        candidates = np.flatnonzero(scores >= round(float(kth), 2) - 0.01)
+    else:
+        candidates = np.arange(n)
+
+    rounded = [round(score, 2) for score in scores[candidates].tolist()]
+    order = sorted(range(len(candidates)), key=lambda i: rounded[i], reverse=True)
+    return [int(rows[candidates[i]]) for i in order[:limit]]
+
+
+def describe(columns: LandColumns, scores: Dict[str, np.ndarray], i: int, user_requirements: Dict):
+    """
+    Rounded subscores, matching_features and concerns for row i
+
+    Only called for the lands that are returned. Values and wording are the
+    same as the per-object scorer, including which subscores are ints.
+    """
+    subscores = {}
+    matching_features = []
+    concerns = []
+
+    size = float(columns.size[i])
+    min_size = user_requirements.get('min_size', 0)
+    max_size = user_requirements.get('max_size', float('inf'))
+    if min_size <= size <= max_size:
+        subscores['size_match'] = 100
+        matching_features.append(f"Perfect size match: {size} acres")
+    elif size < min_size:
+        subscores['size_match'] = max(0, float(scores['size_match'][i]))
+        concerns.append(f"Land is smaller than required ({size} < {min_size} acres)")
+    else:
+        subscores['size_match'] = 80
+        matching_features.append(f"Spacious land: {size} acres")
+
+    price = float(columns.total_price[i])
+    min_price = user_requirements.get('min_price', 0)
+    max_price = user_requirements.get('max_price', float('inf'))
+    if min_price <= price <= max_price:
+        subscores['price_match'] = float(scores['price_match'][i])
+        matching_features.append(f"Within budget: ₹{price:,.0f}")
+    else:
+        subscores['price_match'] = max(0, float(scores['price_match'][i])) if price > max_price else 0
+        if price > max_price:
+            concerns.append(f"Price exceeds budget (₹{price:,.0f} > ₹{max_price:,.0f})")
+
+    subscores['connectivity'] = float(scores['connectivity'][i])
+    avg_connectivity = scores['avg_connectivity'][i]
+    if avg_connectivity > 70:
+        matching_features.append("Excellent connectivity")
+    elif avg_connectivity < 30:
+        concerns.append("Limited connectivity to major transport")
+
+    subscores['infrastructure'] = float(scores['infrastructure'][i])
+    infra_available = scores['infra_available'][i]
+    if infra_available == 3:
+        matching_features.append("All basic infrastructure available")
+    elif infra_available == 0:
+        concerns.append("No basic infrastructure available")
+
+    subscores['location_match'] = int(scores['location_match'][i])
+    if scores['in_city'][i]:
+        matching_features.append(f"Located in preferred area: {columns.cities[i]}")
+
+    subscores['land_type_match'] = int(scores['land_type_match'][i])
+    if scores['type_match'][i]:
+        matching_features.append(f"Perfect match: {columns.land_types[i]} land")
+
+    if 'proximity' in scores:
+        subscores['proximity'] = float(scores['proximity'][i])
+
+    subscores = {name: round(value, 2) for name, value in subscores.items()}
+    return subscores, matching_features, concerns
+
+
+def _stored_column(values, dtype, compute) -> np.ndarray:
+    """A stored feature column, with compute()'s value wherever it is NULL"""
+    if None not in values:
+        return np.fromiter(values, dtype=dtype, count=len(values))
+    missing = np.array([value is None for value in values])
+    column = np.where(missing, 0, np.array(values, dtype=object)).astype(dtype)
+    column[missing] = np.asarray(compute(), dtype=dtype)[missing]
+    return column
+
+
+def _categories(values: np.ndarray, edges) -> np.ndarray:
+    """categorize_size()/categorize_price() for a whole column"""
+    return (values[:, None] >= np.asarray(edges)).sum(axis=1)
+
+
+def _decimal_column(values, field_name: str) -> np.ndarray:
+    """
+    float64 column equal to float() of the Decimals the ORM would return
+
+    A value with no more digits than the field's decimal_places casts to
+    exactly that double. SQLite may also hold values written without
+    quantizing (e.g. lat/lon from seed_lands); only those rows are rounded
+    one by one, the same way Django's SQLite Decimal converter does it.
+    """
+    column = np.array(values, dtype=np.float64)
+    field = Land._meta.get_field(field_name)
+    excess = np.flatnonzero(np.round(column, field.decimal_places) != column)
+    if len(excess):
+        quantum = Decimal(1).scaleb(-field.decimal_places)
+        for i in excess:
+            value = _SQLITE_DECIMAL.create_decimal_from_float(float(column[i]))
+            column[i] = float(value.quantize(quantum, context=field.context))
+    return column
+
+
+def _location_hits(columns: LandColumns, location_preference: str):
+    city_hits, state_hits = _location_unique_hits(columns, location_preference)
+    return city_hits[columns.city_index.codes], state_hits[columns.state_index.codes]
+
+
+def _location_unique_hits(columns: LandColumns, location_preference: str):
+    """(city, state) matches per distinct value rather than per row"""
+    if not location_preference:
+        return np.zeros(len(columns.city_index.uniques), dtype=bool), \
+            np.zeros(len(columns.state_index.uniques), dtype=bool)
+    needle = location_preference.lower()
+    return columns.city_index.unique_matches(lambda city: needle in city.lower()), \
+        columns.state_index.unique_matches(lambda state: needle in state.lower())
+
+
+def _type_hits(columns: LandColumns, purpose: str) -> np.ndarray:
+    return _type_unique_hits(columns, purpose)[columns.land_type_index.codes]
+
+
+def _type_unique_hits(columns: LandColumns, purpose: str) -> np.ndarray:
+    if not purpose:
+        return np.zeros(len(columns.land_type_index.uniques), dtype=bool)
+    purpose = purpose.lower()
+    return columns.land_type_index.unique_matches(lambda land_type: land_type.lower() == purpose)
+
+
+class _Factorized:
+    """Distinct values of a string column plus each row's code into them"""
+
+    def __init__(self, values: List[str]):
+        codes = {}
+        self.codes = np.fromiter(
+            (codes.setdefault(value, len(codes)) for value in values),
+            dtype=np.int32, count=len(values)
+        )
+        self.uniques = list(codes)
+
+    @classmethod
+    def _from_codes(cls, codes: np.ndarray, uniques: List[str]) -> '_Factorized':
+        factorized = object.__new__(cls)
+        factorized.codes = codes
+        factorized.uniques = uniques
+        return factorized
+
+    def take(self, indices: np.ndarray) -> '_Factorized':
+        # Unused uniques are harmless: matches() only broadcasts through codes
+        return self._from_codes(self.codes[indices], self.uniques)
+
+    @classmethod
+    def concat(cls, parts: List['_Factorized']) -> '_Factorized':
+        """Merge the parts' uniques; codes are remapped per distinct value"""
+        uniques = {}
+        codes = []
+        for part in parts:
+            remap = np.fromiter(
+                (uniques.setdefault(value, len(uniques)) for value in part.uniques),
+                dtype=np.int32, count=len(part.uniques)
+            )
+            codes.append(remap[part.codes])
+        return cls._from_codes(np.concatenate(codes) if codes else np.empty(0, dtype=np.int32), list(uniques))
+
+    def matches(self, predicate) -> np.ndarray:
+        """Evaluate predicate once per distinct value, broadcast to every row"""
+        return self.unique_matches(predicate)[self.codes]
+
+    def unique_matches(self, predicate) -> np.ndarray:
+        """predicate of each distinct value, in uniques order"""
+        return np.fromiter((predicate(value) for value in self.uniques), dtype=bool, count=len(self.uniques))
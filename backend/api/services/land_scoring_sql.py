@@ -0,0 +1,208 @@
+# backend/api/services/land_scoring_sql.py
+"""
+Database-side Land Scoring
+The calculate_suitability_score subscores as Case/When/arithmetic
+annotations, so the database orders and limits the candidates and only the
+top rows are fetched
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import ASin, Cast, Coalesce, Cos, Greatest, Least, Power, Radians, Sin, Sqrt
+
+from .land_geo import DEFAULT_REACH_KM, EARTH_RADIUS_KM, origin
+from .location_index import unlinked
+
+# Largest gap between a raw score and its rounding, plus float noise
+ROUNDING_SLACK = 0.01
+
+
+def _float(value) -> Value:
+    return Value(float(value), output_field=FloatField())
+
+
+def _between(field: str, low, high) -> Q:
+    """low <= field <= high, leaving out an infinite bound (not a valid SQL number)"""
+    condition = Q(**{f'{field}__gte': low})
+    if high != float('inf'):
+        condition &= Q(**{f'{field}__lte': high})
+    return condition
+
+
+def _stored_avg_connectivity():
+    # NULL on rows never saved through the model (bulk_create)
+    proximity = F('highway_proximity_score') + F('metro_proximity_score') + F('airport_proximity_score')
+    return Coalesce(F('avg_connectivity'), Cast(proximity, FloatField()) / _float(3))
+
+
+def _stored_infrastructure_count():
+    flags = [Cast(name, FloatField()) for name in ('has_water_supply', 'has_electricity', 'has_road_access')]
+    return Coalesce(Cast('infrastructure_count', FloatField()), flags[0] + flags[1] + flags[2])
+
+
+def distance_expression(latitude: float, longitude: float):
+    """Haversine distance (km) from the given point, as haversine_km() computes it"""
+    lat1 = math.radians(latitude)
+    lat2 = Radians(Cast('latitude', FloatField()))
+    dlat = lat2 - _float(lat1)
+    dlon = Radians(Cast('longitude', FloatField())) - _float(math.radians(longitude))
+    a = Power(Sin(dlat / _float(2)), 2) + _float(math.cos(lat1)) * Cos(lat2) * Power(Sin(dlon / _float(2)), 2)
+    return _float(2 * EARTH_RADIUS_KM) * ASin(Sqrt(Least(a, _float(1))))
+
+
+def score_expressions(user_requirements: Dict, weights: Dict[str, float],
+                      location_ids: Optional[Tuple[set, set]] = None) -> Dict:
+    """
+    Annotations mirroring calculate_suitability_score term by term (same
+    operand order, float division), so SQLite's doubles match Python's
+    """
+    size = Cast('size_in_acres', FloatField())
+    price = Cast('total_price', FloatField())
+
+    # 1. Size Match
+    min_size = user_requirements.get('min_size', 0)
+    max_size = user_requirements.get('max_size', float('inf'))
+    size_match = Case(
+        When(_between('size_in_acres', min_size, max_size), then=_float(100)),
+        When(size_in_acres__lt=min_size, then=Greatest(_float(0), size / _float(min_size or 1) * _float(100))),
+        default=_float(80),
+        output_field=FloatField(),
+    )
+
+    # 2. Price Match
+    min_price = user_requirements.get('min_price', 0)
+    max_price = user_requirements.get('max_price', float('inf'))
+    if max_price == float('inf'):
+        price_ratio = _float(0)
+    elif max_price > min_price:
+        price_ratio = (price - _float(min_price)) / _float(max_price - min_price)
+    else:
+        price_ratio = _float(0.5)
+    price_whens = [When(_between('total_price', min_price, max_price), then=_float(100) - price_ratio * _float(20))]
+    if max_price != float('inf'):
+        price_whens.append(When(
+            total_price__gt=max_price,
+            then=Greatest(_float(0), _float(100) - price / _float(max_price or 1) * _float(100)),
+        ))
+    price_match = Case(*price_whens, default=_float(0), output_field=FloatField())
+
+    # 3. Connectivity
+    connectivity_importance = user_requirements.get('connectivity_importance', 0.5)
+    connectivity = _stored_avg_connectivity() * _float(connectivity_importance) \
+        + _float(100 * (1 - connectivity_importance))
+
+    # 4. Infrastructure
+    infrastructure_importance = user_requirements.get('infrastructure_importance', 0.5)
+    infrastructure = _stored_infrastructure_count() / _float(3) * _float(100) * _float(infrastructure_importance) \
+        + _float(100 * (1 - infrastructure_importance))
+
+    # 5. Location Match
+    location = user_requirements.get('location_preference', '')
+    if location and location_ids is not None:
+        # Preference already resolved to Location ids (resolve_preference);
+        # lands without a Location fall back to their text fields
+        city_ids, state_ids = location_ids
+        location_match = Case(
+            When(location_id__in=sorted(city_ids), then=_float(100)),
+            When(unlinked('city', location), then=_float(100)),
+            When(location_id__in=sorted(state_ids), then=_float(70)),
+            When(unlinked('state', location), then=_float(70)),
+            default=_float(50),
+            output_field=FloatField(),
+        )
+    elif location:
+        location_match = Case(
+            When(city__icontains=location, then=_float(100)),
+            When(state__icontains=location, then=_float(70)),
+            default=_float(50),
+            output_field=FloatField(),
+        )
+    else:
+        location_match = _float(50)
+
+    # 6. Land Type Match
+    purpose = user_requirements.get('purpose', '')
+    if purpose:
+        land_type_match = Case(
+            When(land_type__iexact=purpose, then=_float(100)),
+            default=_float(60),
+            output_field=FloatField(),
+        )
+    else:
+        land_type_match = _float(60)
+
+    expressions = {
+        'size_match': size_match,
+        'price_match': price_match,
+        'connectivity': connectivity,
+        'infrastructure': infrastructure,
+        'location_match': location_match,
+        'land_type_match': land_type_match,
+        'overall_score': (
+            F('size_match') * _float(weights['size_match'])
+            + F('price_match') * _float(weights['price_match'])
+            + F('connectivity') * _float(weights['connectivity'])
+            + F('infrastructure') * _float(weights['infrastructure'])
+            + F('location_match') * _float(weights['location_match'])
+            + F('land_type_match') * _float(weights['soil_quality'])
+        ),
+    }
+
+    # 7. Proximity, when the request gives an origin
+    point = origin(user_requirements)
+    if point is not None:
+        reach = float(user_requirements.get('max_distance_km') or DEFAULT_REACH_KM)
+        importance = user_requirements.get('distance_importance', 0)
+        distance = distance_expression(*point)
+        expressions['distance_km'] = distance
+        expressions['proximity'] = Greatest(_float(0), _float(100) * (_float(1) - distance / _float(reach)))
+        expressions['overall_score'] = (
+            expressions['overall_score'] * _float(1 - importance) + F('proximity') * _float(importance)
+        )
+    return expressions
+
+
+def scored_queryset(queryset, user_requirements: Dict, weights: Dict[str, float],
+                    location_ids: Optional[Tuple[set, set]] = None):
+    """queryset annotated with score_expressions(), best raw score first"""
+    subscores = score_expressions(user_requirements, weights, location_ids)
+    overall_score = subscores.pop('overall_score')
+    scored = queryset.annotate(**subscores).annotate(overall_score=overall_score).order_by(
+        '-overall_score', '-created_at', '-id'
+    )
+    if 'distance_km' in subscores and user_requirements.get('max_distance_km'):
+        # The caller re-checks with haversine_km(); the margin absorbs float
+        # differences between SQLite's and NumPy's trigonometry
+        scored = scored.filter(distance_km__lte=float(user_requirements['max_distance_km']) + 1e-6)
+    return scored
+
+
+def top_scored(queryset, user_requirements: Dict, weights: Dict[str, float], limit: int,
+               location_ids: Optional[Tuple[set, set]] = None) -> List:
+    """
+    Lands that can make the `limit` best, ordered by the database
+
+    SQLite's ROUND and Python's round() disagree on some half-way values,
+    so ordering by the rounded score in SQL could cut a tie differently from
+    the Python scorer. The rows are ordered by the raw score instead and
+    every land within ROUNDING_SLACK of the limit-th one is included; the
+    caller re-sorts them by their rounded score and keeps `limit`.
+    """
+    scored = scored_queryset(queryset, user_requirements, weights, location_ids)
+
+    # Usually the rows past `limit` already fall below the slack; only a
+    # run of near-ties needs a second query
+    lands = list(scored[:2 * limit])
+    if len(lands) > limit:
+        floor = lands[limit - 1].overall_score - ROUNDING_SLACK
+        if lands[-1].overall_score >= floor:
+            lands = list(scored.filter(overall_score__gte=floor))
+        else:
+            lands = [land for land in lands if land.overall_score >= floor]
+
+    # Back in queryset order (newest first), which the caller's stable sort
+    # uses to break ties
+    lands.sort(key=lambda land: (land.created_at, land.id), reverse=True)
+    return lands
@@ -0,0 +1,237 @@
+# backend/api/services/land_similarity.py
+"""
+Land Similarity Index
+Standardized, L2-normalized feature matrix answering "lands like this one"
+with a single matrix-vector product and an argpartition top-k
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Columns of land_scoring.feature_matrix (prepare_features order)
+FEATURE_NAMES = (
+    'size_in_acres', 'size_category', 'price_per_acre', 'total_price', 'price_category',
+    'highway_proximity', 'metro_proximity', 'airport_proximity', 'avg_connectivity',
+    'has_water', 'has_electricity', 'has_road', 'infrastructure_score',
+    'land_type', 'latitude', 'longitude', 'value_per_acre',
+)
+
+# Float32 products can be off by ~1e-6; neighbours() re-ranks every land
+# within this much of the cut-off by its exact float64 score
+NEIGHBOUR_TOLERANCE = 1e-5
+
+
+def weight_vector(weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Per-feature weights in FEATURE_NAMES order (missing names weigh 1.0)"""
+    vector = np.ones(len(FEATURE_NAMES))
+    for name, weight in (weights or {}).items():
+        if name not in FEATURE_NAMES:
+            raise ValueError(f'Unknown similarity feature "{name}"')
+        weight = float(weight)
+        if not np.isfinite(weight) or weight < 0:
+            raise ValueError(f'Weight for "{name}" must be a non-negative number')
+        vector[FEATURE_NAMES.index(name)] = weight
+    if not vector.any():
+        raise ValueError('At least one feature weight must be positive')
+    return vector
+
+
+def standardization(features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(mean, scale) per feature; constant columns get scale 1 and stay at zero"""
+    features = np.asarray(features, dtype=np.float64)
+    if not len(features):
+        return np.zeros(len(FEATURE_NAMES)), np.ones(len(FEATURE_NAMES))
+    scale = features.std(axis=0)
+    return features.mean(axis=0), np.where(scale > 0, scale, 1.0)
+
+
+def parse_weights(text: str) -> Dict[str, float]:
+    """'size_in_acres:2,latitude:0' -> {'size_in_acres': 2.0, 'latitude': 0.0}"""
+    weights = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, sep, value = item.partition(':')
+        if not sep:
+            raise ValueError(f'Expected feature:weight, got "{item}"')
+        try:
+            weights[name.strip()] = float(value)
+        except ValueError:
+            raise ValueError(f'Weight for "{name.strip()}" must be a number')
+    weight_vector(weights)
+    return weights
+
+
+class SimilarityIndex:
+    """
+    Cosine similarity in a standardized feature space
+
+    Every feature is centred and divided by its standard deviation, so
+    total_price no longer drowns out everything else. A weighted cosine
+    between rows a and b is sum(w * a * b) / (|a|_w * |b|_w); with the
+    default weights the rows are pre-scaled by sqrt(w) and L2-normalized
+    once, so a query is one float32 matrix-vector product.
+
+    Matrices are stored feature-major (17 x n): the product then streams
+    each feature column once, about 2.5x faster than row-major at 1M lands.
+    """
+
+    def __init__(self, features: np.ndarray, default_weights: Optional[Dict[str, float]] = None,
+                 stats: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        features = np.asarray(features, dtype=np.float64)
+        # Stored (mean, scale) when given (see similar_lands.stored_stats), so
+        # scores don't depend on which lands a worker happened to load
+        self.mean, self.scale = stats if stats is not None else standardization(features)
+
+        z = ((features - self.mean) / self.scale).astype(np.float32)
+        self.z = np.ascontiguousarray(z.T)
+        self.z_squared = self.z * self.z
+
+        self.default_weights = weight_vector(default_weights)
+        self.normalized = np.ascontiguousarray(unit_rows(z, self.default_weights).T)
+
+    def __len__(self) -> int:
+        return self.z.shape[1]
+
+    def take(self, rows) -> 'SimilarityIndex':
+        """
+        Index over the given rows, in the given order
+
+        Only valid with fixed (mean, scale): every row is then standardized
+        and normalized on its own, so no row is recomputed.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        return self._with_arrays(self.z[:, rows], self.z_squared[:, rows], self.normalized[:, rows])
+
+    def concat(self, others: List['SimilarityIndex']) -> 'SimilarityIndex':
+        """This index followed by others built with the same (mean, scale) and weights"""
+        parts = [self] + list(others)
+        return self._with_arrays(*(
+            np.concatenate([getattr(part, name) for part in parts], axis=1)
+            for name in ('z', 'z_squared', 'normalized')
+        ))
+
+    def _with_arrays(self, z: np.ndarray, z_squared: np.ndarray, normalized: np.ndarray) -> 'SimilarityIndex':
+        index = object.__new__(SimilarityIndex)
+        index.mean, index.scale, index.default_weights = self.mean, self.scale, self.default_weights
+        index.z = np.ascontiguousarray(z)
+        index.z_squared = np.ascontiguousarray(z_squared)
+        index.normalized = np.ascontiguousarray(normalized)
+        return index
+
+    def vector(self, row: int) -> np.ndarray:
+        """Standardized features of an indexed land"""
+        return self.z[:, row].copy()
+
+    def standardize(self, feature_vector: np.ndarray) -> np.ndarray:
+        return ((np.asarray(feature_vector, dtype=np.float64) - self.mean) / self.scale).astype(np.float32)
+
+    def similarities(self, target: np.ndarray, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Cosine similarity of every row to a standardized target vector"""
+        if weights is None:
+            w = self.default_weights
+            query = target * np.sqrt(w).astype(np.float32)
+            norm = np.linalg.norm(query)
+            if norm == 0:
+                return np.zeros(len(self), dtype=np.float32)
+            return (query / norm) @ self.normalized
+
+        w = weight_vector(weights).astype(np.float32)
+        target_norm = np.sqrt(np.dot(w, target * target))
+        row_norms = np.sqrt(w @ self.z_squared)
+        denominator = row_norms * target_norm
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(denominator > 0, ((w * target) @ self.z) / denominator, 0).astype(np.float32)
+
+    def top_k(self, target: np.ndarray, limit: int, exclude_row: Optional[int] = None,
+              weights: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rows of the `limit` most similar lands, best first, and their scores
+
+        argpartition selects the top rows in O(n); only those are sorted.
+        Ties are broken by row order (newest land first in the cache).
+        """
+        similarity = self.similarities(target, weights)
+        if exclude_row is not None:
+            similarity[exclude_row] = -np.inf
+
+        n = len(similarity) - (exclude_row is not None)
+        limit = min(limit, n)
+        if limit <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        if limit < len(similarity):
+            rows = np.argpartition(similarity, len(similarity) - limit)[-limit:]
+        else:
+            rows = np.arange(len(similarity))
+        rows = rows[np.lexsort((rows, -similarity[rows]))][:limit]
+        return rows, similarity[rows]
+
+    def neighbours(self, rows: np.ndarray, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        top_k() with default weights for several indexed rows at once
+
+        Returns (len(rows), limit) neighbour rows and similarities, each row
+        excluding itself; one matrix product for the whole batch.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        limit = min(limit, len(self) - 1)
+        if limit <= 0 or not len(rows):
+            return np.empty((len(rows), 0), dtype=np.int64), np.empty((len(rows), 0), dtype=np.float32)
+
+        n = len(self)
+        similarity = self.normalized[:, rows].T @ self.normalized
+        similarity[np.arange(len(rows)), rows] = -np.inf
+
+        sample = max(64 * limit, 4096)
+        if n <= 2 * sample:
+            cutoff = np.partition(similarity, n - limit, axis=1)[:, n - limit]
+        else:
+            # The limit-th best score among the first `sample` lands can't
+            # beat the true limit-th best, so only lands scoring at least
+            # that much (a few per row) are candidates
+            cutoff = np.partition(similarity[:, :sample], sample - limit, axis=1)[:, sample - limit]
+
+        # Float32 products differ in the last bits between batch sizes and
+        # memory layouts: candidates near the cut-off are kept and ranked by
+        # their float64 score, so one land gets the same neighbours and
+        # numbers alone, in a batch, or in another worker
+        owner, top = np.divmod(np.flatnonzero(similarity >= (cutoff - NEIGHBOUR_TOLERANCE)[:, None]), n)
+        scores = _feature_sum(self.normalized[:, rows[owner]].astype(np.float64) * self.normalized[:, top])
+        order = np.lexsort((top, -scores, owner))
+        owner, top, scores = owner[order], top[order], scores[order]
+        first = np.searchsorted(owner, np.arange(len(rows)))
+        keep = np.arange(len(owner)) - first[owner] < limit
+        return top[keep].reshape(len(rows), limit), scores[keep].reshape(len(rows), limit)
+
+
+def unit_rows(z: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Standardized float32 rows scaled by sqrt(weights) and L2-normalized, as SimilarityIndex stores them"""
+    return _normalize_rows(z * np.sqrt(weights).astype(np.float32))
+
+
+def cosine_scores(normalized: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """
+    float64 similarity of feature-major unit rows to one unit vector,
+    summed exactly like the scores neighbours() returns
+    """
+    return _feature_sum(normalized.astype(np.float64) * np.asarray(vector, dtype=np.float64)[:, None])
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.sqrt(_feature_sum(np.square(matrix.T.astype(np.float64)))).reshape(-1, 1)
+    normalized = np.divide(matrix, norms, out=np.zeros(matrix.shape), where=norms > 0)
+    return normalized.astype(matrix.dtype)
+
+
+def _feature_sum(values: np.ndarray) -> np.ndarray:
+    """
+    Column sums of a (features, n) array, adding one feature at a time
+
+    A SIMD reduction along a row may sum in an order that depends on the
+    row's memory alignment, so the same land could get a different norm or
+    score after the matrix is rebuilt; this order never changes.
+    """
+    total = np.zeros(values.shape[1])
+    for feature in values:
+        total += feature
+    return total
@@ -0,0 +1,98 @@
+# backend/api/services/land_spatial.py
+"""
+Map Viewport Queries
+"All lands inside this rectangle" through SQLite's R*Tree module when the
+api_land_rtree table exists (migration 0005), or the (latitude, longitude)
+B-tree index otherwise
+"""
+
+from typing import Dict, List, Optional
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from ..models import Land
+
+RTREE_TABLE = 'api_land_rtree'
+
+# Columns returned per land
+VIEWPORT_FIELDS = ('id', 'name', 'city', 'land_type', 'size_in_acres', 'total_price', 'latitude', 'longitude')
+
+_rtree_tables = {}
+
+
+def rtree_available() -> bool:
+    """
+    True when the R*Tree table and its sync triggers exist
+
+    SQLite migrations that rebuild api_land drop its triggers; the index is
+    then stale and the B-tree query is used instead.
+    """
+    name = str(connection.settings_dict['NAME'])
+    if name not in _rtree_tables:
+        _rtree_tables[name] = connection.vendor == 'sqlite' and _rtree_objects() == {
+            RTREE_TABLE, f'{RTREE_TABLE}_insert', f'{RTREE_TABLE}_update', f'{RTREE_TABLE}_delete',
+        }
+    return _rtree_tables[name]
+
+
+def _rtree_objects() -> set:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE (type = 'table' AND name = %s) "
+            "OR (type = 'trigger' AND tbl_name = 'api_land' AND name LIKE %s)",
+            [RTREE_TABLE, f'{RTREE_TABLE}_%'],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def lands_in_bbox(min_lat: float, max_lat: float, min_lon: float, max_lon: float,
+                  queryset=None, use_rtree: Optional[bool] = None):
+    """
+    Queryset of the lands inside the rectangle (edges included)
+
+    min_lon > max_lon means the viewport crosses the antimeridian. The
+    R*Tree stores 32-bit floats rounded outwards, so its matches are exact
+    after the same range filter on the real columns.
+    """
+    if queryset is None:
+        queryset = Land.objects.filter(status='available')
+    if use_rtree is None:
+        use_rtree = rtree_available()
+
+    in_box = queryset.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+    if min_lon <= max_lon:
+        in_box = in_box.filter(longitude__gte=min_lon, longitude__lte=max_lon)
+        lon_sql, lon_params = 'max_lon >= %s AND min_lon <= %s', [min_lon, max_lon]
+    else:
+        in_box = in_box.filter(longitude__gte=min_lon) | in_box.filter(longitude__lte=max_lon)
+        lon_sql, lon_params = '(max_lon >= %s OR min_lon <= %s)', [min_lon, max_lon]
+
+    if not use_rtree:
+        return in_box
+
+    matches = RawSQL(
+        f'SELECT id FROM {RTREE_TABLE} WHERE max_lat >= %s AND min_lat <= %s AND {lon_sql}',
+        [min_lat, max_lat] + lon_params,
+    )
+    return in_box.filter(id__in=matches)
+
+
+def viewport_lands(min_lat: float, max_lat: float, min_lon: float, max_lon: float, limit: int = 500,
+                   queryset=None, use_rtree: Optional[bool] = None) -> List[Dict]:
+    """Up to `limit` lands inside the rectangle, as plain dicts (lowest id first)"""
+    lands = lands_in_bbox(min_lat, max_lat, min_lon, max_lon, queryset, use_rtree)
+    rows = lands.order_by('id').values_list(*VIEWPORT_FIELDS)[:limit]
+    return [
+        {
+            'land_id': land_id,
+            'name': name,
+            'city': city,
+            'land_type': land_type,
+            'size_in_acres': float(size),
+            'total_price': float(price),
+            'latitude': float(latitude),
+            'longitude': float(longitude),
+        }
+        for land_id, name, city, land_type, size, price, latitude, longitude in rows
+    ]
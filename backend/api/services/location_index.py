@@ -0,0 +1,213 @@
+# backend/api/services/location_index.py
+"""
+Location Lookup
+Prefix tree over the Location table for /api/locations/autocomplete/, and
+resolution of free-text location preferences to Location ids
+"""
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Set, Tuple
+
+from django.db.models import Count, Max, Q
+
+from ..models import Land, Location
+
+# Trie node key holding the suggestions that end at that node
+_END = ''
+
+
+class LocationTrie:
+    """Character trie from case-folded names to suggestion keys"""
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, name: str, item):
+        node = self._root
+        for char in name:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, []).append(item)
+
+    def with_prefix(self, prefix: str) -> List:
+        """Items of every name starting with prefix"""
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        items = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char == _END:
+                    items.extend(child)
+                else:
+                    stack.append(child)
+        return items
+
+
+class LocationIndex:
+    """
+    Autocomplete suggestions built from one read of the Location table
+
+    Cities, districts, states and pincodes are all inserted; a suggestion
+    groups every Location id it covers (a city usually spans several
+    pincodes) and is ranked by how many available lands it has.
+
+    Every suffix of each distinct city and state name goes into a second
+    pair of tries, so a substring lookup for resolve() is a prefix walk.
+    """
+
+    def __init__(self, rows, land_counts: Dict[int, int]):
+        self._trie = LocationTrie()
+        self._suggestions = {}
+        self.max_id = 0
+        names = {'city': {}, 'state': {}}
+        for location_id, city, district, state, pincode in rows:
+            self.max_id = max(self.max_id, location_id)
+            names['city'].setdefault(city.lower(), set()).add(location_id)
+            names['state'].setdefault(state.lower(), set()).add(location_id)
+            count = land_counts.get(location_id, 0)
+            self._add(city, ('city', city.casefold(), state.casefold()),
+                      'city', city, f'{city}, {state}', location_id, count)
+            if district:
+                self._add(district, ('district', district.casefold(), state.casefold()),
+                          'district', district, f'{district} district, {state}', location_id, count)
+            self._add(state, ('state', state.casefold()), 'state', state, state, location_id, count)
+            if pincode:
+                # A pincode picks its city as the location preference
+                self._add(pincode, ('pincode', pincode), 'pincode', city, f'{pincode} - {city}, {state}',
+                          location_id, count)
+
+        self._names = names
+        self._contains = {}
+        for field, ids in names.items():
+            trie = self._contains[field] = LocationTrie()
+            for name in ids:
+                for start in range(len(name)):
+                    trie.insert(name[start:], name)
+
+    def _add(self, name: str, key: tuple, kind: str, value: str, label: str, location_id: int, count: int):
+        suggestion = self._suggestions.get(key)
+        if suggestion is None:
+            suggestion = self._suggestions[key] = {
+                'kind': kind,
+                'value': value,
+                'label': label,
+                'location_ids': [],
+                'land_count': 0,
+            }
+            self._trie.insert(_normalize(name), key)
+        suggestion['location_ids'].append(location_id)
+        suggestion['land_count'] += count
+
+    def resolve(self, preference: str) -> Tuple[Set[int], Set[int]]:
+        """(ids whose city contains preference, ids whose state does)"""
+        needle = preference.lower()
+        return tuple(
+            set().union(*(self._names[field][name] for name in self._contains[field].with_prefix(needle)))
+            for field in ('city', 'state')
+        )
+
+    def __len__(self) -> int:
+        return len(self._suggestions)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Best `limit` suggestions whose name starts with prefix"""
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        keys = self._trie.with_prefix(prefix)
+        best = heapq.nsmallest(
+            limit, keys,
+            key=lambda key: (-self._suggestions[key]['land_count'], self._suggestions[key]['label']),
+        )
+        return [self._suggestions[key] for key in best]
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.split()).casefold()
+
+
+def resolve_preference(preference: str) -> Tuple[Set[int], Set[int]]:
+    """
+    (ids of Locations whose city contains preference, ids whose state does)
+
+    Same case-insensitive substring rule the scorer applies to Land.city and
+    Land.state, answered by the shared index's suffix tries. Locations added
+    since the index was built are read by primary key (usually none), so
+    they always count.
+    """
+    index = get_location_index()
+    city_ids, state_ids = index.resolve(preference)
+    for location_id, city, state in locations_after(index.max_id):
+        if preference.lower() in city.lower():
+            city_ids.add(location_id)
+        if preference.lower() in state.lower():
+            state_ids.add(location_id)
+    return city_ids, state_ids
+
+
+def unlinked(field: str, preference: str) -> Q:
+    """
+    Lands with no Location yet (loaded raw by fixtures or bulk_create) whose
+    `field` contains preference; the text fallback for resolve_preference()
+    """
+    return Q(location__isnull=True, **{f'{field}__icontains': preference})
+
+
+def locations_after(location_id: int):
+    """(id, city, state) of Locations created after location_id"""
+    return Location.objects.filter(id__gt=location_id).order_by().values_list('id', 'city', 'state')
+
+
+def location_land_counts():
+    """(location id, available land count) pairs ranking the suggestions"""
+    return (
+        Land.objects.filter(status='available', location__isnull=False)
+        .values_list('location_id').annotate(count=Count('id')).order_by()
+    )
+
+
+def build_location_index() -> LocationIndex:
+    rows = Location.objects.values_list('id', 'city', 'district', 'state', 'pincode')
+    return LocationIndex(rows.iterator(), dict(location_land_counts()))
+
+
+_index = None
+_version = None
+_built_at = 0.0
+_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_location_index() -> LocationIndex:
+    """
+    Shared index for this process
+
+    Rebuilt when new Location rows appear (checked at most every
+    LOCATION_INDEX['CHECK_INTERVAL'] seconds) and every MAX_AGE seconds so
+    the land counts used for ranking stay current.
+    """
+    global _index, _version, _built_at, _checked_at
+    from django.conf import settings
+    config = {'CHECK_INTERVAL': 5.0, 'MAX_AGE': 600.0}
+    config.update(getattr(settings, 'LOCATION_INDEX', {}))
+
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < config['CHECK_INTERVAL']:
+        return _index
+
+    with _index_lock:
+        if _index is None or time.monotonic() - _checked_at >= config['CHECK_INTERVAL']:
+            version = Location.objects.aggregate(Max('id'))['id__max']
+            if _index is None or version != _version or time.monotonic() - _built_at >= config['MAX_AGE']:
+                _index = build_location_index()
+                _version = version
+                _built_at = time.monotonic()
+            _checked_at = time.monotonic()
+    return _index
@@ -0,0 +1,156 @@
+# backend/api/services/model_bundles.py
+"""
+Versioned Crop Model Bundles
+Each training run writes an immutable, checksummed directory; serving reads
+whichever version the CURRENT pointer names
+
+    ml_models/crop_bundles/
+        CURRENT                  -> "v20260101-120000-123456"
+        v20260101-120000-123456/
+            manifest.json        (version, accuracy, sha256 of every file)
+            crop_model.pkl
+            crop_scaler.pkl
+            crop_label_encoder.pkl
+            crop_forest/*.npy    (compiled, memory-mappable)
+            crop_model_q8.npz    (quantized)
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from .crop_catalog import file_checksum
+
+BUNDLES_DIR = os.path.join('ml_models', 'crop_bundles')
+POINTER_NAME = 'CURRENT'
+MANIFEST_NAME = 'manifest.json'
+QUANTIZED_NAME = 'crop_model_q8.npz'
+
+
+class BundleError(Exception):
+    """A bundle is missing, incomplete or does not match its manifest"""
+
+
+def bundle_path(version: str, bundles_dir: str = BUNDLES_DIR) -> str:
+    return os.path.join(bundles_dir, version)
+
+
+def current_version(bundles_dir: str = BUNDLES_DIR) -> Optional[str]:
+    """Version named by the CURRENT pointer, or None before the first bundle"""
+    try:
+        with open(os.path.join(bundles_dir, POINTER_NAME)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def activate(version: str, bundles_dir: str = BUNDLES_DIR):
+    """Atomically point CURRENT at an existing, verified bundle"""
+    manifest = verify_bundle(bundle_path(version, bundles_dir))
+
+    # Workers would fail to load it on the hot swap and keep the old model
+    from django.conf import settings
+    if getattr(settings, 'CROP_MODEL_BACKEND', 'sklearn') == 'quantized' and QUANTIZED_NAME not in manifest['files']:
+        raise BundleError(
+            f'Bundle {version} has no {QUANTIZED_NAME} but CROP_MODEL_BACKEND is "quantized"; '
+            'retrain it with `manage.py train_crop_model`'
+        )
+
+    pointer = os.path.join(bundles_dir, POINTER_NAME)
+    tmp_pointer = f'{pointer}.{os.getpid()}.tmp'
+    with open(tmp_pointer, 'w') as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_pointer, pointer)
+
+
+def list_bundles(bundles_dir: str = BUNDLES_DIR) -> List[Dict]:
+    """Manifests of every complete bundle, oldest first"""
+    if not os.path.isdir(bundles_dir):
+        return []
+
+    manifests = []
+    for name in sorted(os.listdir(bundles_dir)):
+        manifest_path = os.path.join(bundles_dir, name, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifests.append(json.load(f))
+    return manifests
+
+
+def read_manifest(path: str) -> Dict:
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        raise BundleError(f'No manifest in {path}')
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def verify_bundle(path: str) -> Dict:
+    """Check every file against the manifest checksums; returns the manifest"""
+    manifest = read_manifest(path)
+    for relative_path, checksum in manifest['files'].items():
+        file_path = os.path.join(path, relative_path)
+        if not os.path.exists(file_path):
+            raise BundleError(f'{file_path} is missing')
+        if file_checksum(file_path) != checksum:
+            raise BundleError(f'{file_path} does not match its checksum')
+    return manifest
+
+
+def train_bundle(bundles_dir: str = BUNDLES_DIR, activate_bundle: bool = True) -> str:
+    """
+    Train a new model into a fresh bundle directory
+
+    Everything is written to a temporary directory that is renamed into place
+    only once complete, so readers never see a half-written bundle.
+
+    Returns:
+        The new version string
+    """
+    from .crop_recommender import CropRecommendationModel
+    from .forest_engine import save_quantized
+
+    # Microseconds keep two trainings in the same second apart (and sorted)
+    version = datetime.now(timezone.utc).strftime('v%Y%m%d-%H%M%S-%f')
+    final_path = bundle_path(version, bundles_dir)
+    tmp_path = f'{final_path}.{os.getpid()}.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    # Trains (no artifacts in tmp_path yet) and writes pickles + compiled arrays
+    model = CropRecommendationModel(backend='compiled', model_dir=tmp_path)
+    # Every bundle can be served by any CROP_MODEL_BACKEND
+    save_quantized(model.engine, model.label_encoder.classes_, os.path.join(tmp_path, QUANTIZED_NAME))
+
+    files = {}
+    for root, _, filenames in os.walk(tmp_path):
+        for filename in filenames:
+            file_path = os.path.join(root, filename)
+            files[os.path.relpath(file_path, tmp_path)] = file_checksum(file_path)
+
+    manifest = {
+        'version': version,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'accuracy': model.accuracy,
+        'files': files,
+    }
+    with open(os.path.join(tmp_path, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    os.rename(tmp_path, final_path)
+    if activate_bundle:
+        activate(version, bundles_dir)
+    return version
+
+
+def train_bundle_in_subprocess(bundles_dir: str = BUNDLES_DIR, activate_bundle: bool = True) -> str:
+    """Run train_bundle in a separate process so the caller's memory and GIL are untouched"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(train_bundle, bundles_dir, activate_bundle).result()
+
@@ -0,0 +1,240 @@
+# backend/api/services/model_registry.py
+"""
+Process-wide Model Registry
+Loads each ML model artifact once per worker and hands out a shared,
+read-only instance to every request
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+
+class ModelRegistry:
+    """
+    Thread-safe registry of lazily loaded models
+
+    Each model is registered under a name together with a factory that builds
+    it. The first caller pays the load cost; every later caller in the same
+    process gets the same instance. Instances are shared between threads, so
+    callers must treat them as read-only.
+
+    A model may also register a version probe. At most once per check
+    interval, get() compares the probe's answer with the loaded instance's
+    version; on a mismatch a background thread builds the new instance while
+    the old one keeps serving, then swaps it in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._factories: Dict[str, Callable] = {}
+        self._instances: Dict[str, object] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._probes: Dict[str, Callable] = {}
+        self._check_intervals: Dict[str, float] = {}
+        self._last_checked: Dict[str, float] = {}
+        self._refreshing = set()
+        self._swap_listeners: Dict[str, List[Callable]] = {}
+
+    def register(self, name: str, factory: Callable,
+                 version_probe: Optional[Callable] = None, check_interval: float = 5.0):
+        """
+        Register a factory for a model name (replaces any previous one)
+
+        Args:
+            factory: builds a new instance
+            version_probe: cheap callable returning the version that should be
+                           served (None = keep whatever is loaded)
+            check_interval: minimum seconds between probe calls
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._load_locks.setdefault(name, threading.Lock())
+            if version_probe is not None:
+                self._probes[name] = version_probe
+                self._check_intervals[name] = check_interval
+
+    def add_swap_listener(self, name: str, callback: Callable):
+        """Call callback(new_instance) whenever a loaded model is replaced"""
+        with self._lock:
+            self._swap_listeners.setdefault(name, []).append(callback)
+
+    def get(self, name: str):
+        """Return the shared instance, loading it on first use"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            self._maybe_refresh(name, instance)
+            return instance
+
+        with self._lock:
+            if name not in self._factories:
+                raise KeyError(f'No model registered under "{name}"')
+            load_lock = self._load_locks[name]
+
+        # Only one thread loads a given model; the rest wait for it
+        with load_lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                instance = self._load(name)
+        return instance
+
+    def reload(self, name: str):
+        """Build a fresh instance and swap it in once it is fully loaded"""
+        with self._lock:
+            load_lock = self._load_locks[name]
+        with load_lock:
+            return self._load(name)
+
+    def evict(self, name: str):
+        """Drop the cached instance; the next get() loads it again"""
+        with self._lock:
+            self._instances.pop(name, None)
+            self._stats.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def stats(self) -> Dict[str, Dict]:
+        """Load time, memory footprint and version of every loaded model"""
+        with self._lock:
+            return {name: dict(stat) for name, stat in self._stats.items()}
+
+    def _maybe_refresh(self, name: str, instance):
+        """Start a background reload when the probe reports a newer version"""
+        probe = self._probes.get(name)
+        if probe is None:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if name in self._refreshing:
+                return
+            if now - self._last_checked.get(name, 0) < self._check_intervals[name]:
+                return
+            self._last_checked[name] = now
+
+        try:
+            wanted = probe()
+        except Exception:
+            return
+        if wanted is None or wanted == getattr(instance, 'version', None):
+            return
+
+        with self._lock:
+            if name in self._refreshing:
+                return
+            self._refreshing.add(name)
+        threading.Thread(target=self._refresh, args=(name,), daemon=True).start()
+
+    def _refresh(self, name: str):
+        try:
+            self.reload(name)
+            print(f"✅ Hot-swapped {name} to {self._stats[name]['version']}")
+        except Exception as e:
+            # Keep serving the old instance; the next check retries
+            print(f"⚠️  Failed to hot-swap {name}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(name)
+
+    def _load(self, name: str):
+        factory = self._factories[name]
+
+        start_time = time.perf_counter()
+        instance = factory()
+        load_time_ms = (time.perf_counter() - start_time) * 1000
+
+        with self._lock:
+            replaced = self._instances.get(name) is not None
+            self._instances[name] = instance
+            self._stats[name] = {
+                'version': getattr(instance, 'version', None),
+                'load_time_ms': round(load_time_ms, 2),
+                'memory_bytes': _memory_footprint(instance),
+                'loaded_at': datetime.now(timezone.utc).isoformat(),
+            }
+            listeners = list(self._swap_listeners.get(name, ())) if replaced else []
+
+        for callback in listeners:
+            try:
+                callback(instance)
+            except Exception as e:
+                print(f"⚠️  Swap listener for {name} failed: {e}")
+        return instance
+
+
+def _memory_footprint(instance) -> Optional[int]:
+    """Ask the model for its footprint, falling back to a shallow estimate"""
+    footprint = getattr(instance, 'memory_footprint', None)
+    if callable(footprint):
+        try:
+            return int(footprint())
+        except Exception:
+            pass
+    return sys.getsizeof(instance)
+
+
+# Shared registry for this process
+registry = ModelRegistry()
+
+CROP_MODEL = 'crop_recommender'
+CROP_CATALOG = 'crop_catalog'
+
+
+def _build_crop_model():
+    from django.conf import settings
+    from .crop_recommender import CropRecommendationModel
+    return CropRecommendationModel(
+        backend=getattr(settings, 'CROP_MODEL_BACKEND', 'sklearn')
+    )
+
+
+def _crop_model_version():
+    from .model_bundles import current_version
+    return current_version()
+
+
+def _build_crop_catalog():
+    from .crop_catalog import CropCatalog
+    return CropCatalog()
+
+
+def _crop_catalog_version():
+    from .crop_catalog import dataset_version
+    return dataset_version()
+
+
+registry.register(CROP_MODEL, _build_crop_model, version_probe=_crop_model_version)
+registry.register(CROP_CATALOG, _build_crop_catalog, version_probe=_crop_catalog_version)
+
+
+def _flush_prediction_cache(instance):
+    from .prediction_cache import get_prediction_cache
+    get_prediction_cache().clear()
+
+
+registry.add_swap_listener(CROP_MODEL, _flush_prediction_cache)
+
+
+def get_crop_model():
+    """Shared CropRecommendationModel for this worker (loaded once)"""
+    return registry.get(CROP_MODEL)
+
+
+def get_crop_catalog():
+    """Shared CropCatalog of per-crop requirements for this worker"""
+    return registry.get(CROP_CATALOG)
+
+
+def preload():
+    """
+    Load the shared crop artifacts up front
+
+    Called from the server's pre-fork hook so workers start with the models
+    already in place (the compiled forest is memory-mapped and shared).
+    """
+    get_crop_model()
+    get_crop_catalog()
@@ -0,0 +1,134 @@
+# backend/api/services/prediction_cache.py
+"""
+Crop Prediction Cache
+Bounded LRU/TTL cache in front of recommend_crop. Cache keys round the
+inputs to a fixed precision per parameter, so near-identical soil tests
+(same district, small edits re-posted from the frontend) share one cached
+prediction.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# recommend_crop keyword -> decimal places kept in the cache key
+DEFAULT_PRECISION = {
+    'N': 0,
+    'P': 0,
+    'K': 0,
+    'temperature': 1,
+    'humidity': 1,
+    'ph': 2,
+    'rainfall': 1,
+}
+DEFAULT_MAX_SIZE = 4096
+DEFAULT_TTL_SECONDS = 600
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of crop recommendations with per-entry expiry
+
+    Keys are (model version, rounded inputs). A miss scores the raw inputs,
+    exactly like the batch and upload endpoints; a hit returns the answer
+    for the first soil test that rounded to the same key.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 precision: Optional[Dict[str, int]] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.precision = {**DEFAULT_PRECISION, **(precision or {})}
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def round_inputs(self, inputs: Dict[str, float]) -> Dict[str, float]:
+        return {
+            name: round(float(inputs[name]), places)
+            for name, places in self.precision.items()
+        }
+
+    def recommend(self, recommender, **inputs) -> Dict:
+        """recommend_crop through the cache (returns a private copy)"""
+        rounded = self.round_inputs(inputs)
+        key = (recommender.version, tuple(rounded.values()))
+
+        result = self._get(key)
+        if result is None:
+            result = recommender.recommend_crop(**inputs)
+            self._put(key, result)
+        return copy.deepcopy(result)
+
+    def _get(self, key: Tuple) -> Optional[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, result = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def _put(self, key: Tuple, result: Dict):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Shared cache for this process, configured from settings.CROP_PREDICTION_CACHE"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from django.conf import settings
+                config = getattr(settings, 'CROP_PREDICTION_CACHE', {})
+                _cache = PredictionCache(
+                    max_size=config.get('MAX_SIZE', DEFAULT_MAX_SIZE),
+                    ttl_seconds=config.get('TTL_SECONDS', DEFAULT_TTL_SECONDS),
+                    precision=config.get('PRECISION'),
+                )
+    return _cache
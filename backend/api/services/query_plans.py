@@ -0,0 +1,150 @@
+# backend/api/services/query_plans.py
+"""
+Query Plan Checks
+EXPLAIN QUERY PLAN for the land, location and crop queries served per
+request, so a query that stops using its index shows up before it ships
+(run by `python manage.py check_query_plans`)
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.db import connection
+from django.db.models import Count
+
+from ..models import CropRecommendation, Land, LandChangeLog, Location, SimilarLand, SoilData
+from .land_geo import within_box
+from .land_scoring_sql import scored_queryset
+from .land_spatial import VIEWPORT_FIELDS, lands_in_bbox, rtree_available
+from .location_index import location_land_counts, locations_after
+
+# "SCAN api_land" (SQLite >= 3.36) or "SCAN TABLE api_land" without an index
+_FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)$')
+
+# Placeholder filter values; plans don't depend on them
+_USER_ID = 1
+_LAND_IDS = [1, 2, 3]
+_LOCATION_ID = 100
+_LOCATION_IDS = ({1}, {2, 3})
+_POINT = (18.52, 73.85)
+_VIEWPORT = (18.4, 18.7, 73.7, 74.0)
+_ANTIMERIDIAN_VIEWPORT = (-20.0, -10.0, 175.0, -175.0)
+_FLOOR_SCORE = 50.0
+
+
+class PlanCheck(NamedTuple):
+    name: str
+    queryset: object
+    # Index constraint the plan must contain, e.g. 'latitude>?'
+    uses: Optional[str] = None
+    # Tables the query legitimately reads in full
+    may_scan: Tuple[str, ...] = ()
+
+
+def explain(queryset) -> List[str]:
+    """Detail column of EXPLAIN QUERY PLAN for a queryset"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Tables the plan reads row by row without an index"""
+    return [match.group(1) for match in map(_FULL_SCAN.match, plan) if match]
+
+
+def plan_problems(check: PlanCheck, plan: List[str]) -> List[str]:
+    """What is wrong with a check's plan (empty when it is fine)"""
+    problems = []
+    scanned = [table for table in full_scans(plan) if table not in check.may_scan]
+    if scanned:
+        problems.append(f"full scan of {', '.join(scanned)}")
+    if check.uses and not any(check.uses in line for line in plan):
+        problems.append(f'no index lookup on {check.uses}')
+    return problems
+
+
+def plan_checks() -> List[PlanCheck]:
+    """Every checked query, built the way the request handlers build it"""
+    from .land_recommender import LandRecommendationModel
+
+    recommender = LandRecommendationModel()
+    weights = recommender.feature_weights
+    by_purpose = {'purpose': 'agricultural'}
+    by_location = {'location_preference': 'Pune'}
+    by_both = {**by_purpose, **by_location}
+    by_radius = {**by_purpose, 'latitude': _POINT[0], 'longitude': _POINT[1], 'max_distance_km': 25}
+    available = Land.objects.filter(status='available')
+
+    def scored(requirements, location_ids=None):
+        # What top_scored() runs: the first 2 * limit rows, then (on a run of
+        # near-ties) every land above the floor
+        return scored_queryset(recommender._candidate_lands(requirements, location_ids), requirements,
+                               weights, location_ids)
+
+    def viewport(box, use_rtree):
+        # As viewport_lands() reads it
+        return lands_in_bbox(*box, use_rtree=use_rtree).order_by('id').values_list(*VIEWPORT_FIELDS)[:500]
+
+    checks = [
+        # Most lands are available: reading them all is a scan either way
+        PlanCheck('land candidates', recommender._candidate_lands({}), may_scan=('api_land',)),
+        PlanCheck('land candidates by purpose', recommender._candidate_lands(by_purpose), uses='land_type=?'),
+        PlanCheck('land candidates by location', recommender._candidate_lands(by_location, _LOCATION_IDS),
+                  uses='location_id=?'),
+        PlanCheck('land candidates by purpose and location',
+                  recommender._candidate_lands(by_both, _LOCATION_IDS), uses='land_type=?'),
+        PlanCheck('land candidates within radius', recommender._candidate_lands(by_radius), uses='land_type=?'),
+        PlanCheck('sql scoring', scored({})[:20], may_scan=('api_land',)),
+        PlanCheck('sql scoring by purpose', scored(by_purpose)[:20], uses='land_type=?'),
+        PlanCheck('sql scoring by location', scored(by_location, _LOCATION_IDS)[:20], uses='location_id=?'),
+        PlanCheck('sql scoring within radius', scored(by_radius)[:20], uses='land_type=?'),
+        PlanCheck('sql scoring near-ties by purpose',
+                  scored(by_purpose).filter(overall_score__gte=_FLOOR_SCORE), uses='land_type=?'),
+        PlanCheck('sql scoring near-ties by location',
+                  scored(by_location, _LOCATION_IDS).filter(overall_score__gte=_FLOOR_SCORE), uses='location_id=?'),
+        # resolve_preference(): the suffix tries answer from memory, only
+        # Locations newer than the index are read
+        PlanCheck('locations newer than the location index', locations_after(_LOCATION_ID), uses='PRIMARY KEY'),
+        # The location index rebuild behind resolve_preference() and
+        # /api/locations/autocomplete/ (a request itself runs no query);
+        # every Location row becomes a trie entry
+        PlanCheck('location index rows', Location.objects.values_list('id', 'city', 'district', 'state', 'pincode'),
+                  may_scan=('api_location',)),
+        PlanCheck('location index land counts', location_land_counts(), uses='land_available_location_idx'),
+        PlanCheck('nearby lands', within_box(available, *_POINT, 10).order_by(), uses='latitude>?'),
+        PlanCheck('lands in viewport', viewport(_VIEWPORT, use_rtree=False), uses='latitude>?'),
+        PlanCheck('lands in viewport across the antimeridian', viewport(_ANTIMERIDIAN_VIEWPORT, use_rtree=False),
+                  uses='latitude>?'),
+        PlanCheck('land detail', Land.objects.filter(id=_LAND_IDS[0]), uses='PRIMARY KEY'),
+        PlanCheck('land cache load', available.order_by('-id'), may_scan=('api_land',)),
+        PlanCheck('land cache patch', available.filter(id__in=_LAND_IDS), uses='PRIMARY KEY'),
+        PlanCheck('land changes since version', LandChangeLog.objects.filter(id__gt=100).order_by('id'),
+                  uses='PRIMARY KEY'),
+        PlanCheck('stored similar lands',
+                  SimilarLand.objects.filter(land_id=_LAND_IDS[0], rank__lte=5).order_by('rank')
+                  .values_list('similar_id', 'similar__name', 'similar__city', 'score'),
+                  uses='land_id=?'),
+        PlanCheck('soil data of lands',
+                  SoilData.objects.filter(land_id__in=_LAND_IDS).values_list('land_id', flat=True),
+                  uses='land_id=?'),
+        PlanCheck('soil tests of user', SoilData.objects.filter(user_id=_USER_ID).order_by('-created_at'),
+                  uses='user_id=?'),
+        PlanCheck('crop history of user',
+                  CropRecommendation.objects.filter(user_id=_USER_ID).order_by('-created_at')[:20],
+                  uses='user_id=?'),
+        PlanCheck('crop stats of user',
+                  CropRecommendation.objects.filter(user_id=_USER_ID).values('recommended_crop')
+                  .annotate(count=Count('id')).order_by('-count')[:5],
+                  uses='user_id=?'),
+    ]
+    if rtree_available():
+        # The R*Tree id list has to drive the lookup, not a scan of api_land
+        checks += [
+            PlanCheck('lands in viewport (R*Tree)', viewport(_VIEWPORT, use_rtree=True),
+                      uses='PRIMARY KEY (rowid=?)'),
+            PlanCheck('lands in viewport across the antimeridian (R*Tree)',
+                      viewport(_ANTIMERIDIAN_VIEWPORT, use_rtree=True), uses='PRIMARY KEY (rowid=?)'),
+        ]
+    return checks
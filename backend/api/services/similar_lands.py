@@ -0,0 +1,248 @@
+# backend/api/services/similar_lands.py
+"""
+Materialized Similar Lands
+Top-K neighbour lists stored in the SimilarLand table: built in bulk by
+`manage.py build_similar_lands`, patched when lands change (off the request,
+see schedule_refresh), and read by SimilarLandsAPI with a single indexed query
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import Min
+
+from ..models import LandChangeLog, SimilarLand, SimilarityStats
+from .land_cache import ID_BATCH_SIZE, get_land_cache, record_changes
+from .land_scoring import LandColumns
+from .land_similarity import standardization
+
+# Lists computed per matrix product (bounds the (batch, lands) buffer)
+BUILD_BATCH = 256
+
+
+def config() -> Dict:
+    from django.conf import settings
+    config = {'ENABLED': True, 'TOP_K': 20, 'REFRESH_DELAY': 0.5}
+    config.update(getattr(settings, 'SIMILAR_LANDS', {}))
+    return config
+
+
+def read(land_id: int, limit: int) -> Optional[List[Dict]]:
+    """
+    Stored neighbours in get_similar_lands() format, or None when they
+    have to be computed (not stored, or limit above TOP_K)
+    """
+    settings = config()
+    if not settings['ENABLED'] or limit > settings['TOP_K']:
+        return None
+
+    entries = SimilarLand.objects.filter(land_id=land_id, rank__lte=limit).order_by('rank').values_list(
+        'similar_id', 'similar__name', 'similar__city', 'score',
+        'similar__size_in_acres', 'similar__total_price',
+    )
+    if not entries:
+        return None
+
+    return [
+        {
+            'land_id': similar_id,
+            'name': name,
+            'city': city,
+            'similarity_score': score,
+            'size_in_acres': float(size),
+            'total_price': float(price),
+        }
+        for similar_id, name, city, score, size, price in entries
+    ]
+
+
+def stored_stats() -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """(mean, scale) the stored lists were scored with, None before the first build"""
+    stats = SimilarityStats.objects.filter(pk=1).values_list('mean', 'scale').first()
+    if stats is None:
+        return None
+    return np.array(stats[0], dtype=np.float64), np.array(stats[1], dtype=np.float64)
+
+
+def rebuild(batch_size: int = BUILD_BATCH) -> int:
+    """
+    Recompute the standardization from the available lands, then the lists
+    of every land; returns rows written
+
+    The full change-log entry makes every worker reload with the new stats.
+    """
+    cache = get_land_cache()
+    with transaction.atomic():
+        mean, scale = standardization(cache.columns().features)
+        SimilarityStats.objects.update_or_create(pk=1, defaults={'mean': mean.tolist(), 'scale': scale.tolist()})
+        record_changes([LandChangeLog.ALL_LANDS])
+        columns = cache.reload()
+
+        SimilarLand.objects.all().delete()
+        return _store(columns, np.arange(len(columns)), batch_size, replace=False)
+
+
+# Land changes waiting for this process's refresh thread
+_pending_lock = threading.Lock()
+_pending_lands = set()
+_pending_owners = set()
+_wakeup = threading.Event()
+_idle = threading.Event()
+_idle.set()
+_thread = None
+
+
+def schedule_refresh(land_ids: Iterable[int], owners: Iterable[int] = ()):
+    """
+    Queue refresh() for committed land changes
+
+    A background thread collects the changes of REFRESH_DELAY seconds and
+    patches their lists in one go, so saving a land never waits for it.
+    REFRESH_DELAY None refreshes right away in the calling thread.
+    """
+    if config()['REFRESH_DELAY'] is None:
+        _refresh_now(set(land_ids), set(owners))
+        return
+
+    global _thread
+    with _pending_lock:
+        _pending_lands.update(land_ids)
+        _pending_owners.update(owners)
+        _idle.clear()
+        if _thread is None:
+            _thread = threading.Thread(target=_refresh_loop, name='similar-lands-refresh', daemon=True)
+            _thread.start()
+    _wakeup.set()
+
+
+def wait_for_refresh(timeout: float = None) -> bool:
+    """Block until every queued change is refreshed (management commands, scripts)"""
+    return _idle.wait(timeout)
+
+
+def _refresh_loop():
+    while True:
+        _wakeup.wait()
+        time.sleep(config()['REFRESH_DELAY'])
+        with _pending_lock:
+            _wakeup.clear()
+            land_ids, owners = set(_pending_lands), set(_pending_owners)
+            _pending_lands.clear()
+            _pending_owners.clear()
+        try:
+            _refresh_now(land_ids, owners)
+        finally:
+            # This thread's own connection; don't hold it between batches
+            connection.close()
+        with _pending_lock:
+            if not _pending_lands and not _pending_owners:
+                _idle.set()
+
+
+def _refresh_now(land_ids: set, owners: set):
+    # A failed refresh must not break saving; the next rebuild repairs it
+    try:
+        refresh(land_ids, owners)
+    except Exception as e:
+        print(f"⚠️  Similar lands not refreshed for lands {sorted(land_ids)}: {e}")
+
+
+def refresh(land_ids: Iterable[int], owners: Iterable[int] = ()) -> int:
+    """
+    Patch the stored lists after the given lands were created, edited,
+    deleted or changed status
+
+    A list is recomputed when it contains a changed land (its score moved or
+    it is gone) or when a changed land now scores at least the list's K-th
+    entry; every other list is untouched. `owners` are lists that held a
+    deleted land, captured before the delete cascaded.
+    """
+    settings = config()
+    if not settings['ENABLED']:
+        return 0
+
+    # The patched snapshot carries every unchanged land's similarity row, so
+    # this is one product of the changed rows against all lands
+    cache = get_land_cache()
+    columns = cache.columns()
+    if not cache.similarity_stats_stored:
+        # Lists are only written against stored stats (build_similar_lands)
+        return 0
+
+    k = settings['TOP_K']
+    land_ids = set(land_ids)
+    index = columns.similarity
+
+    stale = set(owners)
+    stale.update(SimilarLand.objects.filter(similar_id__in=land_ids).values_list('land_id', flat=True))
+
+    rows = [row for row in map(columns.row_of, land_ids) if row is not None]
+    stale.update(int(columns.ids[row]) for row in rows)
+
+    if rows and len(columns) <= k + 1:
+        # Lists hold every other land, so any change touches all of them
+        stale.update(SimilarLand.objects.values_list('land_id', flat=True).distinct())
+    elif rows:
+        # Best score any changed land reaches against each list owner
+        # (+0.01 tolerates float32 rounding; a needless recompute is harmless)
+        best = np.round((index.normalized[:, rows].T @ index.normalized).max(axis=0) * 100, 2) + 0.01
+        best[rows] = -np.inf
+
+        # Only owners beating the lowest K-th score anywhere can be entered;
+        # their own K-th scores are then read through the (rank, score) index
+        floor = SimilarLand.objects.filter(rank=k).aggregate(Min('score'))['score__min']
+        candidates = columns.ids[best >= floor].tolist() if floor is not None else []
+        for i in range(0, len(candidates), ID_BATCH_SIZE):
+            entering = SimilarLand.objects.filter(
+                rank=k, land_id__in=candidates[i:i + ID_BATCH_SIZE]
+            ).values_list('land_id', 'score')
+            stale.update(owner for owner, threshold in entering if best[columns.row_of(owner)] >= threshold)
+
+    available = {owner for owner in stale if columns.row_of(owner) is not None}
+    removed = (land_ids | stale) - available
+    with transaction.atomic():
+        ids = sorted(removed)
+        for i in range(0, len(ids), ID_BATCH_SIZE):
+            SimilarLand.objects.filter(land_id__in=ids[i:i + ID_BATCH_SIZE]).delete()
+        return _store(columns, np.array([columns.row_of(owner) for owner in sorted(available)], dtype=np.int64))
+
+
+def _store(columns: LandColumns, rows: np.ndarray, batch_size: int = BUILD_BATCH, replace: bool = True) -> int:
+    """Compute and write the lists of the given cache rows"""
+    k = config()['TOP_K']
+    index = columns.similarity
+    written = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        neighbours, similarity = index.neighbours(batch, k)
+        owners = columns.ids[batch].tolist()
+        if replace:
+            SimilarLand.objects.filter(land_id__in=owners).delete()
+
+        # Rounded exactly like get_similar_lands() rounds its scores
+        scores = [[round(score * 100, 2) for score in row] for row in similarity.tolist()]
+        similar_ids = columns.ids[neighbours].tolist()
+        entries = [
+            (owner, similar_id, rank, score)
+            for owner, similar_row, score_row in zip(owners, similar_ids, scores)
+            for rank, (similar_id, score) in enumerate(zip(similar_row, score_row), start=1)
+        ]
+        _insert(entries)
+        written += len(entries)
+    return written
+
+
+def _insert(entries: List[tuple]):
+    """
+    (land_id, similar_id, rank, score) rows in one executemany
+
+    bulk_create() spends most of a full rebuild building model instances
+    and compiling SQL; the rows here are plain validated numbers.
+    """
+    table = SimilarLand._meta.db_table
+    sql = f'INSERT INTO {table} (land_id, similar_id, "rank", score) VALUES (%s, %s, %s, %s)'
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, entries)
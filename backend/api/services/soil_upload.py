@@ -0,0 +1,180 @@
+# backend/api/services/soil_upload.py
+"""
+Soil Test CSV Upload
+Streams a lab results file in fixed-size chunks, validating each chunk with
+NumPy range masks built from the SoilData field validators
+"""
+
+import csv
+import io
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from django.core.validators import MaxValueValidator, MinValueValidator
+
+from .crop_recommender import FEATURE_COLUMNS
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# SoilData field -> feature name, in FEATURE_COLUMNS order
+SOIL_FIELDS = {
+    'nitrogen': 'N',
+    'phosphorous': 'P',
+    'potassium': 'K',
+    'temperature': 'temperature',
+    'humidity': 'humidity',
+    'ph': 'ph',
+    'rainfall': 'rainfall',
+}
+OPTIONAL_COLUMNS = ('land_id', 'location')
+
+
+def field_ranges() -> Dict[str, Tuple[float, float]]:
+    """(min, max) per feature, read from the SoilData model validators"""
+    from ..models import SoilData
+
+    ranges = {}
+    for field_name, feature in SOIL_FIELDS.items():
+        low, high = -np.inf, np.inf
+        for validator in SoilData._meta.get_field(field_name).validators:
+            if isinstance(validator, MinValueValidator):
+                low = float(validator.limit_value)
+            elif isinstance(validator, MaxValueValidator):
+                high = float(validator.limit_value)
+        ranges[feature] = (low, high)
+    return ranges
+
+
+class SoilChunk:
+    """One validated slice of the upload"""
+
+    def __init__(self, samples: List[Dict], features: np.ndarray, errors: List[Dict], rows_read: int):
+        self.samples = samples      # valid rows, same keys as the batch API samples
+        self.features = features    # (len(samples), 7) in FEATURE_COLUMNS order
+        self.errors = errors        # [{'line': 12, 'errors': {...}}, ...]
+        self.rows_read = rows_read
+
+
+class SoilCSVReader:
+    """
+    Iterate over an uploaded soil test CSV as validated chunks
+
+    The header must name the seven parameters, either by SoilData field
+    (nitrogen, phosphorous, ...) or by feature name (N, P, K, ...), in any
+    case. Optional columns: land_id, location.
+    """
+
+    def __init__(self, upload, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.ranges = field_ranges()
+        stream = getattr(upload, 'file', upload)
+        self._text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        self._reader = csv.reader(self._text)
+        self._columns = self._read_header()
+
+    def _read_header(self) -> Dict[str, int]:
+        """Map feature and optional column names to their CSV position"""
+        try:
+            header = next(self._reader)
+        except StopIteration:
+            raise ValueError('The file is empty')
+        except UnicodeDecodeError:
+            raise ValueError('The file must be UTF-8 encoded CSV')
+
+        aliases = {name.lower(): feature for name, feature in SOIL_FIELDS.items()}
+        aliases.update({feature.lower(): feature for feature in FEATURE_COLUMNS})
+        aliases.update({name: name for name in OPTIONAL_COLUMNS})
+
+        columns = {}
+        for position, name in enumerate(header):
+            key = aliases.get(name.strip().lower())
+            if key is not None and key not in columns:
+                columns[key] = position
+
+        missing = [feature for feature in FEATURE_COLUMNS if feature not in columns]
+        if missing:
+            raise ValueError(f'Missing required columns: {", ".join(missing)}')
+        return columns
+
+    def __iter__(self) -> Iterator[SoilChunk]:
+        lines, rows = [], []
+        try:
+            for row in self._reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                lines.append(self._reader.line_num)
+                rows.append(row)
+                if len(rows) >= self.chunk_size:
+                    yield self._validate(lines, rows)
+                    lines, rows = [], []
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise ValueError(f'Could not read line {self._reader.line_num + 1}: {e}')
+        if rows:
+            yield self._validate(lines, rows)
+
+    def _validate(self, lines: List[int], rows: List[List[str]]) -> SoilChunk:
+        n_rows = len(rows)
+        values = np.full((n_rows, len(FEATURE_COLUMNS)), np.nan)
+        row_errors: Dict[int, Dict[str, str]] = {}
+
+        # Parsing is per cell; everything after it works on whole columns
+        for j, feature in enumerate(FEATURE_COLUMNS):
+            position = self._columns[feature]
+            column = values[:, j]
+            for i, row in enumerate(rows):
+                cell = row[position].strip() if position < len(row) else ''
+                if not cell:
+                    row_errors.setdefault(i, {})[feature] = 'This field is required.'
+                    continue
+                try:
+                    column[i] = float(cell)
+                except ValueError:
+                    row_errors.setdefault(i, {})[feature] = f'"{cell}" is not a number.'
+
+        for j, feature in enumerate(FEATURE_COLUMNS):
+            low, high = self.ranges[feature]
+            column = values[:, j]
+            finite = np.isfinite(column)
+            # float() also accepts "nan" and "inf"; cells that failed to
+            # parse are NaN too and already have their error
+            position = self._columns[feature]
+            for i in np.nonzero(~finite)[0]:
+                errors = row_errors.setdefault(int(i), {})
+                if feature not in errors:
+                    errors[feature] = f'"{rows[i][position].strip()}" is not a finite number.'
+            for i in np.nonzero(finite & ((column < low) | (column > high)))[0]:
+                row_errors.setdefault(int(i), {})[feature] = f'Must be between {low:g} and {high:g}.'
+
+        land_ids = self._optional_ints('land_id', rows, row_errors)
+
+        valid = np.ones(n_rows, dtype=bool)
+        valid[list(row_errors)] = False
+
+        samples = []
+        location_position = self._columns.get('location')
+        for i in np.nonzero(valid)[0]:
+            sample = dict(zip(FEATURE_COLUMNS, values[i].tolist()))
+            sample['land_id'] = land_ids[i]
+            if location_position is not None and location_position < len(rows[i]):
+                sample['location'] = rows[i][location_position].strip()[:255]
+            samples.append(sample)
+
+        errors = [{'line': lines[i], 'errors': row_errors[i]} for i in sorted(row_errors)]
+        return SoilChunk(samples, values[valid], errors, n_rows)
+
+    def _optional_ints(self, name: str, rows: List[List[str]],
+                       row_errors: Dict[int, Dict[str, str]]) -> List[Optional[int]]:
+        position = self._columns.get(name)
+        result = [None] * len(rows)
+        if position is None:
+            return result
+
+        for i, row in enumerate(rows):
+            cell = row[position].strip() if position < len(row) else ''
+            if not cell:
+                continue
+            try:
+                result[i] = int(cell)
+            except ValueError:
+                row_errors.setdefault(i, {})[name] = f'"{cell}" is not a valid integer.'
+        return result
@@ -0,0 +1,65 @@
+# backend/api/signals.py
+"""
+Model signal handlers
+Connected in ApiConfig.ready()
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Land, Location, SimilarLand
+
+
+@receiver(pre_save, sender=Land)
+def land_saving(sender, instance, raw=False, **kwargs):
+    """
+    Recompute the land's stored query-independent features and point it at
+    the Location row for its city/state/pincode
+    """
+    from .services.land_features import precomputed_values
+
+    # Derived from the instance alone, so fixtures get them too
+    for name, value in precomputed_values(instance).items():
+        setattr(instance, name, value)
+
+    if raw:
+        return
+
+    location = instance.location if instance.location_id else None
+    if location is None or location.key != Location.make_key(
+        instance.city, instance.state, instance.pincode, location.district
+    ):
+        instance.location = Location.resolve(instance.city, instance.state, instance.pincode)
+
+
+@receiver(pre_delete, sender=Land)
+def land_deleting(sender, instance, **kwargs):
+    """Remember whose similar-land lists hold this land before the delete cascades"""
+    instance._similar_owners = list(
+        SimilarLand.objects.filter(similar_id=instance.pk).values_list('land_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=Land)
+@receiver(post_delete, sender=Land)
+def land_changed(sender, instance, raw=False, **kwargs):
+    """
+    Record the change so every worker's land cache and similarity index
+    patch this row, then queue the update of the stored similar-land lists
+    it affects
+    """
+    if raw:
+        # Fixture loading
+        return
+
+    from .services import land_ann, similar_lands
+    from .services.land_cache import mark_dirty, record_changes
+
+    land_id = instance.pk
+    owners = getattr(instance, '_similar_owners', ())
+
+    record_changes([land_id])
+    transaction.on_commit(mark_dirty)
+    transaction.on_commit(land_ann.mark_dirty)
+    transaction.on_commit(lambda: similar_lands.schedule_refresh([land_id], owners))
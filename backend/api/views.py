@@ -99,13 +99,109 @@ from django.shortcuts import get_object_or_404
 from .models import Land, UserQuery
 # Import the ML recommender lazily inside view methods to avoid import-time
 # failures when optional packages (pandas/sklearn/...) are not available.
-from .serializers import LandSerializer, LandRecommendationSerializer
+from .serializers import (
+    LandSerializer, LandRecommendationSerializer, LandBatchScoreRequestSerializer,
+    LandProfileMatrixRequestSerializer,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.fields import BooleanField
+import json
 import time
 
+
+def _ndjson_response(lines) -> StreamingHttpResponse:
+    """
+    Stream an iterable of dicts as newline-delimited JSON, one object per
+    line, encoding each one only when the client is ready for it
+    """
+    return StreamingHttpResponse(
+        (json.dumps(line, cls=DjangoJSONEncoder) + '\n' for line in lines),
+        content_type='application/x-ndjson'
+    )
+
+
+def _distance_requirements(data) -> dict:
+    """
+    Optional latitude/longitude origin, max_distance_km and
+    distance_importance of a land search (ValueError when invalid)
+    """
+    requirements = {}
+    latitude, longitude = data.get('latitude'), data.get('longitude')
+    if (latitude is None) != (longitude is None):
+        raise ValueError('latitude and longitude must be given together')
+    if latitude is not None:
+        latitude, longitude = float(latitude), float(longitude)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError('latitude must be within [-90, 90] and longitude within [-180, 180]')
+        requirements['latitude'] = latitude
+        requirements['longitude'] = longitude
+    
+    if data.get('max_distance_km') is not None:
+        if latitude is None:
+            raise ValueError('max_distance_km needs latitude and longitude')
+        max_distance = float(data['max_distance_km'])
+        if not max_distance > 0:
+            raise ValueError('max_distance_km must be positive')
+        requirements['max_distance_km'] = max_distance
+    
+    if data.get('distance_importance') is not None:
+        importance = float(data['distance_importance'])
+        if not 0 <= importance <= 1:
+            raise ValueError('distance_importance must be between 0 and 1')
+        requirements['distance_importance'] = importance
+    return requirements
+
+
+def _land_requirements(data) -> dict:
+    """Requirements of a land search request body (ValueError when invalid)"""
+    user_requirements = {
+        'purpose': data.get('purpose', ''),
+        'min_size': float(data.get('min_size', 0)),
+        'max_size': float(data.get('max_size', 10000)),
+        'min_price': float(data.get('min_price', 0)),
+        'max_price': float(data.get('max_price', 100000000)),
+        'location_preference': data.get('location_preference', '') or data.get('location', ''),
+        'connectivity_importance': float(data.get('connectivity_importance', 0.5)),
+        'infrastructure_importance': float(data.get('infrastructure_importance', 0.5)),
+    }
+    
+    # Optional origin: distance filter (max_distance_km) and proximity subscore
+    user_requirements.update(_distance_requirements(data))
+    
+    if user_requirements['min_size'] > user_requirements['max_size']:
+        raise ValueError('min_size cannot be greater than max_size')
+    if user_requirements['min_price'] > user_requirements['max_price']:
+        raise ValueError('min_price cannot be greater than max_price')
+    return user_requirements
+
+
+def _log_land_recommendation(user, user_requirements: dict, recommendations_count: int, top_result_id,
+                              response_time: int):
+    """Record a land recommendation query for analytics (never fails the request)"""
+    try:
+        UserQuery.objects.create(
+            user=user,
+            query_text=f"Land recommendation: {user_requirements.get('purpose', 'any')} in {user_requirements.get('location_preference', 'any location')}",
+            query_type='land_recommendation',
+            results_count=recommendations_count,
+            top_result_id=top_result_id,
+            response_time_ms=response_time
+        )
+    except Exception as log_error:
+        # Don't fail the request if logging fails
+        print(f"Failed to log query: {log_error}")
+
+
 class LandRecommendationAPI(APIView):
     """
     POST /api/lands/recommend/
     Get personalized land recommendations based on user requirements
+    
+    With "stream": true (or ?stream=1) the response is NDJSON for bulk
+    exports: a header line with search_criteria and the time taken to rank
+    the lands, one line per recommendation as it is built, then a line with
+    the count and total time.
     """
     permission_classes = [IsAuthenticated]
     
@@ -113,58 +209,46 @@ class LandRecommendationAPI(APIView):
         start_time = time.time()
         
         try:
-            # Extract user requirements from request
-            user_requirements = {
-                'purpose': request.data.get('purpose', ''),
-                'min_size': float(request.data.get('min_size', 0)),
-                'max_size': float(request.data.get('max_size', 10000)),
-                'min_price': float(request.data.get('min_price', 0)),
-                'max_price': float(request.data.get('max_price', 100000000)),
-                'location_preference': request.data.get('location_preference', '') or request.data.get('location', ''),
-                'connectivity_importance': float(request.data.get('connectivity_importance', 0.5)),
-                'infrastructure_importance': float(request.data.get('infrastructure_importance', 0.5)),
-            }
-            
-            # Validate inputs
-            if user_requirements['min_size'] > user_requirements['max_size']:
-                return Response(
-                    {'error': 'min_size cannot be greater than max_size'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            if user_requirements['min_price'] > user_requirements['max_price']:
-                return Response(
-                    {'error': 'min_price cannot be greater than max_price'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+            # Extract and validate user requirements from request
+            try:
+                user_requirements = _land_requirements(request.data)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
             # Import recommender lazily to avoid heavy imports at module load
             try:
-                from .services.land_recommender import LandRecommendationModel
+                from .services.land_recommender import LandRecommendationModel, parse_fields
             except Exception as e:
                 return Response({'error': f'Recommender not available: {str(e)}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-            # Get recommendations
+            # fields=land_id,score returns only those keys (and skips
+            # computing subscores/explanations nobody asked for)
+            try:
+                fields = parse_fields(request.data.get('fields') or request.query_params.get('fields'))
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
             recommender = LandRecommendationModel()
             limit = request.data.get('limit', 10)
-            recommendations = recommender.recommend_lands(user_requirements, limit=limit)
+            
+            stream = request.data.get('stream', request.query_params.get('stream'))
+            if stream in BooleanField.TRUE_VALUES:
+                # Lands are ranked here; each recommendation is built and
+                # encoded only when the client reads it
+                recommendations = recommender.iter_recommend_lands(user_requirements, limit=limit, fields=fields)
+                return _ndjson_response(self._stream(request, user_requirements, recommendations, start_time))
+            
+            # Get recommendations
+            recommendations = recommender.recommend_lands(user_requirements, limit=limit, fields=fields)
             
             # Calculate response time
             response_time = int((time.time() - start_time) * 1000)
             
             # Log query for analytics
-            try:
-                UserQuery.objects.create(
-                    user=request.user,
-                    query_text=f"Land recommendation: {user_requirements.get('purpose', 'any')} in {user_requirements.get('location_preference', 'any location')}",
-                    query_type='land_recommendation',
-                    results_count=len(recommendations),
-                    top_result_id=recommendations[0]['land_id'] if recommendations else None,
-                    response_time_ms=response_time
-                )
-            except Exception as log_error:
-                # Don't fail the request if logging fails
-                print(f"Failed to log query: {log_error}")
+            _log_land_recommendation(
+                request.user, user_requirements, len(recommendations),
+                recommendations[0].get('land_id') if recommendations else None, response_time
+            )
             
             return Response({
                 'success': True,
@@ -182,6 +266,32 @@ class LandRecommendationAPI(APIView):
                 'error': f'Internal server error: {str(e)}',
                 'success': False
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def _stream(self, request, user_requirements, recommendations, start_time):
+        """NDJSON lines of a streamed response"""
+        yield {
+            'success': True,
+            'search_criteria': user_requirements,
+            'response_time_ms': int((time.time() - start_time) * 1000),
+        }
+        
+        count, top_result_id = 0, None
+        try:
+            for recommendation in recommendations:
+                if count == 0:
+                    top_result_id = recommendation.get('land_id')
+                count += 1
+                yield recommendation
+        except Exception as e:
+            # The status line has already been sent; report it in-band
+            import traceback
+            print(f"Error in LandRecommendationAPI: {traceback.format_exc()}")
+            yield {'error': f'Internal server error: {str(e)}', 'success': False}
+            return
+        
+        response_time = int((time.time() - start_time) * 1000)
+        _log_land_recommendation(request.user, user_requirements, count, top_result_id, response_time)
+        yield {'done': True, 'count': count, 'response_time_ms': response_time}
 
 
 class SimilarLandsAPI(APIView):
@@ -197,13 +307,24 @@ class SimilarLandsAPI(APIView):
         
         # Get similar lands (import recommender lazily)
         try:
+            from .services import similar_lands
             from .services.land_recommender import LandRecommendationModel
+            from .services.land_similarity import parse_weights
         except Exception as e:
             return Response({'error': f'Recommender not available: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-        recommender = LandRecommendationModel()
+        # ?weights=size_in_acres:2,latitude:0 reweights individual features
+        try:
+            weights = parse_weights(request.query_params['weights']) if 'weights' in request.query_params else None
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         limit = int(request.query_params.get('limit', 5))
-        similar_lands = recommender.get_similar_lands(land_id, limit=limit)
+        
+        # Stored top-K list when there is one; computed otherwise
+        similar = similar_lands.read(land_id, limit) if weights is None else None
+        if similar is None:
+            similar = LandRecommendationModel().get_similar_lands(land_id, limit=limit, weights=weights)
         
         return Response({
             'success': True,
@@ -212,8 +333,8 @@ class SimilarLandsAPI(APIView):
                 'name': land.name,
                 'city': land.city,
             },
-            'similar_lands': similar_lands,
-            'count': len(similar_lands)
+            'similar_lands': similar,
+            'count': len(similar)
         })
 
 
@@ -238,6 +359,11 @@ class LandDetailWithScoreAPI(APIView):
             'infrastructure_importance': float(request.data.get('infrastructure_importance', 0.5)),
         }
         
+        try:
+            user_requirements.update(_distance_requirements(request.data))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         try:
             from .services.land_recommender import LandRecommendationModel
         except Exception as e:
@@ -253,6 +379,122 @@ class LandDetailWithScoreAPI(APIView):
         })
 
 
+class LandBatchScoreAPI(APIView):
+    """
+    POST /api/lands/score/
+    Score many lands against one set of requirements
+    
+    Body: {"land_ids": [3, 17, 42], "purpose": "residential", "max_price": 5000000, ...,
+           "fields": "land_id,score,subscores"}
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        start_time = time.time()
+        
+        serializer = LandBatchScoreRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            user_requirements = _land_requirements(request.data)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            from .services.land_recommender import LandRecommendationModel, parse_fields
+        except Exception as e:
+            return Response({'error': f'Recommender not available: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        try:
+            fields = parse_fields(request.data.get('fields') or request.query_params.get('fields'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # One query and one vectorized scoring pass for the whole list
+        results, missing = LandRecommendationModel().score_land_batch(
+            serializer.validated_data['land_ids'], user_requirements, fields
+        )
+        
+        return Response({
+            'success': True,
+            'count': len(results),
+            'response_time_ms': int((time.time() - start_time) * 1000),
+            'results': results,
+            'missing_land_ids': missing,
+            'search_criteria': user_requirements
+        })
+
+
+class LandProfileMatrixAPI(APIView):
+    """
+    POST /api/lands/recommend/profiles/
+    Top lands for many requirement profiles over the same land pool
+    
+    Body: {"profiles": [{"purpose": "agricultural", "max_price": 5000000, ...}, ...],
+           "limit": 10, "fields": "land_id,score", "land_ids": [...], "stream": false}
+    
+    Without land_ids the pool is every available land. With "stream": true
+    the response is NDJSON: a header line, one line per profile as soon as
+    it is scored, then a line with the total time.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        start_time = time.time()
+        
+        serializer = LandProfileMatrixRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        
+        profiles = []
+        for j, profile in enumerate(data['profiles']):
+            try:
+                profiles.append(_land_requirements(profile))
+            except ValueError as e:
+                return Response({'error': f'profiles[{j}]: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            from .services.land_recommender import LandRecommendationModel, parse_fields
+        except Exception as e:
+            return Response({'error': f'Recommender not available: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        try:
+            fields = parse_fields(request.data.get('fields') or request.query_params.get('fields'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Lands are read here; profiles are scored block by block as results are consumed
+        recommendations = LandRecommendationModel().iter_profile_recommendations(
+            profiles, data['limit'], fields, data.get('land_ids')
+        )
+        results = (
+            {
+                'profile': j,
+                'count': len(profile_recommendations),
+                'recommendations': profile_recommendations,
+                'search_criteria': profile,
+            }
+            for j, (profile, profile_recommendations) in enumerate(zip(profiles, recommendations))
+        )
+        
+        if data['stream']:
+            def lines():
+                yield {'success': True, 'profile_count': len(profiles), 'limit': data['limit']}
+                yield from results
+                yield {'done': True, 'response_time_ms': int((time.time() - start_time) * 1000)}
+            return _ndjson_response(lines())
+        
+        results = list(results)
+        return Response({
+            'success': True,
+            'profile_count': len(profiles),
+            'response_time_ms': int((time.time() - start_time) * 1000),
+            'results': results,
+        })
+
+
 class QuickMatchAPI(APIView):
     """
     GET /api/lands/quick-match/?purpose=agricultural&budget=5000000&location=Pune
@@ -292,6 +534,107 @@ class QuickMatchAPI(APIView):
         })
 
 
+class NearbyLandsAPI(APIView):
+    """
+    GET /api/lands/nearby/?latitude=18.52&longitude=73.85&radius_km=10&limit=20&land_type=agricultural
+    Available lands within radius_km of a point, nearest first
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        try:
+            origin = _distance_requirements(request.query_params)
+            if 'latitude' not in origin:
+                raise ValueError('latitude and longitude are required')
+            radius_km = float(request.query_params.get('radius_km', 10))
+            if not 0 < radius_km <= 1000:
+                raise ValueError('radius_km must be between 0 and 1000')
+            limit = min(int(request.query_params.get('limit', 20)), 200)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        from .services.land_geo import nearby_lands
+        
+        lands = Land.objects.filter(status='available')
+        land_type = request.query_params.get('land_type')
+        if land_type:
+            lands = lands.filter(land_type=land_type)
+        
+        results = nearby_lands(origin['latitude'], origin['longitude'], radius_km, limit, lands)
+        
+        return Response({
+            'success': True,
+            'count': len(results),
+            'radius_km': radius_km,
+            'lands': results
+        })
+
+
+class LandsInBBoxAPI(APIView):
+    """
+    GET /api/lands/in-bbox/?minlat=18.4&maxlat=18.7&minlon=73.7&maxlon=74.0&limit=500
+    Available lands inside a map viewport (minlon > maxlon crosses the antimeridian)
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        try:
+            min_lat, max_lat, min_lon, max_lon = (
+                float(request.query_params[name]) for name in ('minlat', 'maxlat', 'minlon', 'maxlon')
+            )
+            limit = min(int(request.query_params.get('limit', 500)), 5000)
+        except KeyError as e:
+            return Response({'error': f'Missing parameter {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+            return Response(
+                {'error': 'Expected -90 <= minlat <= maxlat <= 90 and longitudes within [-180, 180]'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        from .services.land_spatial import viewport_lands
+        
+        lands = Land.objects.filter(status='available')
+        land_type = request.query_params.get('land_type')
+        if land_type:
+            lands = lands.filter(land_type=land_type)
+        
+        results = viewport_lands(min_lat, max_lat, min_lon, max_lon, limit + 1, lands)
+        
+        return Response({
+            'success': True,
+            'count': min(len(results), limit),
+            'truncated': len(results) > limit,
+            'lands': results[:limit]
+        })
+
+
+class LocationAutocompleteAPI(APIView):
+    """
+    GET /api/locations/autocomplete/?q=pu&limit=10
+    City, district, state and pincode suggestions for a typed prefix
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        prefix = request.query_params.get('q', '')
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        from .services.location_index import get_location_index
+        suggestions = get_location_index().complete(prefix, limit)
+        
+        return Response({
+            'query': prefix,
+            'count': len(suggestions),
+            'suggestions': suggestions
+        })
+
+
 # COMMENTED OUT - Advanced feature not currently needed
 # class RecommendationStatsAPI(APIView):
 #     """
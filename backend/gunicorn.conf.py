@@ -0,0 +1,18 @@
+# backend/gunicorn.conf.py
+# Run with: gunicorn agriwise_backend.wsgi
+
+import multiprocessing
+
+bind = '0.0.0.0:8000'
+workers = multiprocessing.cpu_count() * 2 + 1
+
+# Import Django (and the ML stack) once in the master process so workers are
+# forked with it already loaded
+preload_app = True
+
+
+def when_ready(server):
+    """Finish the crop model warmup in the master, before any worker is forked"""
+    from api.services import warmup
+    warmup.wait()
+    server.log.info(f"Crop model warmup: {warmup.status()['status']}")